@@ -0,0 +1 @@
+"""Performance benchmarks. Run a benchmark as module, i.e. `python -m benchmark.bench_filesystem`."""
@@ -0,0 +1,89 @@
+"""Benchmark the throughput of the data store implementations
+
+MongoDataStore is included if a MongoDB server is reachable on localhost.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from dynamic_form.datastore_filesystem import FileSystemDataStore
+from dynamic_form.datastore_memory import MemoryDataStore
+from dynamic_form.datastore_sqlite import SQLiteDataStore
+
+from benchmark.synthetic_forms import build_form_template
+
+
+def _throughput(function, arguments):
+    start = time.perf_counter()
+    for argument in arguments:
+        function(argument)
+    return len(arguments) / (time.perf_counter() - start)
+
+
+def bench_data_store(data_store, num_forms=1000, num_reads=5000, seed=0):
+    """Return operations per second for the most frequent calls of a data store"""
+    form_templates = [build_form_template(index) for index in range(num_forms)]
+    names = [random.Random(seed + index).choice(form_templates)["name"] for index in range(num_reads)]
+
+    start = time.perf_counter()
+    data_store.insert_forms(form_templates)
+    insert_forms = num_forms / (time.perf_counter() - start)
+
+    return {
+        "insert_forms_per_second": insert_forms,
+        "load_form_by_name_per_second": _throughput(data_store.load_form_by_name, names),
+        "find_form_by_name_per_second": _throughput(lambda name: list(data_store.find_form({"name": name})), names),
+        "load_form_hash_per_second": _throughput(data_store.load_form_hash, names),
+    }
+
+
+def _mongo_data_store():
+    try:
+        from pymongo import MongoClient
+        from pymongo.errors import PyMongoError
+        from dynamic_form.datastore_mongodb import MongoDataStore
+
+        client = MongoClient(host="127.0.0.1", serverSelectionTimeoutMS=500)
+        client.admin.command("ping")
+    except (ImportError, PyMongoError):
+        return None
+
+    collection = client["benchmark"]["form_benchmark"]
+    collection.drop()
+    data_store = MongoDataStore(collection)
+    data_store.create_indexes()
+    return data_store
+
+
+def run(num_forms=1000, num_reads=5000):
+    results = {"benchmark": "data_stores", "num_forms": num_forms, "num_reads": num_reads, "data_stores": {}}
+
+    with tempfile.TemporaryDirectory() as directory:
+        data_stores = {
+            "memory": MemoryDataStore(),
+            "sqlite": SQLiteDataStore(os.path.join(directory, "forms.db")),
+            "filesystem": FileSystemDataStore(directory),
+        }
+        mongo_data_store = _mongo_data_store()
+        if mongo_data_store is not None:
+            data_stores["mongo"] = mongo_data_store
+
+        for name, data_store in data_stores.items():
+            results["data_stores"][name] = bench_data_store(data_store, num_forms, num_reads)
+
+        if mongo_data_store is not None:
+            mongo_data_store.collection.drop()
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--forms", type=int, default=1000)
+    parser.add_argument("--reads", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.forms, args.reads), indent=2))
@@ -0,0 +1,50 @@
+"""Benchmark loading a directory of form templates with the FileSystemDataStore"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from dynamic_form import FormManager
+from dynamic_form.datastore_filesystem import FileSystemDataStore
+
+from benchmark.synthetic_forms import build_form_template
+
+
+def run(num_files=5000, num_fields=10):
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(num_files):
+            with open(os.path.join(directory, f"form_{index}.json"), "w") as file:
+                json.dump(build_form_template(index, num_fields), file)
+
+        start = time.perf_counter()
+        data_store = FileSystemDataStore(directory)
+        index_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        data_store.poll()
+        poll_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        form_manager = FormManager(data_store, initial_load=False)
+        form_manager.form_cache.max_len = num_files
+        form_manager.update_form_cache()
+        initial_load_seconds = time.perf_counter() - start
+
+    return {
+        "benchmark": "filesystem_load",
+        "num_files": num_files,
+        "num_fields": num_fields,
+        "index_seconds": index_seconds,
+        "unchanged_poll_seconds": poll_seconds,
+        "form_manager_initial_load_seconds": initial_load_seconds,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--fields", type=int, default=10)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.files, args.fields), indent=2))
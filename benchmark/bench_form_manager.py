@@ -0,0 +1,124 @@
+"""Benchmark parsing, caching and loading of synthetic forms with the FormManager and a MemoryDataStore
+
+The results are printed as json and include the commit, so that runs of different commits can be compared with
+`python -m benchmark.compare`.
+"""
+import argparse
+import copy
+import itertools
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+
+from dynamic_form import FormManager, JsonFlaskParser
+from dynamic_form.datastore_memory import MemoryDataStore
+
+from benchmark.synthetic_forms import build_form_template
+
+FIELD_COUNTS = (10, 50, 200)
+DEPTHS = (0, 1)
+VOCABULARY_SIZES = (0, 100, 500)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _per_call(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_parse(form_template, repeat=10):
+    """Return the number of parsed forms per second. Templates are copied beforehand, the parser modifies them."""
+    parser = JsonFlaskParser()
+    templates = [copy.deepcopy(form_template) for _ in range(repeat)]
+
+    start = time.perf_counter()
+    for template in templates:
+        parser.to_form(template)
+    return repeat / (time.perf_counter() - start)
+
+
+def bench_cache(form_template, repeat=10):
+    """Return the latency in seconds of a cache hit and of a cache miss (load and parse)"""
+    form_manager = FormManager(MemoryDataStore([form_template]), initial_load=False)
+    form_name = form_template["name"]
+    form_manager.get_form_by_name(form_name)
+
+    return {
+        "hit_seconds": _per_call(lambda: form_manager.get_form_by_name(form_name), repeat * 100),
+        "miss_seconds": _per_call(lambda: form_manager.get_form_by_name(form_name, use_cache=False), repeat),
+    }
+
+
+def bench_initial_load(form_templates):
+    """Return the seconds to load and parse all forms and the memory allocated per cached form in bytes"""
+    data_store = MemoryDataStore(form_templates)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        start = time.perf_counter()
+        form_manager = FormManager(data_store, initial_load=False)
+        form_manager.form_cache.max_len = len(form_templates)
+        form_manager.stale_cache.max_len = len(form_templates)
+        form_manager.update_form_cache()
+        initial_load_seconds = time.perf_counter() - start
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return {
+        "initial_load_seconds": initial_load_seconds,
+        "memory_per_form_bytes": allocated / len(form_templates),
+    }
+
+
+def run(field_counts=FIELD_COUNTS, depths=DEPTHS, vocabulary_sizes=VOCABULARY_SIZES, num_forms=10, repeat=10):
+    results = {
+        "benchmark": "form_manager",
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "num_forms": num_forms,
+        "repeat": repeat,
+        "cases": {},
+    }
+
+    for num_fields, depth, vocabulary_size in itertools.product(field_counts, depths, vocabulary_sizes):
+        form_template = build_form_template(0, num_fields, depth, vocabulary_size)
+        form_templates = [build_form_template(index, num_fields, depth, vocabulary_size) for index in range(num_forms)]
+
+        case = {"num_fields": num_fields, "depth": depth, "vocabulary_size": vocabulary_size,
+                "parse_forms_per_second": bench_parse(form_template, repeat)}
+        case.update(bench_cache(form_template, repeat))
+        case.update(bench_initial_load(form_templates))
+        results["cases"][f"fields={num_fields},depth={depth},vocabulary={vocabulary_size}"] = case
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fields", type=int, nargs="+", default=FIELD_COUNTS)
+    parser.add_argument("--depths", type=int, nargs="+", default=DEPTHS)
+    parser.add_argument("--vocabulary-sizes", type=int, nargs="+", default=VOCABULARY_SIZES)
+    parser.add_argument("--forms", type=int, default=10, help="Number of forms of the initial load")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="Write the results to this file instead of stdout")
+    args = parser.parse_args()
+
+    results = run(args.fields, args.depths, args.vocabulary_sizes, args.forms, args.repeat)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
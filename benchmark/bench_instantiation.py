@@ -0,0 +1,58 @@
+"""Benchmark the instantiation of large forms with and without fast binding (JsonFlaskParser(fast_binding=True))"""
+import argparse
+import copy
+import json
+import time
+
+from flask import Flask
+
+from dynamic_form import JsonFlaskParser
+
+from benchmark.synthetic_forms import build_form_template
+
+FIELD_COUNTS = (50, 300, 1000)
+
+
+def bench_instantiation(form_cls, app, repeat=50):
+    """Return the seconds per instantiation of the form within a request"""
+    with app.test_request_context():
+        # The first instantiation prepares the class and is not measured
+        form_cls()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            form_cls()
+        return (time.perf_counter() - start) / repeat
+
+
+def run(field_counts=FIELD_COUNTS, depth=1, vocabulary_size=20, repeat=50):
+    app = Flask(__name__)
+    app.secret_key = "benchmark"
+
+    results = {"benchmark": "instantiation", "depth": depth, "vocabulary_size": vocabulary_size, "repeat": repeat,
+               "cases": {}}
+    for num_fields in field_counts:
+        # Fields per form level, so that the total number of fields matches num_fields
+        form_template = build_form_template(0, max(num_fields // (depth + 1), 1), depth, vocabulary_size)
+        _, form_cls = JsonFlaskParser().to_form(copy.deepcopy(form_template))
+        _, fast_form_cls = JsonFlaskParser(fast_binding=True).to_form(copy.deepcopy(form_template))
+
+        default_seconds = bench_instantiation(form_cls, app, repeat)
+        fast_seconds = bench_instantiation(fast_form_cls, app, repeat)
+        results["cases"][f"fields={num_fields}"] = {
+            "num_fields": num_fields,
+            "default_seconds": default_seconds,
+            "fast_binding_seconds": fast_seconds,
+            "speedup": default_seconds / fast_seconds,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fields", type=int, nargs="+", default=FIELD_COUNTS)
+    parser.add_argument("--depth", type=int, default=1, help="Number of nested FormFields")
+    parser.add_argument("--vocabulary-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.fields, args.depth, args.vocabulary_size, args.repeat), indent=2))
@@ -0,0 +1,58 @@
+"""Benchmark the structural validation of templates (TemplateValidator) against parsing them with JsonFlaskParser"""
+import argparse
+import copy
+import json
+import time
+
+from dynamic_form import JsonFlaskParser
+from dynamic_form.template_validator import TemplateValidator
+
+from benchmark.synthetic_forms import build_form_template
+
+FIELD_COUNTS = (10, 50, 200)
+
+
+def bench_validation(form_templates, repeat=5):
+    """Return the validated templates per second"""
+    validator = TemplateValidator()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        validator.validate_many(form_templates)
+    return repeat * len(form_templates) / (time.perf_counter() - start)
+
+
+def bench_parsing(form_templates):
+    """Return the parsed templates per second. The templates are copied before, as the parser modifies them."""
+    form_templates = copy.deepcopy(form_templates)
+    start = time.perf_counter()
+    for form_template in form_templates:
+        JsonFlaskParser().to_form(form_template)
+    return len(form_templates) / (time.perf_counter() - start)
+
+
+def run(field_counts=FIELD_COUNTS, num_forms=100, depth=0, vocabulary_size=20, repeat=5):
+    results = {"benchmark": "validation", "num_forms": num_forms, "depth": depth, "vocabulary_size": vocabulary_size,
+               "cases": {}}
+    for num_fields in field_counts:
+        form_templates = [build_form_template(index, num_fields, depth, vocabulary_size) for index in range(num_forms)]
+        validated_per_second = bench_validation(form_templates, repeat)
+        parsed_per_second = bench_parsing(form_templates)
+        results["cases"][f"fields={num_fields}"] = {
+            "num_fields": num_fields,
+            "validated_per_second": validated_per_second,
+            "parsed_per_second": parsed_per_second,
+            "speedup": validated_per_second / parsed_per_second,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fields", type=int, nargs="+", default=FIELD_COUNTS)
+    parser.add_argument("--num-forms", type=int, default=100)
+    parser.add_argument("--depth", type=int, default=0, help="Number of nested FormFields")
+    parser.add_argument("--vocabulary-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.fields, args.num_forms, args.depth, args.vocabulary_size, args.repeat), indent=2))
@@ -0,0 +1,39 @@
+"""Compare two json results of a benchmark, e.g. of two commits
+
+Prints the ratio (current / baseline) of every numeric value which is present in both results.
+"""
+import argparse
+import json
+
+
+def flatten(results, prefix=""):
+    """Return a dict of the numeric values of nested results keyed by their dotted path"""
+    values = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            values.update(flatten(value, path + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[path] = value
+    return values
+
+
+def compare(baseline, current):
+    """Return (path, baseline value, current value, ratio) tuples of the values present in both results"""
+    baseline, current = flatten(baseline), flatten(current)
+    return [(path, baseline[path], current[path], current[path] / baseline[path] if baseline[path] else None)
+            for path in baseline if path in current]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    args = parser.parse_args()
+
+    with open(args.baseline) as baseline_file, open(args.current) as current_file:
+        rows = compare(json.load(baseline_file), json.load(current_file))
+
+    for path, baseline_value, current_value, ratio in rows:
+        ratio = "n/a" if ratio is None else f"{ratio:.3f}"
+        print(f"{path}\t{baseline_value:.6g}\t{current_value:.6g}\t{ratio}")
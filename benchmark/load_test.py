@@ -0,0 +1,207 @@
+"""Load test of a Flask app which serves forms of a FormManager from many threads
+
+Requests are sent through the Flask test client, so no network is involved. The popularity of the forms follows a Zipf
+distribution. The results (throughput, latency percentiles, data store calls and cache counters) are printed as json.
+"""
+import argparse
+import collections
+import json
+import random
+import threading
+import time
+
+from flask import Flask, abort
+
+from dynamic_form import FormManager
+from dynamic_form.datastore_memory import MemoryDataStore
+from dynamic_form.errors import FormManagerException
+from dynamic_form.metrics import FormMetrics
+
+from benchmark.synthetic_forms import build_form_template
+
+DEFAULT_MIX = {"render": 0.8, "validate": 0.15, "refresh": 0.05}
+
+
+class CountingDataStore(MemoryDataStore):
+    """Memory data store which counts the calls of the load methods"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = collections.Counter()
+        self._calls_lock = threading.Lock()
+
+    def _count(self, name):
+        with self._calls_lock:
+            self.calls[name] += 1
+
+    def load_forms(self):
+        self._count("load_forms")
+        return super().load_forms()
+
+    def load_form_by_name(self, form_name):
+        self._count("load_form_by_name")
+        return super().load_form_by_name(form_name)
+
+    def load_current_revision(self, form_name):
+        self._count("load_current_revision")
+        return super().load_current_revision(form_name)
+
+    def load_form_revision(self, form_name, revision):
+        self._count("load_form_revision")
+        return super().load_form_revision(form_name, revision)
+
+
+def create_app(form_manager):
+    """Return a Flask app with one route per request type
+
+    render: instantiate the form and render its fields
+    validate: instantiate the form with submitted data and validate it
+    refresh: load the form from the data store, bypassing the cache
+    """
+    app = Flask(__name__)
+    app.config["WTF_CSRF_ENABLED"] = False
+    app.config["SECRET_KEY"] = "load-test"
+
+    def get_form(form_name, use_cache=True):
+        try:
+            return form_manager.get_form_by_name(form_name, use_cache=use_cache)
+        except FormManagerException:
+            abort(404)
+
+    @app.get("/render/<form_name>")
+    def render(form_name):
+        form = get_form(form_name)()
+        return "".join(str(field) for field in form)
+
+    @app.post("/validate/<form_name>")
+    def validate(form_name):
+        form = get_form(form_name)()
+        return {"valid": form.validate()}
+
+    @app.get("/refresh/<form_name>")
+    def refresh(form_name):
+        get_form(form_name, use_cache=False)
+        return ""
+
+    return app
+
+
+def zipf_weights(num_forms, exponent):
+    """Return the cumulative weights of a Zipf distribution over num_forms ranks"""
+    cumulative, total = [], 0.0
+    for rank in range(1, num_forms + 1):
+        total += 1 / rank ** exponent
+        cumulative.append(total)
+    return cumulative
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def _worker(app, names, cum_weights, mix, duration, seed, barrier, latencies, statuses):
+    client = app.test_client()
+    rng = random.Random(seed)
+    request_types = list(mix)
+    request_weights = list(mix.values())
+
+    barrier.wait()
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        form_name = rng.choices(names, cum_weights=cum_weights)[0]
+        request_type = rng.choices(request_types, request_weights)[0]
+
+        start = time.perf_counter()
+        if request_type == "validate":
+            response = client.post(f"/validate/{form_name}", data={"field_0": "value"})
+        else:
+            response = client.get(f"/{request_type}/{form_name}")
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status_code] += 1
+
+
+def run(threads=64, duration=10, num_forms=200, num_fields=10, zipf_exponent=1.1, max_age_seconds=5, latency=0.002,
+        mix=None, seed=0, cache_size=100):
+    mix = mix or DEFAULT_MIX
+    data_store = CountingDataStore([build_form_template(index, num_fields) for index in range(num_forms)],
+                                   latency=latency)
+    metrics = FormMetrics()
+    form_manager = FormManager(data_store, initial_load=False, max_age_seconds=max_age_seconds, metrics=metrics)
+    form_manager.form_cache.max_len = cache_size
+    app = create_app(form_manager)
+
+    names = [f"form_{index}" for index in range(num_forms)]
+    cum_weights = zipf_weights(num_forms, zipf_exponent)
+    barrier = threading.Barrier(threads + 1)
+    latencies = [[] for _ in range(threads)]
+    statuses = [collections.Counter() for _ in range(threads)]
+
+    workers = [threading.Thread(target=_worker, args=(app, names, cum_weights, mix, duration, seed + index, barrier,
+                                                      latencies[index], statuses[index]))
+               for index in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    all_latencies = sorted(value for values in latencies for value in values)
+    status_counts = sum(statuses, collections.Counter())
+    snapshot = metrics.snapshot()
+    return {
+        "benchmark": "load_test",
+        "threads": threads,
+        "duration": duration,
+        "num_forms": num_forms,
+        "num_fields": num_fields,
+        "zipf_exponent": zipf_exponent,
+        "max_age_seconds": max_age_seconds,
+        "cache_size": cache_size,
+        "data_store_latency": latency,
+        "mix": mix,
+        "requests": len(all_latencies),
+        "requests_per_second": len(all_latencies) / elapsed,
+        "latency_seconds": {
+            "p50": percentile(all_latencies, 0.5),
+            "p99": percentile(all_latencies, 0.99),
+            "p999": percentile(all_latencies, 0.999),
+            "max": all_latencies[-1] if all_latencies else None,
+        },
+        "status_codes": {str(code): count for code, count in status_counts.items()},
+        "data_store_calls": dict(data_store.calls),
+        "cache": {name: snapshot[name] for name in FormMetrics.COUNTERS},
+    }
+
+
+def parse_mix(value):
+    """Parse a request mix like `render=0.8,validate=0.15,refresh=0.05`"""
+    mix = {}
+    for item in value.split(","):
+        request_type, weight = item.split("=")
+        if request_type not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown request type {request_type}")
+        mix[request_type] = float(weight)
+    return mix
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10, help="Seconds")
+    parser.add_argument("--forms", type=int, default=200)
+    parser.add_argument("--fields", type=int, default=10)
+    parser.add_argument("--zipf", type=float, default=1.1, help="Exponent of the Zipf distribution")
+    parser.add_argument("--ttl", type=float, default=5, help="max_age_seconds of the form cache")
+    parser.add_argument("--cache-size", type=int, default=100, help="max_len of the form cache")
+    parser.add_argument("--latency", type=float, default=0.002, help="Data store latency in seconds")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Request mix, e.g. render=0.8,validate=0.15,refresh=0.05")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.threads, args.duration, args.forms, args.fields, args.zipf, args.ttl, args.latency,
+                         args.mix, args.seed, args.cache_size), indent=2))
@@ -0,0 +1,45 @@
+"""Synthetic form templates built with the template_builder"""
+from dynamic_form.template_builder import ControlledVocabularyTemplate, FieldTemplate, FormFieldTemplate, \
+    FormTemplate, ItemTemplate, PropertyTemplate, ValueTypeTemplate
+
+
+def build_vocabulary(size):
+    vocabulary = ControlledVocabularyTemplate("Vocabulary", "vocabulary", "A generated vocabulary", "benchmark")
+    for index in range(size):
+        vocabulary.add_item(ItemTemplate(f"Item {index}", f"item_{index}", "A generated item"))
+    return vocabulary
+
+
+def build_fields(num_fields, depth=0, vocabulary_size=0, prefix="field"):
+    """Return field templates. Every second field is a SelectField if vocabulary_size is set, the last field contains
+    a nested form if depth is larger than 0."""
+    fields = []
+    for index in range(num_fields):
+        name = f"{prefix}_{index}"
+        if depth and index == num_fields - 1:
+            field = FormFieldTemplate(PropertyTemplate(f"Subform {index}", name, "administrative", "A nested form"))
+            for nested_field in build_fields(num_fields, depth - 1, vocabulary_size, prefix=name):
+                field.add_field(nested_field)
+        elif vocabulary_size and index % 2 == 0:
+            value_type = ValueTypeTemplate("ctrl_voc", build_vocabulary(vocabulary_size))
+            field = FieldTemplate("SelectField", PropertyTemplate(f"Field {index}", name, "administrative",
+                                                                  "A generated select field", value_type))
+        else:
+            field = FieldTemplate("StringField", PropertyTemplate(f"Field {index}", name, "administrative",
+                                                                  "A generated field"))
+        fields.append(field)
+    return fields
+
+
+def build_form_template(index, num_fields=10, depth=0, vocabulary_size=0):
+    """Return a form template as dict
+
+    :param index: Number used in the name of the form
+    :param num_fields: Number of fields per (nested) form
+    :param depth: Number of nested FormFields
+    :param vocabulary_size: Number of items of the controlled vocabulary of the SelectFields. 0 means no SelectFields.
+    """
+    form_template = FormTemplate(f"Form {index}", f"form_{index}", "A generated form")
+    for field in build_fields(num_fields, depth, vocabulary_size):
+        form_template.add_field(field)
+    return form_template.to_dict()
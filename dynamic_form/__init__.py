@@ -1,9 +1,17 @@
 from .form_manager import FormManager
-from .interfaces import IDataStore, IFormParser
+from .form_manager_async import AsyncFormManager
+from .form_manager_tenant import MultiTenantFormManager
+from .interfaces import IDataStore, IAsyncDataStore, IFormParser
 
+from .datastore_filesystem import FileSystemDataStore
+from .datastore_memory import MemoryDataStore
 from .datastore_mongodb import MongoDataStore
+from .datastore_mongodb_async import AsyncMongoDataStore
+from .datastore_sqlite import SQLiteDataStore
 from .parser_json import JsonFlaskParser
 
-__all__ = ["FormManager", "IDataStore", "IFormParser", "MongoDataStore", "JsonFlaskParser"]
+__all__ = ["FormManager", "AsyncFormManager", "MultiTenantFormManager", "IDataStore", "IAsyncDataStore", "IFormParser",
+           "FileSystemDataStore", "MemoryDataStore", "MongoDataStore", "AsyncMongoDataStore", "SQLiteDataStore",
+           "JsonFlaskParser"]
 
 __version__ = "0.3.7"
@@ -0,0 +1,189 @@
+import copy
+import itertools
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from wtforms import Form
+from wtforms.fields import FormField, SelectField, SelectMultipleField
+from wtforms.fields.core import UnboundField
+from wtforms.validators import ValidationError
+
+from .errors import DynamicFormException
+from .parser_json import JsonFlaskParser
+
+# Validation result of a row. errors maps field names to lists of messages (dicts for nested forms), like Form.errors.
+RowResult = namedtuple("RowResult", ["index", "valid", "errors"])
+
+
+class _RowData:
+    """Adapter which provides a dict row as form data. Nested dicts are flattened with the separator of FormFields."""
+
+    def __init__(self, row, separator="-"):
+        self._data = {}
+        self._add(row, "", separator)
+
+    def _add(self, row, prefix, separator):
+        for key, value in row.items():
+            if isinstance(value, dict):
+                self._add(value, f"{prefix}{key}{separator}", separator)
+            elif value is not None:
+                self._data[f"{prefix}{key}"] = value if isinstance(value, list) else [value]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def getlist(self, key):
+        return self._data.get(key, [])
+
+
+def _plain_form_class(form_cls):
+    """Return a wtforms Form with the fields of form_cls, which neither needs a request context nor CSRF tokens"""
+    attributes = {}
+    for name in dir(form_cls):
+        field = getattr(form_cls, name)
+        if not isinstance(field, UnboundField):
+            continue
+        if issubclass(field.field_class, FormField):
+            args, kwargs = list(field.args), dict(field.kwargs)
+            if "form_class" in kwargs:
+                kwargs["form_class"] = _plain_form_class(kwargs["form_class"])
+            else:
+                args[0] = _plain_form_class(args[0])
+            plain_field = UnboundField(field.field_class, *args, name=field.name, **kwargs)
+            plain_field.creation_counter = field.creation_counter
+            field = plain_field
+        attributes[name] = field
+    return type(form_cls.__name__, (Form,), attributes)
+
+
+def _hash_choices(field):
+    """Replace the linear search of the choices of a select field with a set lookup"""
+    try:
+        acceptable = frozenset(field.coerce(value) for value, *_ in field.iter_choices())
+    except TypeError:
+        # Unhashable or missing choices, keep the validation of wtforms
+        return
+
+    message = field.gettext("Not a valid choice.")
+    if isinstance(field, SelectMultipleField):
+        def pre_validate(form):
+            if field.validate_choice and field.data and not acceptable.issuperset(field.data):
+                unacceptable = "', '".join(str(data) for data in set(field.data) if data not in acceptable)
+                raise ValidationError(f"'{unacceptable}' is not a valid choice for this field.")
+    else:
+        def pre_validate(form):
+            if field.validate_choice and field.data not in acceptable:
+                raise ValidationError(message)
+
+    field.pre_validate = pre_validate
+
+
+class BulkValidator:
+    """Validates many rows (dicts of field values) against a form parsed by the JsonFlaskParser
+
+    The form is instantiated once without request context and CSRF token and reused for all rows, so that fields and
+    validators are bound only once. The choices of select fields are looked up in a set.
+
+    >>> validator = BulkValidator.from_template(form_template)
+    >>> for result in validator.validate(rows):
+    ...     if not result.valid:
+    ...         print(result.index, result.errors)
+
+    """
+
+    def __init__(self, form_cls, form_template=None):
+        """
+        :param form_cls: A form class as returned by JsonFlaskParser.to_form
+        :param form_template: The template of the form. Required to validate in multiple processes, unless the form
+        class is picklable (parsed with JsonFlaskParser(picklable=True)).
+        """
+        self.form_cls = form_cls
+        self.form_template = form_template
+        self._form = _plain_form_class(form_cls)()
+        for field in self._form:
+            if isinstance(field, SelectField):
+                _hash_choices(field)
+
+    @classmethod
+    def from_template(cls, form_template, parser=None):
+        """Parse the form template and return a validator for it"""
+        parser = parser or JsonFlaskParser()
+        # The parser modifies the template. Parse a copy to keep the template for worker processes.
+        _, form_cls = parser.to_form(copy.deepcopy(form_template))
+        return cls(form_cls, form_template)
+
+    def validate_row(self, row):
+        """Validate a single row
+
+        :param dict row: Field values by field name, values of nested forms as dicts
+        :return: Dict of the errors by field name, empty if the row is valid
+        """
+        self._form.process(formdata=_RowData(row))
+        self._form.validate()
+        return self._form.errors
+
+    def validate(self, rows, processes=None, chunk_size=1000):
+        """Validate rows and yield a RowResult per row in the order of the rows
+
+        The rows are consumed lazily, so that large files can be streamed.
+
+        :param rows: Iterable of dicts
+        :param processes: Number of worker processes. None validates in the current process.
+        :param chunk_size: Number of rows sent at once to a worker process
+        :raises DynamicFormException: If processes are requested, but there is neither a form template nor a picklable
+        form class
+        """
+        if processes is None:
+            for index, row in enumerate(rows):
+                errors = self.validate_row(row)
+                yield RowResult(index, not errors, errors)
+            return
+
+        if self.form_template is not None:
+            initargs = self.form_template, None
+        elif "_pickle_state" in vars(self.form_cls):
+            initargs = None, self.form_cls
+        else:
+            raise DynamicFormException("Validating in multiple processes requires the form template or a picklable "
+                                       "form class")
+
+        rows = iter(rows)
+        index = 0
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=initargs) as executor:
+            # Keep only a few chunks in flight to bound the memory
+            pending = deque()
+            while True:
+                while len(pending) < 2 * processes:
+                    chunk = list(itertools.islice(rows, chunk_size))
+                    if not chunk:
+                        break
+                    pending.append((index, executor.submit(_validate_chunk, chunk)))
+                    index += len(chunk)
+                if not pending:
+                    return
+
+                start, future = pending.popleft()
+                for offset, errors in enumerate(future.result()):
+                    yield RowResult(start + offset, not errors, errors)
+
+
+_worker_validator = None
+
+
+def _init_worker(form_template, form_cls):
+    global _worker_validator
+    if form_template is not None:
+        _worker_validator = BulkValidator.from_template(form_template)
+    else:
+        _worker_validator = BulkValidator(form_cls)
+
+
+def _validate_chunk(rows):
+    return [_worker_validator.validate_row(row) for row in rows]
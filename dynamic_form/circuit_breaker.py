@@ -0,0 +1,75 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """Stops calls to a failing data store for a while
+
+    After `failure_threshold` consecutive failures the breaker opens and no calls are allowed for `reset_timeout`
+    seconds. Afterwards the breaker is half open: a single trial call is allowed. If it succeeds, the breaker closes,
+    otherwise it opens again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        """
+        :param failure_threshold: Number of consecutive failures which open the breaker
+        :param reset_timeout: Seconds until a trial call is allowed
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    def __repr__(self):
+        return f"CircuitBreaker(state: {self.state})"
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def allow(self):
+        """Return True if a call is allowed. In the half open state, only the first caller is allowed."""
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def cancel_trial(self):
+        """Give up an allowed call without calling the data store, e.g. if the call was rejected for another reason
+
+        In the half open state, the next caller is allowed to make the trial call. The state does not change otherwise.
+        """
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def _state(self):
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
@@ -0,0 +1,87 @@
+import threading
+import time
+
+
+class ConcurrencyLimiter:
+    """Limits the number of concurrent calls to the data store
+
+    A caller waits at most `max_queue_time` seconds for a free slot. With `max_queue_time=0` callers fail fast if all
+    slots are taken. If `max_queue_depth` callers are already waiting, further callers are rejected immediately.
+    Queue depth and wait times are recorded to size the limiter, see :meth:`stats`.
+    """
+
+    def __init__(self, max_concurrency=8, max_queue_time=1.0, max_queue_depth=None):
+        """
+        :param max_concurrency: Maximal number of concurrent calls
+        :param max_queue_time: Maximal time in seconds a caller waits for a free slot
+        :param max_queue_depth: Maximal number of waiting callers. None means no limit.
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue_time = max_queue_time
+        self.max_queue_depth = max_queue_depth
+
+        self._condition = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self._max_waiting = 0
+        self._acquired = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def __repr__(self):
+        return f"ConcurrencyLimiter(max_concurrency: {self.max_concurrency}, max_queue_time: {self.max_queue_time})"
+
+    def acquire(self, timeout=None):
+        """Wait for a free slot
+
+        :param timeout: Upper bound of the wait in seconds, the wait is never longer than max_queue_time
+        :return: True if a slot was acquired, False if the caller was rejected
+        """
+        budget = self.max_queue_time if timeout is None else min(max(timeout, 0), self.max_queue_time)
+        start = time.monotonic()
+
+        with self._condition:
+            if self._active >= self.max_concurrency and self.max_queue_depth is not None \
+                    and self._waiting >= self.max_queue_depth:
+                self._rejected += 1
+                return False
+
+            self._waiting += 1
+            self._max_waiting = max(self._max_waiting, self._waiting)
+            try:
+                acquired = self._condition.wait_for(lambda: self._active < self.max_concurrency, timeout=budget)
+            finally:
+                self._waiting -= 1
+
+            wait = time.monotonic() - start
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+            if not acquired:
+                self._rejected += 1
+                return False
+
+            self._active += 1
+            self._acquired += 1
+            return True
+
+    def release(self):
+        """Free a slot acquired with :meth:`acquire`"""
+        with self._condition:
+            self._active -= 1
+            self._condition.notify()
+
+    def stats(self):
+        """Return the current and the maximal queue depth, the number of acquired and rejected slots and wait times"""
+        with self._condition:
+            waits = self._acquired + self._rejected
+            return {
+                "active": self._active,
+                "queue_depth": self._waiting,
+                "max_queue_depth": self._max_waiting,
+                "acquired": self._acquired,
+                "rejected": self._rejected,
+                "mean_wait_seconds": self._total_wait / waits if waits else 0.0,
+                "max_wait_seconds": self._max_wait,
+            }
@@ -0,0 +1,290 @@
+import copy
+import json
+import mmap
+import os
+import tempfile
+import threading
+import time
+from collections import namedtuple
+
+from .interfaces import IDataStore
+from .errors import DataStoreException
+from .query import query, search_page
+
+# Signature of a file: if neither modification time, inode nor size changed, the file is not read again
+_FileEntry = namedtuple("_FileEntry", ["signature", "revision", "form_template"])
+
+# Keys which are derived from the file and therefore not written into it
+_FILE_KEYS = ("_id", "revision")
+
+_UNKNOWN = object()
+
+
+class FileSystemDataStore(IDataStore):
+    """Data store implementation for a directory of json files, one form template per file
+
+    The unique identifier of a form is the name of its file. The files are read through memory maps and kept in memory
+    together with their modification time, inode and size. A file is read again only if one of them changed. New files
+    are discovered by polling the directory at most every `poll_interval` seconds (or on :meth:`poll`).
+
+    The revision of a form is the modification time of its file in nanoseconds (increased by one if the file changed
+    without a change of its modification time). Since the :class:`FormManager` only re-checks the current revision of
+    an expired form, it re-parses only forms whose file changed.
+    """
+
+    def __init__(self, directory, poll_interval=1.0):
+        """
+        :param directory: The directory containing the `*.json` form templates
+        :param poll_interval: Minimal time in seconds between two scans of the directory for new or deleted files
+        """
+        super(FileSystemDataStore, self).__init__()
+
+        if not os.path.isdir(directory):
+            raise DataStoreException(f"{directory} is not a directory")
+
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.errors = {}
+
+        self._lock = threading.RLock()
+        self._files = {}
+        self._name_index = {}
+        self._last_poll = None
+
+        self.poll()
+
+    def __repr__(self):
+        return f"FileSystemDataStore(directory: {self.directory})"
+
+    def poll(self):
+        """Scan the directory and read all new or changed files
+
+        Files which are not valid json are skipped, the error is recorded in `errors`.
+
+        :return: Set of the names of all forms which were added, changed or removed
+        """
+        with self._lock:
+            changed = set()
+            file_names = set()
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        file_names.add(entry.name)
+                        changed.update(self._refresh(entry.name, entry.stat()))
+
+            for file_name in set(self._files) - file_names:
+                changed.update(self._refresh(file_name, None))
+
+            self._last_poll = time.monotonic()
+            return changed
+
+    def load_forms(self):
+        """Load all forms"""
+        with self._lock:
+            self._poll_if_due()
+            form_templates = [self._to_form_template(file_name) for file_name in self._files]
+        for form_template in form_templates:
+            yield form_template
+
+    def load_form(self, identifier):
+        """Load form based on file name"""
+        if not self._is_file_name(identifier):
+            return None
+
+        with self._lock:
+            self._refresh(identifier)
+            if identifier not in self._files:
+                return None
+            return self._to_form_template(identifier)
+
+    def load_form_by_name(self, form_name):
+        """Load form based on form_name"""
+        with self._lock:
+            file_name = self._file_name(form_name)
+            if file_name is None:
+                return None
+            return self._to_form_template(file_name)
+
+    def load_current_revision(self, form_name):
+        """Return the modification time of the file. The file is not read if it did not change."""
+        with self._lock:
+            file_name = self._file_name(form_name)
+            if file_name is None:
+                return None
+            return self._files[file_name].revision
+
+    def load_form_revision(self, form_name, revision):
+        """Load form if its current revision matches. Previous revisions are not kept."""
+        with self._lock:
+            file_name = self._file_name(form_name)
+            if file_name is None or self._files[file_name].revision != revision:
+                return None
+            return self._to_form_template(file_name)
+
+    def load_form_hash(self, form_name):
+        """Load the content hash of a form"""
+        form_template = self.load_form_by_name(form_name)
+        return form_template.get("content_hash") if form_template else None
+
+    def insert_form(self, form_template):
+        """Write form into a new file named after the form
+
+        :raises DataStoreException: If a file for this form already exists
+        """
+        with self._lock:
+            file_name = self._new_file_name(form_template)
+            if os.path.exists(os.path.join(self.directory, file_name)):
+                raise DataStoreException(f"Fail to insert form: {file_name} already exists")
+            self._write(file_name, form_template)
+            return file_name
+
+    def upsert_form(self, form_template):
+        """Write form into the file named after the form if the content hash differs"""
+        with self._lock:
+            file_name = self._file_name(form_template["name"])
+            if file_name is not None:
+                if self._files[file_name].form_template.get("content_hash") == form_template["content_hash"]:
+                    return file_name, False
+            else:
+                file_name = self._new_file_name(form_template)
+
+            self._write(file_name, form_template)
+            return file_name, True
+
+    def find_form(self, search_filter=None, *args, projection=None, sort=None, limit=0, **kwargs):
+        """Search query to find forms
+
+        Supports the subset of the Mongo query language implemented in :mod:`dynamic_form.query`.
+        """
+        if args or kwargs:
+            raise DataStoreException(f"Unsupported find_form arguments: {list(args) + list(kwargs)}")
+
+        with self._lock:
+            self._poll_if_due()
+            form_templates = [self._with_file_keys(file_name) for file_name in self._files]
+            form_templates = query(form_templates, search_filter, projection, sort, limit)
+
+        for form_template in form_templates:
+            yield form_template
+
+    def search_forms(self, search_filter=None, page_size=50, after=None):
+        """Return one page of form summaries"""
+        with self._lock:
+            self._poll_if_due()
+            form_templates = [self._with_file_keys(file_name) for file_name in self._files]
+            return search_page(form_templates, search_filter, page_size, after)
+
+    def deprecate_form(self, identifier):
+        """Deprecate form by rewriting its file (forms should not be deleted)"""
+        if not self._is_file_name(identifier):
+            return
+
+        with self._lock:
+            self._refresh(identifier)
+            if identifier in self._files:
+                self._write(identifier, dict(self._files[identifier].form_template, deprecated=True))
+
+    def _poll_if_due(self):
+        if time.monotonic() - self._last_poll >= self.poll_interval:
+            self.poll()
+
+    def _file_name(self, form_name):
+        """Return the file containing the form. Refreshes the file, or the directory if the form is unknown."""
+        file_name = self._name_index.get(form_name)
+        if file_name is not None:
+            self._refresh(file_name)
+        if self._name_index.get(form_name) is None:
+            self._poll_if_due()
+        return self._name_index.get(form_name)
+
+    def _refresh(self, file_name, stat=_UNKNOWN):
+        """Read the file again if its signature changed
+
+        :param stat: The stat result of the file or None if the file does not exist. If omitted, the file is stat'ed.
+        :return: Set of the names of the forms which changed
+        """
+        if stat is _UNKNOWN:
+            try:
+                stat = os.stat(os.path.join(self.directory, file_name))
+            except FileNotFoundError:
+                stat = None
+
+        if stat is None:
+            return self._remove(file_name)
+
+        signature = (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+        entry = self._files.get(file_name)
+        if entry is not None and entry.signature == signature:
+            return set()
+
+        revision = stat.st_mtime_ns
+        if entry is not None and revision <= entry.revision:
+            revision = entry.revision + 1
+
+        changed = self._remove(file_name)
+        try:
+            form_template = self._read(file_name)
+        except (ValueError, OSError) as e:
+            self.errors[file_name] = str(e)
+            return changed
+
+        self.errors.pop(file_name, None)
+        self._files[file_name] = _FileEntry(signature, revision, form_template)
+        self._name_index[form_template.get("name")] = file_name
+        changed.add(form_template.get("name"))
+        return changed
+
+    def _remove(self, file_name):
+        """Remove file from the index and return the name of its form"""
+        entry = self._files.pop(file_name, None)
+        if entry is None:
+            return set()
+
+        form_name = entry.form_template.get("name")
+        if self._name_index.get(form_name) == file_name:
+            del self._name_index[form_name]
+            # Another file may contain a form with the same name
+            for other_file_name, other_entry in self._files.items():
+                if other_entry.form_template.get("name") == form_name:
+                    self._name_index[form_name] = other_file_name
+                    break
+        return {form_name}
+
+    def _read(self, file_name):
+        """Read a form template through a memory map"""
+        with open(os.path.join(self.directory, file_name), "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                form_template = json.loads(mapped[:])
+
+        if not isinstance(form_template, dict):
+            raise ValueError("The file does not contain a form template")
+        return form_template
+
+    def _write(self, file_name, form_template):
+        """Atomically replace the file. The temporary file is not a json file and therefore ignored by a poll."""
+        document = {key: value for key, value in form_template.items() if key not in _FILE_KEYS}
+
+        with tempfile.NamedTemporaryFile("w", dir=self.directory, suffix=".tmp", delete=False) as file:
+            json.dump(document, file, indent=2, default=str)
+        os.replace(file.name, os.path.join(self.directory, file_name))
+
+        self._refresh(file_name)
+
+    @staticmethod
+    def _new_file_name(form_template):
+        form_name = form_template.get("name")
+        if not form_name or os.sep in form_name or form_name.startswith("."):
+            raise DataStoreException(f"Fail to insert form: '{form_name}' is not a valid file name")
+        return f"{form_name}.json"
+
+    @staticmethod
+    def _is_file_name(identifier):
+        return isinstance(identifier, str) and identifier.endswith(".json") and \
+            os.path.basename(identifier) == identifier
+
+    def _with_file_keys(self, file_name):
+        entry = self._files[file_name]
+        return dict(entry.form_template, _id=file_name, revision=entry.revision)
+
+    def _to_form_template(self, file_name):
+        return copy.deepcopy(self._with_file_keys(file_name))
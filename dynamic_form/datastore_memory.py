@@ -0,0 +1,214 @@
+import copy
+import threading
+import time
+
+from bson import ObjectId
+
+from .interfaces import IDataStore
+from .errors import DataStoreException
+from .query import query, search_page, sort_key
+
+
+class MemoryDataStore(IDataStore):
+    """Data store implementation which keeps the forms in a dict
+
+    Intended for tests, benchmarks and as a local stand-in for a database. The forms are indexed by name and by the
+    deprecated flag. Forms are copied when they are inserted and loaded, like they would be by a database, so that
+    modifications by the caller (i.e. the parser) do not alter the stored forms.
+
+    >>> data_store = MemoryDataStore(latency=0.005)  # Simulate a 5 ms round trip for every call
+
+    """
+
+    def __init__(self, form_templates=None, latency=0):
+        """
+        :param form_templates: Initial form templates
+        :param latency: Artificial latency in seconds added to every call
+        """
+        super(MemoryDataStore, self).__init__()
+
+        self.latency = latency
+        self._lock = threading.RLock()
+        self._forms = {}
+        self._name_index = {}
+        self._deprecated_index = set()
+
+        for form_template in form_templates or []:
+            self._insert(form_template)
+
+    def __repr__(self):
+        return f"MemoryDataStore(forms: {len(self._forms)})"
+
+    def load_forms(self):
+        """Load all forms"""
+        self._wait()
+        with self._lock:
+            form_templates = copy.deepcopy(list(self._forms.values()))
+        for form_template in form_templates:
+            yield form_template
+
+    def load_form(self, identifier):
+        """Load form based on unique identifier"""
+        self._wait()
+        with self._lock:
+            return copy.deepcopy(self._forms.get(identifier))
+
+    def load_form_by_name(self, form_name):
+        """Load the most recent revision of the form based on form_name"""
+        self._wait()
+        with self._lock:
+            return copy.deepcopy(self._current(form_name))
+
+    def insert_form(self, form_template):
+        """Add new form"""
+        self._wait()
+        with self._lock:
+            return self._insert(form_template)
+
+    def insert_forms(self, form_templates):
+        """Add multiple forms with a single (simulated) round trip"""
+        self._wait()
+        results = []
+        with self._lock:
+            for form_template in form_templates:
+                try:
+                    results.append(self._insert(form_template))
+                except DataStoreException as e:
+                    results.append(e)
+        return results
+
+    def upsert_form(self, form_template):
+        """Insert form or replace the form with the same name if the content hash differs
+
+        :raises DataStoreException: If the form has revisions, which are immutable
+        """
+        self._wait()
+        with self._lock:
+            current = self._current(form_template["name"])
+            if current is None:
+                return self._insert(form_template), True
+            if current.get("revision") is not None:
+                raise DataStoreException(f"Fail to upsert form: {form_template['name']} has immutable revisions")
+            if current.get("content_hash") == form_template["content_hash"]:
+                return current["_id"], False
+
+            identifier = current["_id"]
+            self._remove(identifier)
+            self._insert(dict(form_template, _id=identifier))
+            return identifier, True
+
+    def load_form_hash(self, form_name):
+        """Load the content hash of a form"""
+        self._wait()
+        with self._lock:
+            current = self._current(form_name)
+            return current.get("content_hash") if current else None
+
+    def insert_revision(self, form_template):
+        """Add form as a new revision"""
+        self._wait()
+        with self._lock:
+            revision = (self._current_revision(form_template["name"]) or 0) + 1
+            document = {key: value for key, value in form_template.items() if key != "_id"}
+            document["revision"] = revision
+            return self._insert(document), revision
+
+    def load_current_revision(self, form_name):
+        """Load the most recent revision number of a form"""
+        self._wait()
+        with self._lock:
+            return self._current_revision(form_name)
+
+    def load_form_revision(self, form_name, revision):
+        """Load a specific revision of a form"""
+        self._wait()
+        with self._lock:
+            for identifier in self._name_index.get(form_name, []):
+                if self._forms[identifier].get("revision") == revision:
+                    return copy.deepcopy(self._forms[identifier])
+        return None
+
+    def find_form(self, search_filter=None, *args, projection=None, sort=None, limit=0, **kwargs):
+        """Search query to find forms
+
+        Supports the subset of the Mongo query language implemented in :mod:`dynamic_form.query`. Queries on `name` and
+        `deprecated` use the indexes.
+
+        :param dict search_filter: The query
+        :param dict projection: Keys to include (or to exclude if the values are false)
+        :param list sort: List of (key, direction) tuples. Direction is 1 (ascending) or -1 (descending).
+        :param int limit: Maximal number of forms, 0 means no limit
+        :raises DataStoreException: If the query uses an unsupported operator or option
+        """
+        if args or kwargs:
+            raise DataStoreException(f"Unsupported find_form arguments: {list(args) + list(kwargs)}")
+
+        self._wait()
+        search_filter = search_filter or {}
+        with self._lock:
+            form_templates = [self._forms[identifier] for identifier in self._candidates(search_filter)]
+            form_templates = query(form_templates, search_filter, projection, sort, limit)
+
+        for form_template in form_templates:
+            yield form_template
+
+    def search_forms(self, search_filter=None, page_size=50, after=None):
+        """Return one page of form summaries"""
+        self._wait()
+        search_filter = search_filter or {}
+        with self._lock:
+            form_templates = [self._forms[identifier] for identifier in self._candidates(search_filter)]
+            return search_page(form_templates, search_filter, page_size, after)
+
+    def deprecate_form(self, identifier):
+        """Deprecate form (forms should not be deleted)"""
+        self._wait()
+        with self._lock:
+            if identifier in self._forms:
+                self._forms[identifier]["deprecated"] = True
+                self._deprecated_index.add(identifier)
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _insert(self, form_template):
+        """Add form to dict and indexes. As pymongo, an _id is assigned to the passed template if it has none."""
+        identifier = form_template.setdefault("_id", ObjectId())
+        if identifier in self._forms:
+            raise DataStoreException(f"Fail to insert form: duplicate _id {identifier}")
+
+        document = copy.deepcopy(form_template)
+        self._forms[identifier] = document
+        self._name_index.setdefault(document.get("name"), []).append(identifier)
+        if document.get("deprecated") is True:
+            self._deprecated_index.add(identifier)
+        return identifier
+
+    def _remove(self, identifier):
+        document = self._forms.pop(identifier)
+        self._name_index[document.get("name")].remove(identifier)
+        self._deprecated_index.discard(identifier)
+
+    def _current(self, form_name):
+        """Return the stored form with the highest revision (or the first inserted form without revision)"""
+        identifiers = self._name_index.get(form_name)
+        if not identifiers:
+            return None
+        return max((self._forms[identifier] for identifier in identifiers),
+                   key=lambda form_template: sort_key(form_template.get("revision")))
+
+    def _current_revision(self, form_name):
+        revisions = [self._forms[identifier]["revision"] for identifier in self._name_index.get(form_name, [])
+                     if "revision" in self._forms[identifier]]
+        return max(revisions) if revisions else None
+
+    def _candidates(self, search_filter):
+        """Return identifiers of forms which can match the filter, narrowed down by the indexes if possible"""
+        name = search_filter.get("name")
+        if isinstance(name, str):
+            return list(self._name_index.get(name, []))
+        if search_filter.get("deprecated") is True:
+            return list(self._deprecated_index)
+        return list(self._forms)
+
@@ -1,38 +1,92 @@
+import warnings
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
 from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from pymongo.read_preferences import Nearest
 
-from .interfaces import IDataStore
+from .interfaces import IDataStore, FormPage, SUMMARY_KEYS
 from .errors import DataStoreException
 
 
 class MongoDataStore(IDataStore):
-    """Data store implementation for Mongo database """
+    """Data store implementation for Mongo database
+
+    Reads can be sent to secondaries with a read preference. With `hedged_reads`, a read is sent to two members of each
+    shard and the first response is used, which bounds the tail latency of a slow member (MongoDB 4.4 to 7.x sharded
+    clusters). Hedged reads are deprecated since MongoDB 8.0 and PyMongo 4.12 and removed in PyMongo 5.0. Writes and the
+    reads which precede writes always use the primary.
+    """
 
-    def __init__(self, db_collection):
+    def __init__(self, db_collection, read_preference=None, hedged_reads=False, max_time_ms=None):
+        """
+        :param db_collection: The pymongo collection
+        :param read_preference: Read preference for the loads (i.e. pymongo.ReadPreference.SECONDARY_PREFERRED)
+        :param hedged_reads: If true, the loads use the read preference nearest with enabled hedging. Deprecated, as
+        hedged reads are deprecated since MongoDB 8.0 and ignored by its servers. Emits a DeprecationWarning.
+        :param max_time_ms: Time limit of the loads on the server in milliseconds
+        :raises DataStoreException: If hedged_reads is requested, but the installed PyMongo does not support hedging
+        """
         super(MongoDataStore, self).__init__()
 
-        if db_collection and not isinstance(db_collection, Collection):
+        if db_collection is not None and not isinstance(db_collection, Collection):
             raise DataStoreException(f"db_collection has to be a subclass of {Collection.__class__.__name__}")
 
+        if hedged_reads:
+            read_preference = self._hedged_read_preference()
+
         self.collection = db_collection
+        self.max_time_ms = max_time_ms
+        self.read_collection = db_collection
+        if db_collection is not None and read_preference is not None:
+            self.read_collection = db_collection.with_options(read_preference=read_preference)
 
     def __repr__(self):
         return f"MongoDataStore(collection: {self.collection.full_name})"
 
+    @staticmethod
+    def _hedged_read_preference():
+        warnings.warn("hedged_reads is deprecated, as hedged reads are deprecated since MongoDB 8.0 and removed in "
+                      "PyMongo 5.0", DeprecationWarning, stacklevel=3)
+        try:
+            with warnings.catch_warnings():
+                # PyMongo warns as well, the warning above points to the caller instead
+                warnings.simplefilter("ignore", DeprecationWarning)
+                return Nearest(hedge={"enabled": True})
+        except TypeError as e:
+            raise DataStoreException("hedged_reads is not supported by the installed PyMongo version") from e
+
+    def create_indexes(self):
+        """Create the indexes used by the queries of this data store
+
+        The unique index on name and revision guarantees that concurrently inserted revisions get distinct numbers. The
+        second unique index covers the forms with a content hash, i.e. the forms of :meth:`upsert_form`. A missing
+        revision is indexed as null, so it guarantees that concurrent upserts of a new form insert it only once.
+        (A partial index on the forms without revision is not possible, as `$exists: false` is not supported.)
+        """
+        self.collection.create_index([("name", ASCENDING)])
+        self.collection.create_index([("name", ASCENDING), ("revision", DESCENDING)], unique=True,
+                                     partialFilterExpression={"revision": {"$exists": True}})
+        self.collection.create_index([("name", ASCENDING), ("revision", ASCENDING)], unique=True,
+                                     partialFilterExpression={"content_hash": {"$exists": True}})
+
     def load_forms(self):
         """Load all forms from database"""
-        cursor = self.collection.find({})
+        cursor = self.read_collection.find({}, **self._read_options())
         for form_template in cursor:
             yield form_template
 
     def load_form(self, identifier):
         """Load form based on unique identifier"""
-        return self.collection.find_one({"_id": identifier})
+        return self.read_collection.find_one({"_id": identifier}, **self._read_options())
 
     def load_form_by_name(self, form_name):
         """
        load form based on form_name
         """
-        return self.collection.find_one({"name": form_name})
+        return self.read_collection.find_one({"name": form_name}, sort=[("revision", DESCENDING)],
+                                             **self._read_options())
 
     def insert_form(self, form_template):
         """Push new form to the database"""
@@ -40,12 +94,165 @@ class MongoDataStore(IDataStore):
         identifier = result.inserted_id
         return identifier
 
+    def insert_forms(self, form_templates, ordered=False, batch_size=1000):
+        """Push multiple forms to the database with one insert_many call per batch
+
+        :param form_templates: An iterable of form templates
+        :param ordered: If true, the insert stops at the first failing template. Templates which were not attempted
+        are reported as failed.
+        :param batch_size: Maximum number of templates sent to the database in a single insert_many call
+        :return: A list with the unique identifier or a DataStoreException for each template
+        """
+        if batch_size < 1:
+            raise DataStoreException("batch_size has to be a positive integer")
+
+        form_templates = list(form_templates)
+        results = []
+        aborted = False
+        for start in range(0, len(form_templates), batch_size):
+            batch = form_templates[start:start + batch_size]
+
+            if aborted:
+                # A previous batch failed, the remaining templates are not attempted.
+                results.extend(DataStoreException("Form not inserted, an earlier insert failed") for _ in batch)
+                continue
+
+            try:
+                result = self.collection.insert_many(batch, ordered=ordered)
+                results.extend(result.inserted_ids)
+            except BulkWriteError as e:
+                results.extend(self._bulk_write_results(batch, e, ordered))
+                aborted = ordered
+
+        return results
+
+    @staticmethod
+    def _bulk_write_results(batch, error, ordered):
+        """Translate a BulkWriteError into a result per template of the batch"""
+        failed = {write_error["index"]: write_error.get("errmsg", "") for write_error in error.details["writeErrors"]}
+        first_failed = min(failed) if failed else len(batch)
+
+        results = []
+        for index, form_template in enumerate(batch):
+            if index in failed:
+                results.append(DataStoreException(f"Fail to insert form: {failed[index]}"))
+            elif ordered and index > first_failed:
+                results.append(DataStoreException("Form not inserted, an earlier insert failed"))
+            else:
+                # pymongo assigns the _id to the document before it is sent
+                results.append(form_template["_id"])
+        return results
+
+    def upsert_form(self, form_template):
+        """Insert form or replace the form with the same name if the content hash differs
+
+        The hashes are compared by the database. An unchanged form does not cause a write. Revisions are immutable and
+        never replaced. The replace is atomic. Concurrent inserts of a new form are only detected with the indexes of
+        :meth:`create_indexes`; the upsert which loses is then retried as a replace.
+
+        :raises DataStoreException: If the form has revisions
+        :return: Tuple of the unique identifier and a bool which is true if the form was inserted or replaced
+        """
+        form_name = form_template["name"]
+        content_hash = form_template["content_hash"]
+        document = {key: value for key, value in form_template.items() if key != "_id"}
+
+        while True:
+            previous = self.collection.find_one_and_replace({"name": form_name, "revision": {"$exists": False},
+                                                             "content_hash": {"$ne": content_hash}},
+                                                            document, projection={"_id": True})
+            if previous:
+                return previous["_id"], True
+
+            # Either no form with this name exists, its hash is identical or the form has revisions. Only insert in
+            # the first case.
+            identifier = ObjectId()
+            try:
+                existing = self.collection.find_one_and_update({"name": form_name},
+                                                               {"$setOnInsert": dict(document, _id=identifier)},
+                                                               projection={"_id": True, "revision": True}, upsert=True)
+            except DuplicateKeyError:
+                # The form was inserted concurrently, retry
+                continue
+            if existing is None:
+                return identifier, True
+            if existing.get("revision") is not None:
+                raise DataStoreException(f"Fail to upsert form: {form_name} has immutable revisions")
+            return existing["_id"], False
+
+    def load_form_hash(self, form_name):
+        """Load the content hash of a form without transferring the form itself"""
+        form_template = self.collection.find_one({"name": form_name}, projection={"content_hash": True},
+                                                 sort=[("revision", DESCENDING)])
+        if not form_template:
+            return None
+        return form_template.get("content_hash")
+
+    def insert_revision(self, form_template):
+        """Push form as a new revision. Existing revisions are never modified.
+
+        :return: Tuple of the unique identifier and the revision number of the inserted form
+        """
+        document = {key: value for key, value in form_template.items() if key != "_id"}
+
+        while True:
+            document["revision"] = (self._current_revision(self.collection, form_template["name"]) or 0) + 1
+            try:
+                result = self.collection.insert_one(document)
+                return result.inserted_id, document["revision"]
+            except DuplicateKeyError:
+                # Another revision was inserted concurrently, retry with the next revision number
+                document.pop("_id", None)
+
+    def load_current_revision(self, form_name):
+        """Load the most recent revision number of a form. The query is covered by the name/revision index."""
+        return self._current_revision(self.read_collection, form_name, **self._read_options())
+
+    def load_form_revision(self, form_name, revision):
+        """Load a specific revision of a form"""
+        return self.read_collection.find_one({"name": form_name, "revision": revision}, **self._read_options())
+
     def find_form(self, search_filter, *args, **kwargs):
-        """Search query to find forms"""
-        cursor = self.collection.find(search_filter, **kwargs)
+        """Search query to find forms. The arguments are passed to the find method of the collection."""
+        cursor = self.read_collection.find(search_filter, *args, **dict(self._read_options(), **kwargs))
         for form_template in cursor:
             yield form_template
 
+    def search_forms(self, search_filter=None, page_size=50, after=None):
+        """Return one page of form summaries
+
+        Only the summary keys are transferred. The keyset pagination uses the name index.
+        """
+        search_filter = search_filter or {}
+        if after is not None:
+            name, identifier = after
+            keyset = {"$or": [{"name": {"$gt": name}}, {"name": name, "_id": {"$gt": identifier}}]}
+            search_filter = {"$and": [search_filter, keyset]}
+
+        cursor = self.read_collection.find(search_filter, projection={key: True for key in SUMMARY_KEYS},
+                                           sort=[("name", ASCENDING), ("_id", ASCENDING)], limit=page_size,
+                                           **self._read_options())
+        summaries = [{key: form_template.get(key) for key in SUMMARY_KEYS} for form_template in cursor]
+
+        next_key = None
+        if len(summaries) == page_size:
+            next_key = summaries[-1]["name"], summaries[-1]["_id"]
+        return FormPage(summaries, next_key)
+
     def deprecate_form(self, identifier):
         """Deprecate form (forms should not be deleted)"""
         self.collection.update_one({"_id": identifier}, {"$set": {"deprecated": True}})
+
+    def _read_options(self):
+        if self.max_time_ms is None:
+            return {}
+        return {"max_time_ms": self.max_time_ms}
+
+    @staticmethod
+    def _current_revision(collection, form_name, **kwargs):
+        form_template = collection.find_one({"name": form_name, "revision": {"$exists": True}},
+                                            projection={"_id": False, "revision": True},
+                                            sort=[("revision", DESCENDING)], **kwargs)
+        if not form_template:
+            return None
+        return form_template["revision"]
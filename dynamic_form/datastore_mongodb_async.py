@@ -0,0 +1,63 @@
+from pymongo import DESCENDING
+
+from .interfaces import IAsyncDataStore
+from .errors import DataStoreException
+
+# The asynchronous API of pymongo (>= 4.9) and motor are both optional
+_collection_classes = []
+try:
+    from pymongo.asynchronous.collection import AsyncCollection
+    _collection_classes.append(AsyncCollection)
+except ImportError:
+    pass
+try:
+    from motor.motor_asyncio import AsyncIOMotorCollection
+    _collection_classes.append(AsyncIOMotorCollection)
+except ImportError:
+    pass
+
+
+class AsyncMongoDataStore(IAsyncDataStore):
+    """Asynchronous data store implementation for Mongo database
+
+    The collection has to be an `AsyncCollection` of pymongo or an `AsyncIOMotorCollection` of motor.
+    """
+
+    def __init__(self, db_collection):
+        super(AsyncMongoDataStore, self).__init__()
+
+        if db_collection is not None and not isinstance(db_collection, tuple(_collection_classes)):
+            raise DataStoreException(f"db_collection has to be an asynchronous collection "
+                                     f"({', '.join(cls.__name__ for cls in _collection_classes)})")
+
+        self.collection = db_collection
+
+    def __repr__(self):
+        return f"AsyncMongoDataStore(collection: {self.collection.full_name})"
+
+    async def load_forms(self):
+        """Load all forms from database"""
+        async for form_template in self.collection.find({}):
+            yield form_template
+
+    async def load_form(self, identifier):
+        """Load form based on unique identifier"""
+        return await self.collection.find_one({"_id": identifier})
+
+    async def load_form_by_name(self, form_name):
+        """Load the most recent revision of the form based on form_name"""
+        return await self.collection.find_one({"name": form_name}, sort=[("revision", DESCENDING)])
+
+    async def insert_form(self, form_template):
+        """Push new form to the database"""
+        result = await self.collection.insert_one(form_template)
+        return result.inserted_id
+
+    async def find_form(self, search_filter, *args, **kwargs):
+        """Search query to find forms"""
+        async for form_template in self.collection.find(search_filter, **kwargs):
+            yield form_template
+
+    async def deprecate_form(self, identifier):
+        """Deprecate form (forms should not be deleted)"""
+        await self.collection.update_one({"_id": identifier}, {"$set": {"deprecated": True}})
@@ -0,0 +1,310 @@
+import json
+import sqlite3
+import threading
+
+from .interfaces import IDataStore, FormPage, SUMMARY_KEYS
+from .errors import DataStoreException
+from .query import matches, next_page_key, query
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS forms (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT,
+    revision INTEGER,
+    deprecated INTEGER,
+    content_hash TEXT,
+    template TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS forms_name ON forms (name, revision, content_hash);
+CREATE UNIQUE INDEX IF NOT EXISTS forms_name_revision ON forms (name, revision) WHERE revision IS NOT NULL;
+CREATE INDEX IF NOT EXISTS forms_deprecated ON forms (deprecated);
+"""
+
+# Template keys which are stored in an indexed column
+_COLUMNS = {"_id": "id", "name": "name", "revision": "revision", "deprecated": "deprecated",
+            "content_hash": "content_hash"}
+
+
+class SQLiteDataStore(IDataStore):
+    """Data store implementation for a SQLite database file
+
+    The templates are stored as json. Name, revision, deprecated flag and content hash are additionally stored in
+    indexed columns. The database is opened in WAL mode, so that readers in other processes are not blocked by a
+    writer. Every thread uses its own connection.
+    """
+
+    def __init__(self, path, timeout=5.0):
+        """
+        :param path: Path of the database file
+        :param timeout: Seconds to wait for the lock of another writer
+        """
+        super(SQLiteDataStore, self).__init__()
+
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+
+    def __repr__(self):
+        return f"SQLiteDataStore(path: {self.path})"
+
+    def close(self):
+        """Close the connection of the current thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def load_forms(self):
+        """Load all forms"""
+        for row in self._connection().execute("SELECT id, template FROM forms ORDER BY id"):
+            yield self._to_form_template(row)
+
+    def load_form(self, identifier):
+        """Load form based on unique identifier"""
+        row = self._connection().execute("SELECT id, template FROM forms WHERE id = ?", (identifier,)).fetchone()
+        return self._to_form_template(row) if row else None
+
+    def load_form_by_name(self, form_name):
+        """Load the most recent revision of the form based on form_name"""
+        row = self._connection().execute("SELECT id, template FROM forms WHERE name = ? "
+                                         "ORDER BY revision DESC, id LIMIT 1", (form_name,)).fetchone()
+        return self._to_form_template(row) if row else None
+
+    def insert_form(self, form_template):
+        """Insert new form"""
+        with self._transaction() as connection:
+            return self._insert(connection, form_template)
+
+    def insert_forms(self, form_templates):
+        """Insert multiple forms in a single transaction"""
+        results = []
+        with self._transaction() as connection:
+            for form_template in form_templates:
+                try:
+                    results.append(self._insert(connection, form_template))
+                except sqlite3.IntegrityError as e:
+                    results.append(DataStoreException(f"Fail to insert form: {e}"))
+        return results
+
+    def upsert_form(self, form_template):
+        """Insert form or replace the form with the same name if the content hash differs
+
+        :raises DataStoreException: If the form has revisions, which are immutable
+        """
+        with self._transaction() as connection:
+            row = connection.execute("SELECT id, content_hash, revision FROM forms WHERE name = ? "
+                                     "ORDER BY revision DESC, id LIMIT 1", (form_template["name"],)).fetchone()
+            if row is None:
+                return self._insert(connection, form_template), True
+            if row[2] is not None:
+                raise DataStoreException(f"Fail to upsert form: {form_template['name']} has immutable revisions")
+            if row[1] == form_template["content_hash"]:
+                return row[0], False
+
+            connection.execute("UPDATE forms SET name = ?, revision = ?, deprecated = ?, content_hash = ?, "
+                               "template = ? WHERE id = ?", self._values(form_template) + (row[0],))
+            return row[0], True
+
+    def load_form_hash(self, form_name):
+        """Load the content hash of a form. The query is covered by the name index."""
+        row = self._connection().execute("SELECT content_hash FROM forms WHERE name = ? "
+                                         "ORDER BY revision DESC, id LIMIT 1", (form_name,)).fetchone()
+        return row[0] if row else None
+
+    def insert_revision(self, form_template):
+        """Insert form as a new revision. The revision number is assigned within the write transaction."""
+        with self._transaction() as connection:
+            current = connection.execute("SELECT MAX(revision) FROM forms WHERE name = ?",
+                                         (form_template["name"],)).fetchone()[0]
+            revision = (current or 0) + 1
+            identifier = self._insert(connection, dict(form_template, revision=revision))
+            return identifier, revision
+
+    def load_current_revision(self, form_name):
+        """Load the most recent revision number of a form. The query is answered from the name index."""
+        return self._connection().execute("SELECT MAX(revision) FROM forms WHERE name = ?", (form_name,)).fetchone()[0]
+
+    def load_form_revision(self, form_name, revision):
+        """Load a specific revision of a form"""
+        row = self._connection().execute("SELECT id, template FROM forms WHERE name = ? AND revision = ?",
+                                         (form_name, revision)).fetchone()
+        return self._to_form_template(row) if row else None
+
+    def find_form(self, search_filter=None, *args, projection=None, sort=None, limit=0, **kwargs):
+        """Search query to find forms
+
+        Conditions on `_id`, `name`, `revision`, `deprecated` and `content_hash` are translated into SQL on the indexed
+        columns. All other conditions of the subset of the Mongo query language implemented in
+        :mod:`dynamic_form.query` are evaluated on the loaded templates.
+        """
+        if args or kwargs:
+            raise DataStoreException(f"Unsupported find_form arguments: {list(args) + list(kwargs)}")
+
+        clauses, params, remaining_filter = _translate(search_filter or {})
+        sql = "SELECT id, template FROM forms"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+
+        sort = sort or []
+        if not remaining_filter and all(key in _COLUMNS for key, _ in sort):
+            # Sort and limit can be done by the database
+            if sort:
+                sql += " ORDER BY " + ", ".join(f"{_COLUMNS[key]} {'DESC' if direction < 0 else 'ASC'}"
+                                                for key, direction in sort)
+            if limit:
+                sql += f" LIMIT {int(limit)}"
+            sort, limit = [], 0
+
+        form_templates = (self._to_form_template(row) for row in self._connection().execute(sql, params))
+        for form_template in query(form_templates, remaining_filter, projection, sort, limit):
+            yield form_template
+
+    def search_forms(self, search_filter=None, page_size=50, after=None):
+        """Return one page of form summaries
+
+        Label and description are extracted from the json by the database. If the query contains conditions which can
+        not be translated into SQL, the rows are streamed in index order until the page is filled.
+        """
+        clauses, params, remaining_filter = _translate(search_filter or {})
+        if after is not None:
+            clauses.append("(name, id) > (?, ?)")
+            params.extend(after)
+
+        sql = ("SELECT id, name, json_extract(template, '$.label'), json_extract(template, '$.description'), revision"
+               + (", template" if remaining_filter else "") + " FROM forms")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY name, id"
+        if not remaining_filter:
+            sql += f" LIMIT {int(page_size)}"
+
+        summaries = []
+        for row in self._connection().execute(sql, params):
+            if remaining_filter and not matches(self._to_form_template((row[0], row[5])), remaining_filter):
+                continue
+            summaries.append(dict(zip(SUMMARY_KEYS, row[:5])))
+            if len(summaries) == page_size:
+                break
+
+        return FormPage(summaries, next_page_key(summaries, page_size))
+
+    def deprecate_form(self, identifier):
+        """Deprecate form (forms should not be deleted)"""
+        with self._transaction() as connection:
+            row = connection.execute("SELECT id, template FROM forms WHERE id = ?", (identifier,)).fetchone()
+            if row is None:
+                return
+            form_template = dict(json.loads(row[1]), deprecated=True)
+            connection.execute("UPDATE forms SET deprecated = 1, template = ? WHERE id = ?",
+                               (json.dumps(form_template, default=str), identifier))
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Transactions are started explicitly by _transaction
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _transaction(self):
+        return _Transaction(self._connection())
+
+    def _insert(self, connection, form_template):
+        cursor = connection.execute("INSERT INTO forms (name, revision, deprecated, content_hash, template) "
+                                    "VALUES (?, ?, ?, ?, ?)", self._values(form_template))
+        # Like pymongo, assign the identifier to the passed template
+        form_template["_id"] = cursor.lastrowid
+        return cursor.lastrowid
+
+    @staticmethod
+    def _values(form_template):
+        document = {key: value for key, value in form_template.items() if key != "_id"}
+        return (document.get("name"), document.get("revision"), _to_column(document.get("deprecated")),
+                document.get("content_hash"), json.dumps(document, default=str))
+
+    @staticmethod
+    def _to_form_template(row):
+        form_template = json.loads(row[1])
+        form_template["_id"] = row[0]
+        return form_template
+
+
+class _Transaction:
+    """Context manager for a write transaction. BEGIN IMMEDIATE takes the write lock at the start."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+def _to_column(value):
+    return int(value) if isinstance(value, bool) else value
+
+
+def _translate(search_filter):
+    """Translate the conditions on indexed columns into SQL
+
+    :return: Tuple of SQL clauses, their parameters and the filter with all conditions which were not translated
+    """
+    clauses, params, remaining_filter = [], [], {}
+
+    for key, condition in search_filter.items():
+        column = _COLUMNS.get(key)
+        clause = _translate_condition(column, condition) if column else None
+        if clause is None:
+            remaining_filter[key] = condition
+        else:
+            clauses.append(clause[0])
+            params.extend(clause[1])
+
+    return clauses, params, remaining_filter
+
+
+def _translate_condition(column, condition):
+    """Return SQL clause and parameters, or None if the condition can not be translated"""
+    if not isinstance(condition, dict):
+        condition = {"$eq": condition}
+    elif not all(operator.startswith("$") for operator in condition):
+        return None
+
+    clauses, params = [], []
+    for operator, argument in condition.items():
+        if operator in ("$in", "$nin"):
+            if not isinstance(argument, (list, tuple)) or None in argument:
+                return None
+            values = [_to_column(value) for value in argument]
+            placeholders = ", ".join("?" * len(values))
+            if operator == "$in":
+                clauses.append(f"{column} IN ({placeholders})")
+            else:
+                clauses.append(f"({column} IS NULL OR {column} NOT IN ({placeholders}))")
+            params.extend(values)
+        elif operator == "$exists":
+            clauses.append(f"{column} IS {'NOT ' if argument else ''}NULL")
+        elif operator in ("$eq", "$ne"):
+            if isinstance(argument, (dict, list)):
+                return None
+            if argument is None:
+                clauses.append(f"{column} IS {'NOT ' if operator == '$ne' else ''}NULL")
+            elif operator == "$eq":
+                clauses.append(f"{column} = ?")
+                params.append(_to_column(argument))
+            else:
+                clauses.append(f"({column} IS NULL OR {column} != ?)")
+                params.append(_to_column(argument))
+        else:
+            return None
+
+    return " AND ".join(clauses), params
@@ -13,3 +13,11 @@ class DataStoreException(DynamicFormException):
 
 class FormParserException(DynamicFormException):
     pass
+
+
+class TemplateValidationException(FormParserException):
+    """The template does not have the structure of the template format. `errors` lists the TemplateErrors."""
+
+    def __init__(self, message, errors=()):
+        super(TemplateValidationException, self).__init__(message)
+        self.errors = list(errors)
@@ -0,0 +1,71 @@
+from wtforms.fields import FormField
+from wtforms.fields.core import UnboundField
+
+
+class PrototypeBindingMeta:
+    """Form meta which binds fields by copying a prototype instead of constructing them
+
+    The first instance of a form binds its fields as usual and keeps them as prototypes. Further instances copy the
+    prototypes, which skips the constructors of the fields (label, flags and validator checks). The label, the flags and
+    the choices are copied, so that changing them on one form instance does not affect other instances.
+    """
+
+    def bind_field(self, form, unbound_field, options):
+        try:
+            prototype = unbound_field._prototypes[options["name"], options["prefix"]]
+        except (AttributeError, KeyError):
+            field = super().bind_field(form, unbound_field, options)
+            unbound_field.__dict__.setdefault("_prototypes", {})[options["name"], options["prefix"]] = _copy(field)
+            return field
+
+        field = _copy(prototype)
+        field.meta = form.meta
+        if options["translations"] is not None:
+            field._translations = options["translations"]
+        else:
+            field.__dict__.pop("_translations", None)
+        field.label = _copy(prototype.label)
+        field.flags = _copy(prototype.flags)
+        if type(prototype.__dict__.get("choices")) is list:
+            field.choices = list(prototype.choices)
+        return field
+
+
+def _copy(obj):
+    """Return a shallow copy of obj
+
+    copy.copy is slower and does not work for fields, Field.__new__ returns an UnboundField if it is called without form.
+    """
+    copied = object.__new__(type(obj))
+    copied.__dict__.update(obj.__dict__)
+    return copied
+
+
+def prepare_form_class(form_cls):
+    """Prepare a form class (and the classes of its FormFields) for fast instantiation
+
+    The ordering of the fields and the merged meta class, which wtforms otherwise computes on the first instantiation,
+    are precomputed, and fields are bound with the :class:`PrototypeBindingMeta`.
+
+    :param form_cls: A form class, e.g. returned by JsonFlaskParser.to_form
+    :return: The prepared form class
+    """
+    form_cls.Meta = PrototypeBindingMeta
+
+    fields = []
+    for name in dir(form_cls):
+        if name.startswith("_"):
+            continue
+        unbound_field = getattr(form_cls, name)
+        if not isinstance(unbound_field, UnboundField):
+            continue
+        fields.append((name, unbound_field))
+        if issubclass(unbound_field.field_class, FormField):
+            nested_form_cls = unbound_field.kwargs.get("form_class") or unbound_field.args[0]
+            prepare_form_class(nested_form_cls)
+    fields.sort(key=lambda field: (field[1].creation_counter, field[0]))
+    form_cls._unbound_fields = fields
+
+    bases = [mro_class.Meta for mro_class in form_cls.__mro__ if "Meta" in mro_class.__dict__]
+    form_cls._wtforms_meta = type("Meta", tuple(bases), {})
+    return form_cls
@@ -1,23 +1,81 @@
+import copy
+import time
+import weakref
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
 from expiringdict import ExpiringDict
 
 from .interfaces import IDataStore, IFormParser
 from .parser_json import JsonFlaskParser as JsonFormParser
-from .errors import FormManagerException, FormParserException
+from .errors import DataStoreException, FormManagerException, FormParserException
+from .memory import form_size
+from .metrics import FormMetrics
+from .query_cache import QueryCache
+from .template_diff import rebuild_form
+from .tracing import trace, use_tracer
+from .utils import add_current_template, template_hash
 
 
 class FormManager:
     """A controller which fetches form templates from a data store and converts them into Forms.
 
     The forms are cached in an expiring dict (default 60 seconds, 100 items). This reduces traffic to the data store.
+
+    Forms stored as immutable revisions are additionally cached per revision without expiration. When such a form
+    expires from the form cache, only the number of its current revision is requested from the data store and the form
+    is parsed again only if the revision changed.
+
+    Loads can be bounded by a deadline, guarded by a :class:`CircuitBreaker` and limited in their concurrency by a
+    :class:`ConcurrencyLimiter`. If the data store fails, does not respond in time, the circuit breaker is open or the
+    limiter rejects the load, the last parsed version of the form is served even if it expired.
+
+    Cache behaviour and latencies are recorded if a :class:`FormMetrics` instance is passed. If a tracer is passed, a
+    span is emitted per form lookup with nested spans for the data store calls and the parsing (see :mod:`tracing`).
+
+    The estimated memory of the cached forms is reported by :meth:`get_memory_usage`. With `max_cache_bytes`, the least
+    recently cached forms are evicted once the forms kept by the manager (in the form, the stale and the revision cache)
+    exceed the budget.
+
+    With a :class:`RenderCache`, the forms get the content hash of their template as `form_content_hash` and the cached
+    HTML fragments of a form are removed when the form is replaced by a form with different content.
+
+    With a :class:`PopularityTracker`, every lookup by name is counted. If `prefetch_count` is set as well, the initial
+    load and :meth:`update_form_cache` only load the `prefetch_count` most popular forms (see :meth:`prefetch_forms`)
+    instead of all forms, as long as the tracker has counts.
+
+    With a :class:`TemplateValidator`, inserted templates are validated before they are parsed. Invalid templates are
+    rejected with a :class:`TemplateValidationException` which lists every error with its JSON path.
+
+    With `incremental_rebuild`, a changed form is rebuilt from its previous version: only the added and changed fields
+    are parsed (see :mod:`template_diff`). The changes are reported by :meth:`get_form_diff`.
     """
 
-    def __init__(self, data_store=None, format_parser=JsonFormParser(), initial_load=True, max_age_seconds=60):
+    def __init__(self, data_store=None, format_parser=JsonFormParser(), initial_load=True, max_age_seconds=60,
+                 load_timeout=None, circuit_breaker=None, concurrency_limiter=None, metrics=None,
+                 negative_max_age_seconds=None, tracer=None, max_cache_bytes=None, render_cache=None, popularity=None,
+                 prefetch_count=None, template_validator=None, incremental_rebuild=False):
         """
         :param format_parser: A custom parsers to convert the database entry into a FlaskForm. Has to inherit from
         the ParserAdapterInterface class.
         :param data_store: A custom database adapter. Has to be an inherit from DbAdapterInterface
         :param initial_load: If all forms should be loaded
         :param max_age_seconds: Expiration time of cached forms
+        :param load_timeout: Default deadline in seconds for loading a form from the data store. None means no deadline.
+        :param circuit_breaker: A CircuitBreaker which stops calls to a failing data store
+        :param concurrency_limiter: A ConcurrencyLimiter which bounds the number of concurrent loads
+        :param metrics: A FormMetrics which records counters and latencies. None disables the instrumentation.
+        :param negative_max_age_seconds: Expiration time of cached lookups of names without form. None disables it.
+        :param tracer: A tracer with the method start_as_current_span, e.g. a RecordingTracer or an OpenTelemetry
+        tracer. None disables the tracing.
+        :param max_cache_bytes: Budget of the estimated bytes of the forms kept by the manager. None means no budget.
+        :param render_cache: A RenderCache for the static HTML fragments of the forms
+        :param popularity: A PopularityTracker which counts the lookups of the forms
+        :param prefetch_count: Number of the most popular forms loaded initially and on cache updates. None loads all
+        forms.
+        :param template_validator: A TemplateValidator which checks templates before they are parsed and inserted
+        :param incremental_rebuild: If true, unchanged fields of the previous version of a form are reused when the form
+        is parsed again. Requires a JsonFlaskParser.
 
         """
 
@@ -29,52 +87,585 @@ class FormManager:
             raise FormManagerException(f"{format_parser.__class__.__name__} has to be a subclass of f"
                                        f"{IFormParser.__name__}")
 
+        if incremental_rebuild and not isinstance(format_parser, JsonFormParser):
+            raise FormManagerException(f"Incremental rebuilds require a {JsonFormParser.__name__}")
+
         self._data_store = data_store
         self._parser = format_parser
 
         self.form_cache = ExpiringDict(max_len=100, max_age_seconds=max_age_seconds)
+        self.revision_cache = ExpiringDict(max_len=100, max_age_seconds=float("inf"))
+        self._current_revisions = {}
+        self._id_index = {}
+        self._name_ids = {}
+        self.query_cache = QueryCache(max_len=100, max_age_seconds=max_age_seconds)
+        self.stale_cache = ExpiringDict(max_len=100, max_age_seconds=float("inf"))
+        self.negative_cache = None
+        if negative_max_age_seconds:
+            self.negative_cache = ExpiringDict(max_len=100, max_age_seconds=negative_max_age_seconds)
+
+        self.load_timeout = load_timeout
+        self.circuit_breaker = circuit_breaker
+        self.concurrency_limiter = concurrency_limiter
+        self.metrics = metrics
+        self.tracer = tracer
+        self.max_cache_bytes = max_cache_bytes
+        self.render_cache = render_cache
+        self._form_sizes = {}
+        self.popularity = popularity
+        self.prefetch_count = prefetch_count
+        self.template_validator = template_validator
+        self.incremental_rebuild = incremental_rebuild
+        self._load_executor = None
+
         if initial_load:
-            self._fetch_forms()
+            self.update_form_cache()
 
     def set_max_cache_age(self, seconds):
         """Change the expiration time of the form cache"""
         self.form_cache.max_age = seconds
 
-    def get_form_by_name(self, form_name, use_cache=True):
+    def get_form_by_name(self, form_name, use_cache=True, timeout=None):
         """Return form based on form_name
 
-        First, local cache is examined for the form. If unsuccessful, it tries to locate the form in the database.
+        First, local cache is examined for the form. If unsuccessful, it tries to locate the form in the database. If
+        the data store is not available, an expired version of the form is returned if there is one.
 
         :param str form_name: the name of the form
         :param use_cache: If false, always load from data store
+        :param timeout: Deadline in seconds for the data store. Defaults to load_timeout.
         :raises: FormManagerException: If neither cache nor database contains form with passed name
         :returns: A form class as defined in the :class:FormParser
         """
+        if self.popularity is not None:
+            self.popularity.record(form_name)
+
+        if self.metrics is None and self.tracer is None:
+            return self._get_form_by_name(form_name, use_cache, timeout)
 
+        start = time.perf_counter()
+        try:
+            with trace(self.tracer, "form_manager.get_form", {"form.name": form_name}):
+                return self._get_form_by_name(form_name, use_cache, timeout)
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe(FormMetrics.TOTAL, time.perf_counter() - start, form_name)
+
+    def _get_form_by_name(self, form_name, use_cache, timeout):
         if use_cache and form_name in self.form_cache.keys():
             try:
-                return self.form_cache[form_name]
+                form = self.form_cache[form_name]
+                self._count(FormMetrics.HITS, form_name)
+                return form
             except KeyError:
                 pass
 
-        form_template = self._data_store.load_form_by_name(form_name)
+        if use_cache and self.negative_cache is not None and form_name in self.negative_cache:
+            self._count(FormMetrics.NEGATIVE_HITS, form_name)
+            raise FormManagerException(f"Fail to load form. No form found with this name (name:{form_name})")
+
+        if self.metrics is not None:
+            self.metrics.increment(FormMetrics.MISSES, form_name)
+            if form_name in self.stale_cache:
+                self.metrics.increment(FormMetrics.REFRESHES, form_name)
+
+        deadline = self._deadline(timeout)
+        try:
+            if use_cache and form_name in self._current_revisions:
+                revision = self._call_data_store(self._data_store.load_current_revision, form_name, deadline=deadline)
+                form = self.revision_cache.get((form_name, revision))
+                if form is not None:
+                    self.form_cache[form_name] = form
+                    return form
+
+            form_template = self._call_data_store(self._data_store.load_form_by_name, form_name, deadline=deadline)
+        except DataStoreException as e:
+            form = self.stale_cache.get(form_name)
+            if form is not None:
+                self._count(FormMetrics.STALE_HITS, form_name)
+                return form
+            raise FormManagerException(f"Fail to load form. The data store is not available (name:{form_name})") from e
 
         if not form_template:
+            if self.negative_cache is not None:
+                self.negative_cache[form_name] = True
             error_msg = f"Fail to load form. No form found with this name (name:{form_name})"
             raise FormManagerException(error_msg)
 
-        form_name, form = self._parser.to_form(form_template)
-        self.form_cache[form_name] = form
+        identifier = form_template.get("_id")
+        form_name, form = self._parse(form_template)
+        self._cache_form(form_name, form, form_template.get("revision"), identifier)
+        return form
+
+    def get_form_by_id(self, identifier, use_cache=True, timeout=None):
+        """Return form based on its unique identifier
+
+        The form is looked up in the same caches as by :meth:`get_form_by_name`. An index maps the identifiers to the
+        cached forms. It is updated whenever a form is cached, replaced, evicted or deprecated through this manager.
+        A form loaded by identifier which is not the current form of its name (i.e. a duplicate name) is returned, but
+        does not replace the cached form of the name.
+
+        :param identifier: unique identifier of the form
+        :param use_cache: If false, always load from data store
+        :param timeout: Deadline in seconds for the data store. Defaults to load_timeout.
+        :raises: FormManagerException: If neither cache nor database contains form with passed identifier
+        :returns: A form class as defined in the :class:FormParser
+        """
+        entry = self._id_index.get(identifier)
+        if use_cache and entry is not None:
+            form_name, revision = entry
+            if revision is not None:
+                form = self.revision_cache.get((form_name, revision))
+            elif self._name_ids.get(form_name) == identifier:
+                form = self.form_cache.get(form_name)
+            else:
+                form = None
+            if form is not None:
+                self._count(FormMetrics.HITS, form_name)
+                return form
+
+        self._count(FormMetrics.MISSES, entry[0] if entry else None)
+        try:
+            form_template = self._call_data_store(self._data_store.load_form, identifier,
+                                                  deadline=self._deadline(timeout))
+        except DataStoreException as e:
+            raise FormManagerException(f"Fail to load form. The data store is not available (id:{identifier})") from e
+
+        if not form_template:
+            self._unindex_id(identifier)
+            raise FormManagerException(f"Fail to load form. No form found with this id (id:{identifier})")
+
+        revision = form_template.get("revision")
+        form_name, form = self._parse(form_template)
+        if revision is not None:
+            # Possibly not the current revision, cache it without replacing the current form of the name
+            form.form_revision = revision
+            self.revision_cache[(form_name, revision)] = form
+            self._index_id(identifier, form_name, revision)
+        elif self._name_ids.get(form_name, identifier) == identifier or form_name not in self.form_cache:
+            self._cache_form(form_name, form, revision, identifier)
+        return form
+
+    def get_form_by_revision(self, form_name, revision):
+        """Return a specific revision of a form
+
+        Revisions are immutable and therefore cached without expiration.
+
+        :param str form_name: the name of the form
+        :param int revision: the revision number
+        :raises: FormManagerException: If the data store does not contain the revision
+        :returns: A form class as defined in the :class:FormParser
+        """
+        form = self.revision_cache.get((form_name, revision))
+        if form is not None:
+            self._count(FormMetrics.HITS, form_name)
+            return form
+
+        self._count(FormMetrics.MISSES, form_name)
+        try:
+            form_template = self._call_data_store(self._data_store.load_form_revision, form_name, revision,
+                                                  deadline=self._deadline(None))
+        except DataStoreException as e:
+            raise FormManagerException(f"Fail to load form. The data store is not available (name:{form_name})") from e
+
+        if not form_template:
+            error_msg = f"Fail to load form. No form found with this revision (name:{form_name}, revision:{revision})"
+            raise FormManagerException(error_msg)
+
+        identifier = form_template.get("_id")
+        form_name, form = self._parse(form_template)
+        form.form_revision = revision
+        self.revision_cache[(form_name, revision)] = form
+        if identifier is not None:
+            self._index_id(identifier, form_name, revision)
         return form
 
+    def _deadline(self, timeout):
+        timeout = self.load_timeout if timeout is None else timeout
+        return None if timeout is None else time.monotonic() + timeout
+
+    def _call_data_store(self, function, *args, deadline=None):
+        """Call the data store, bounded by the deadline, guarded by the circuit breaker and the concurrency limiter
+
+        :raises DataStoreException: If the data store fails, misses the deadline, the circuit breaker is open or the
+        concurrency limiter rejects the call
+        """
+        if self.tracer is None:
+            return self._call_data_store_bounded(function, *args, deadline=deadline)
+
+        attributes = {"datastore.call": getattr(function, "__name__", None), "form.name": args[0] if args else None}
+        with trace(self.tracer, "datastore.load", attributes):
+            return self._call_data_store_bounded(function, *args, deadline=deadline)
+
+    def _call_data_store_bounded(self, function, *args, deadline=None):
+        start = time.perf_counter() if self.metrics is not None else None
+
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+            raise DataStoreException("The circuit breaker is open")
+
+        if self.concurrency_limiter is not None:
+            timeout = None if deadline is None else deadline - time.monotonic()
+            if not self.concurrency_limiter.acquire(timeout=timeout):
+                if self.circuit_breaker is not None:
+                    # The call did not reach the data store, let another caller make the trial call
+                    self.circuit_breaker.cancel_trial()
+                raise DataStoreException("Too many concurrent calls to the data store")
+            function = self._release_after(function)
+
+        try:
+            if deadline is None:
+                result = function(*args)
+            else:
+                if self._load_executor is None:
+                    self._load_executor = ThreadPoolExecutor(thread_name_prefix="form_manager_load")
+                future = self._load_executor.submit(function, *args)
+                result = future.result(timeout=max(deadline - time.monotonic(), 0))
+        except TimeoutError as e:
+            self._record_data_store_call(False, start, args)
+            raise DataStoreException("The data store did not respond before the deadline") from e
+        except Exception as e:
+            self._record_data_store_call(False, start, args)
+            raise DataStoreException("Fail to call the data store") from e
+
+        self._record_data_store_call(True, start, args)
+        return result
+
+    def _release_after(self, function):
+        """Wrap function to release the concurrency limiter slot when the call finished, even if the caller gave up"""
+        def call(*args):
+            try:
+                return function(*args)
+            finally:
+                self.concurrency_limiter.release()
+        return call
+
+    def _record_data_store_call(self, success, start, args):
+        if self.metrics is not None:
+            self.metrics.observe(FormMetrics.LOAD, time.perf_counter() - start, args[0] if args else None)
+
+        if self.circuit_breaker is None:
+            return
+        if success:
+            self.circuit_breaker.record_success()
+        else:
+            self.circuit_breaker.record_failure()
+
+    def _count(self, name, form_name):
+        if self.metrics is not None:
+            self.metrics.increment(name, form_name)
+
+    def _parse(self, form_template):
+        """Convert the template into a form, record the parse time and trace the parser"""
+        if self.render_cache is not None:
+            # The parser modifies the template, hash it before
+            content_hash = form_template.get("content_hash") or template_hash(form_template)
+            form_name, form = self._timed_parse(form_template)
+            form.form_content_hash = content_hash
+            return form_name, form
+        return self._timed_parse(form_template)
+
+    def _timed_parse(self, form_template):
+        if self.metrics is None and self.tracer is None:
+            return self._to_form(form_template)
+
+        start = time.perf_counter()
+        with use_tracer(self.tracer):
+            form_name, form = self._to_form(form_template)
+        if self.metrics is not None:
+            self.metrics.observe(FormMetrics.PARSE, time.perf_counter() - start, form_name)
+        return form_name, form
+
+    def _to_form(self, form_template):
+        if not self.incremental_rebuild:
+            return self._parser.to_form(form_template)
+
+        previous_form = self.stale_cache.get(form_template.get("name"))
+        form_name, form, _ = rebuild_form(self._parser, form_template, previous_form)
+        return form_name, form
+
+    def get_form_diff(self, form_name):
+        """Return the TemplateDiff of the cached form to the version it was rebuilt from
+
+        :return: TemplateDiff or None if the form is not cached, was parsed completely or incremental_rebuild is off
+        """
+        return getattr(self.stale_cache.get(form_name), "form_template_diff", None)
+
+    def _cache_form(self, form_name, form, revision=None, identifier=None):
+        """Add form to the form cache and, if the form is a revision, to the revision cache
+
+        :param identifier: unique identifier of the form in the data store, used to index the form for get_form_by_id
+        """
+        if self.render_cache is not None:
+            previous_hash = getattr(self.stale_cache.get(form_name), "form_content_hash", None)
+            if previous_hash is not None and previous_hash != getattr(form, "form_content_hash", None):
+                self.render_cache.invalidate(previous_hash)
+
+        if revision is not None:
+            form.form_revision = revision
+            self.revision_cache[(form_name, revision)] = form
+            self._current_revisions[form_name] = revision
+        else:
+            self._current_revisions.pop(form_name, None)
+        if self.negative_cache is not None:
+            self.negative_cache.pop(form_name)
+        if self.metrics is not None and len(self.form_cache) >= self.form_cache.max_len \
+                and form_name not in self.form_cache:
+            self.metrics.increment(FormMetrics.EVICTIONS, form_name)
+        self.form_cache[form_name] = form
+        self.stale_cache[form_name] = form
+        if identifier is not None:
+            self._index_id(identifier, form_name, revision)
+            self._name_ids[form_name] = identifier
+        else:
+            self._unindex_id(self._name_ids.pop(form_name, None))
+
+        if self.max_cache_bytes is not None:
+            self._enforce_memory_budget(form_name)
+
+    def _enforce_memory_budget(self, form_name):
+        """Evict the least recently cached forms, except form_name, until all kept forms fit into max_cache_bytes
+
+        The forms of the form, the stale and the revision cache are counted once each, as by :meth:`get_memory_usage`,
+        because forms which expired from the form cache are still kept by the stale and the revision cache. Evicted
+        forms are removed from all three caches, so that their memory is released.
+        """
+        with self.form_cache.lock:
+            forms = self._kept_forms()
+            sizes = defaultdict(int)
+            for name, form in forms.values():
+                sizes[name] += self._form_size(form)
+            # Forget the sizes of the forms which are no longer kept
+            self._form_sizes = {key: entry for key, entry in self._form_sizes.items() if key in forms}
+            total = sum(sizes.values())
+
+            for name, size in list(sizes.items()):
+                if total <= self.max_cache_bytes:
+                    return
+                if name == form_name:
+                    continue
+                total -= size
+                self.form_cache.pop(name)
+                self.stale_cache.pop(name)
+                self._current_revisions.pop(name, None)
+                for key in [key for key in self.revision_cache.keys() if key[0] == name]:
+                    self.revision_cache.pop(key)
+                self._unindex_name(name)
+                self._count(FormMetrics.EVICTIONS, name)
+
+    def _index_id(self, identifier, form_name, revision):
+        """Map the identifier to the cached form
+
+        If the identifier was indexed under another name (the form was renamed in the data store), the form cached
+        under the old name is dropped.
+        """
+        previous = self._id_index.get(identifier)
+        if previous is not None and previous[0] != form_name and self._name_ids.get(previous[0]) == identifier:
+            del self._name_ids[previous[0]]
+            self.form_cache.pop(previous[0])
+            self.stale_cache.pop(previous[0])
+
+        if revision is not None and self._current_revisions.get(form_name) == revision:
+            # The identifier of the previous current form remains indexed by its revision
+            previous_identifier = self._name_ids.get(form_name)
+            if previous_identifier != identifier and previous_identifier in self._id_index \
+                    and self._id_index[previous_identifier][1] is None:
+                del self._id_index[previous_identifier]
+        elif revision is None and self._name_ids.get(form_name) not in (None, identifier):
+            self._id_index.pop(self._name_ids[form_name], None)
+        self._id_index[identifier] = (form_name, revision)
+
+        if len(self._id_index) > 2 * (self.form_cache.max_len + self.revision_cache.max_len):
+            self._prune_id_index()
+
+    def _unindex_id(self, identifier):
+        """Remove the identifier from the index and its form from the form cache"""
+        entry = self._id_index.pop(identifier, None) if identifier is not None else None
+        if entry is not None and self._name_ids.get(entry[0]) == identifier:
+            del self._name_ids[entry[0]]
+            self.form_cache.pop(entry[0])
+
+    def _unindex_name(self, form_name):
+        self._name_ids.pop(form_name, None)
+        for identifier in [identifier for identifier, entry in self._id_index.items() if entry[0] == form_name]:
+            del self._id_index[identifier]
+
+    def _prune_id_index(self):
+        """Drop the identifiers of forms which expired or were evicted from the caches"""
+        for identifier, (form_name, revision) in list(self._id_index.items()):
+            if revision is not None:
+                cached = (form_name, revision) in self.revision_cache
+            else:
+                cached = self._name_ids.get(form_name) == identifier and form_name in self.form_cache
+            if not cached:
+                del self._id_index[identifier]
+                if self._name_ids.get(form_name) == identifier:
+                    del self._name_ids[form_name]
+
+    def _kept_forms(self):
+        """Return the forms of the form, the stale and the revision cache by id with their names
+
+        The forms are ordered by the stale cache, i.e. the least recently cached form first.
+        """
+        forms = {}
+        for cache in (self.stale_cache, self.form_cache):
+            for form_name, form in cache.items():
+                forms[id(form)] = form_name, form
+        for (form_name, _), form in self.revision_cache.items():
+            forms.setdefault(id(form), (form_name, form))
+        return forms
+
+    def _form_size(self, form):
+        """Return the estimated size of the form, which is computed once per form"""
+        entry = self._form_sizes.get(id(form))
+        if entry is None or entry[0]() is not form:
+            entry = weakref.ref(form), form_size(form)
+            self._form_sizes[id(form)] = entry
+        return entry[1]
+
+    def get_memory_usage(self):
+        """Return the estimated memory of the cached forms and query results in bytes
+
+        Forms held by several caches (i.e. the form, the stale and the revision cache) are counted once.
+
+        :return: Dict with the bytes per form name (all cached revisions of the form), the total bytes of the forms and
+        the bytes of the cached query results
+        """
+        usage = defaultdict(int)
+        for form_name, form in self._kept_forms().values():
+            usage[form_name] += form_size(form)
+
+        return {"forms": dict(usage), "total": sum(usage.values()), "query_cache": self.query_cache.memory_size()}
+
+    def search_forms(self, search_filter=None, page_size=50, after=None):
+        """Return one page of summaries (name, label, description, revision) of the forms matching the search query
+
+        The forms are neither transferred completely nor parsed.
+
+        :param dict search_filter: Search query as accepted by the data store
+        :param int page_size: Maximal number of summaries on the page
+        :param tuple after: The next_key of the previous page
+        :return: FormPage
+        """
+        return self._data_store.search_forms(search_filter, page_size=page_size, after=after)
+
+    def find_forms(self, search_filter=None, use_cache=True, **kwargs):
+        """Return the form templates matching the search query
+
+        The results are cached by the normalized query (filter and options). The cache is invalidated whenever a form
+        is inserted or deprecated through this manager. Its statistics are available from `query_cache.stats()`.
+
+        :param dict search_filter: Search query as accepted by the data store
+        :param use_cache: If false, always query the data store
+        :param kwargs: Options passed to the find_form method of the data store (i.e. projection, sort, limit)
+        :return: List of form templates
+        """
+        search_filter = search_filter or {}
+        key = QueryCache.key(search_filter, **kwargs)
+        if use_cache:
+            form_templates = self.query_cache.get(key)
+            if form_templates is not None:
+                return form_templates
+
+        generation = self.query_cache.invalidations
+        form_templates = list(self._data_store.find_form(search_filter, **kwargs))
+        self.query_cache.set(key, form_templates, generation)
+        return form_templates
+
+    def deprecate_form(self, identifier):
+        """Deprecate form in data store
+
+        :param identifier: unique identifier of the form
+        """
+        self._data_store.deprecate_form(identifier)
+        self._unindex_id(identifier)
+        self.query_cache.invalidate()
+
+    def iter_forms(self, search_filter=None, page_size=50):
+        """Iterate over all forms matching the search query
+
+        The summaries are loaded page by page. A form is only loaded and parsed (or taken from the cache) when the
+        iteration reaches it. Forms are resolved by their revision or identifier, so that each summary yields its own
+        form even if its name is duplicated or it is not the current form of its name.
+
+        :param dict search_filter: Search query as accepted by the data store
+        :param int page_size: Number of summaries loaded at once
+        :return: Generator of (summary, form) tuples
+        """
+        after = None
+        while True:
+            page = self.search_forms(search_filter, page_size=page_size, after=after)
+            for summary in page.summaries:
+                if summary.get("revision") is not None:
+                    yield summary, self.get_form_by_revision(summary["name"], summary["revision"])
+                else:
+                    # By identifier, as the summary is not necessarily the current form of its name
+                    yield summary, self.get_form_by_id(summary["_id"])
+
+            if page.next_key is None:
+                return
+            after = page.next_key
+
     def get_cached_form_names(self):
         """Return names of all form currently in the cache"""
         return self.form_cache.keys()
 
     def update_form_cache(self):
-        """Update local cache with forms from database"""
+        """Update local cache with forms from database
+
+        With a popularity tracker and a prefetch_count, only the most popular forms are loaded.
+        """
+        if self.popularity is not None and self.prefetch_count is not None:
+            names = self.popularity.top(self.prefetch_count)
+            if names:
+                self._clear_form_cache()
+                self._prefetch_forms(names)
+                return
         self._fetch_forms()
 
+    def prefetch_forms(self, count=None, max_workers=None):
+        """Load the most popular forms into the cache
+
+        The forms are loaded with a single query to the data store and parsed in parallel. Forms which are not parsable
+        are skipped.
+
+        :param count: Number of forms to load. Defaults to prefetch_count.
+        :param max_workers: Maximal number of threads used to parse the templates
+        :raises FormManagerException: If the manager has no popularity tracker or the data store is not available
+        :return: The names of the loaded forms, the most popular first
+        """
+        if self.popularity is None:
+            raise FormManagerException("Fail to prefetch forms. The form manager has no popularity tracker.")
+        count = self.prefetch_count if count is None else count
+        return self._prefetch_forms(self.popularity.top(count), max_workers)
+
+    def _prefetch_forms(self, names, max_workers=None):
+        if not names:
+            return []
+        try:
+            loaded_templates = self._call_data_store(self._load_forms_by_name, names, deadline=self._deadline(None))
+        except DataStoreException as e:
+            raise FormManagerException("Fail to prefetch forms. The data store is not available.") from e
+
+        form_templates = {}
+        for form_template in loaded_templates:
+            add_current_template(form_templates, form_template)
+        form_templates = [form_templates[name] for name in names if name in form_templates]
+        identifiers = [form_template.get("_id") for form_template in form_templates]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self._try_parse, form_templates))
+
+        prefetched = []
+        for form_template, identifier, result in zip(form_templates, identifiers, results):
+            if not isinstance(result, Exception):
+                form_name, form = result
+                self._cache_form(form_name, form, form_template.get("revision"), identifier)
+                prefetched.append(form_name)
+        return prefetched
+
+    def _load_forms_by_name(self, names):
+        return list(self._data_store.find_form({"name": {"$in": list(names)}}))
+
     def insert_form(self, form_template):
         """Add form to data store
 
@@ -85,28 +676,156 @@ class FormManager:
         :raise FormParserException: If the form_template is not parsable
         :return: unique identifier of inserted form
         """
+        self._validate(form_template)
         try:
-            form_name, form = self._parser.to_form(form_template)
+            form_name, form = self._parse(form_template)
         except Exception as e:
-            raise FormParserException("Fail to parse from template to form.")
+            raise FormParserException("Fail to parse from template to form.") from e
 
-        self.form_cache[form_name] = form
-        return self._data_store.insert_form(form_template)
+        identifier = self._data_store.insert_form(form_template)
+        self._cache_form(form_name, form, identifier=identifier)
+        self.query_cache.invalidate()
+        return identifier
+
+    def upsert_form(self, form_template):
+        """Add form to data store or replace the stored form with the same name
+
+        A canonical hash of the template content is stored with the template. If the stored form has the same hash, the
+        template is neither parsed nor written. Otherwise the template is parsed (to ensure only valid form templates
+        are stored) and replaces the previous version of the form in a single atomic operation.
+
+        :param form_template:
+        :raise FormParserException: If the form_template is not parsable
+        :return: True if the data store was modified, False if the stored form was already identical
+        """
+        form_name = form_template.get("name")
+        if not form_name:
+            raise FormParserException("Fail to parse from template to form. The template has no name.")
+
+        content_hash = template_hash(form_template)
+        if self._data_store.load_form_hash(form_name) == content_hash:
+            return False
+
+        self._validate(form_template)
+
+        # The parser modifies the template. Parse a copy to store the template as it was passed.
+        try:
+            form_name, form = self._parse(copy.deepcopy(form_template))
+        except Exception as e:
+            raise FormParserException("Fail to parse from template to form.") from e
+
+        identifier, changed = self._data_store.upsert_form(dict(form_template, content_hash=content_hash))
+        self._cache_form(form_name, form, identifier=identifier)
+        if changed:
+            self.query_cache.invalidate()
+        return changed
+
+    def insert_revision(self, form_template):
+        """Add form to data store as a new immutable revision
+
+        The template is parsed before it is inserted to ensure that only valid form templates are added to the data
+        store. If the content of the current revision is identical, no new revision is created.
+
+        :param form_template:
+        :raise FormParserException: If the form_template is not parsable
+        :return: The revision number of the stored form
+        """
+        form_name = form_template.get("name")
+        if not form_name:
+            raise FormParserException("Fail to parse from template to form. The template has no name.")
+
+        content_hash = template_hash(form_template)
+        if self._data_store.load_form_hash(form_name) == content_hash:
+            revision = self._data_store.load_current_revision(form_name)
+            if revision is not None:
+                return revision
+
+        self._validate(form_template)
+
+        # The parser modifies the template. Parse a copy to store the template as it was passed.
+        try:
+            form_name, form = self._parse(copy.deepcopy(form_template))
+        except Exception as e:
+            raise FormParserException("Fail to parse from template to form.") from e
+
+        identifier, revision = self._data_store.insert_revision(dict(form_template, content_hash=content_hash))
+        self._cache_form(form_name, form, revision, identifier)
+        self.query_cache.invalidate()
+        return revision
+
+    def insert_forms(self, form_templates, max_workers=None, **kwargs):
+        """Add multiple forms to data store
+
+        The form templates are parsed in parallel before they are passed in a single call to the data store. Templates
+        which are not parsable are not inserted, but do not abort the insertion of the remaining templates. The parsed
+        forms are added to the cache.
+
+        :param form_templates: An iterable of form templates
+        :param max_workers: Maximal number of threads used to parse the templates
+        :param kwargs: Passed to the insert_forms of the data store, e.g. ordered and batch_size of the MongoDataStore
+        :return: A list with one entry per template, either the unique identifier of the inserted form, a
+        FormParserException if the template is not parsable or the exception raised by the data store
+        """
+        form_templates = list(form_templates)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self._try_validate_and_parse, form_templates))
+
+        valid_indices = [index for index, result in enumerate(results) if not isinstance(result, Exception)]
+        identifiers = self._data_store.insert_forms([form_templates[index] for index in valid_indices], **kwargs)
+        self.query_cache.invalidate()
+
+        for index, identifier in zip(valid_indices, identifiers):
+            if not isinstance(identifier, Exception):
+                form_name, form = results[index]
+                self._cache_form(form_name, form, identifier=identifier)
+            results[index] = identifier
+
+        return results
+
+    def _validate(self, form_template):
+        if self.template_validator is not None:
+            self.template_validator.validate(form_template)
+
+    def _try_validate_and_parse(self, form_template):
+        try:
+            self._validate(form_template)
+        except FormParserException as e:
+            return e
+        # Parse a copy, so that the data store gets the template unchanged
+        return self._try_parse(copy.deepcopy(form_template))
+
+    def _try_parse(self, form_template):
+        """Parse form template and return the raised FormParserException instead of raising it"""
+        try:
+            return self._parse(form_template)
+        except Exception as e:
+            error = FormParserException("Fail to parse from template to form.")
+            error.__cause__ = e
+            return error
 
     def _fetch_forms(self):
         """Fetches all forms from database and stores them in local cache.
 
+        Of forms with multiple revisions, only the most recent revision is parsed.
+
         :raises
             DbException: If the collection contains documents with identical form_names
         """
-        self.form_cache.clear()
-        forms_templates = self._data_store.load_forms()
+        self._clear_form_cache()
+        forms_templates = {}
 
-        for form_template in forms_templates:
-            form_name, form = self._parser.to_form(form_template)
+        for form_template in self._data_store.load_forms():
+            add_current_template(forms_templates, form_template)
 
-            # Prevent overwriting a form which is already in the cache.
-            if form_name in self.form_cache.keys():
-                raise FormManagerException("Collection contains duplicates with name: {}".format(form_name))
+        for form_template in forms_templates.values():
+            identifier = form_template.get("_id")
+            form_name, form = self._parse(form_template)
+            self._cache_form(form_name, form, form_template.get("revision"), identifier)
 
-            self.form_cache[form_name] = form
+    def _clear_form_cache(self):
+        self.form_cache.clear()
+        self._id_index.clear()
+        self._name_ids.clear()
+        if self.negative_cache is not None:
+            self.negative_cache.clear()
@@ -0,0 +1,133 @@
+import asyncio
+
+from expiringdict import ExpiringDict
+
+from .interfaces import IAsyncDataStore, IFormParser
+from .parser_json import JsonFlaskParser as JsonFormParser
+from .errors import FormManagerException, FormParserException
+from .utils import add_current_template
+
+
+class AsyncFormManager:
+    """An asynchronous controller which fetches form templates from a data store and converts them into Forms.
+
+    The counterpart of :class:`FormManager` for asyncio applications. The forms are cached in an expiring dict (default
+    60 seconds, 100 items). Concurrent requests for a form which is not cached share a single load from the data store,
+    and the templates are parsed in an executor so that the event loop is never blocked.
+
+    The cache is empty after initialization. Await :meth:`update_form_cache` to load all forms.
+    """
+
+    def __init__(self, data_store=None, format_parser=JsonFormParser(), max_age_seconds=60, executor=None):
+        """
+        :param data_store: A data store implementing IAsyncDataStore
+        :param format_parser: A custom parsers to convert the database entry into a FlaskForm. Has to inherit from
+        IFormParser.
+        :param max_age_seconds: Expiration time of cached forms
+        :param executor: The concurrent.futures executor used to parse templates. If None, the default executor of the
+        event loop is used.
+        """
+
+        if not isinstance(data_store, IAsyncDataStore):
+            raise FormManagerException(f"{data_store.__class__.__name__} has to be a subclass of "
+                                       f"{IAsyncDataStore.__name__}")
+
+        if not isinstance(format_parser, IFormParser):
+            raise FormManagerException(f"{format_parser.__class__.__name__} has to be a subclass of "
+                                       f"{IFormParser.__name__}")
+
+        self._data_store = data_store
+        self._parser = format_parser
+        self._executor = executor
+
+        self.form_cache = ExpiringDict(max_len=100, max_age_seconds=max_age_seconds)
+        self._pending_loads = {}
+
+    def set_max_cache_age(self, seconds):
+        """Change the expiration time of the form cache"""
+        self.form_cache.max_age = seconds
+
+    async def get_form_by_name(self, form_name, use_cache=True):
+        """Return form based on form_name
+
+        First, local cache is examined for the form. If unsuccessful, it tries to locate the form in the database. If
+        the form is already being loaded by another coroutine, the result of that load is awaited instead.
+
+        :param str form_name: the name of the form
+        :param use_cache: If false, always load from data store
+        :raises: FormManagerException: If neither cache nor database contains form with passed name
+        :returns: A form class as defined in the :class:FormParser
+        """
+        if use_cache:
+            form = self.form_cache.get(form_name)
+            if form is not None:
+                return form
+
+        pending_load = self._pending_loads.get(form_name)
+        if pending_load is None:
+            pending_load = asyncio.ensure_future(self._load_form(form_name))
+            self._pending_loads[form_name] = pending_load
+            pending_load.add_done_callback(lambda future: self._finish_load(form_name, future))
+
+        # Shield the shared load, a cancelled caller must not cancel the load for the other callers.
+        return await asyncio.shield(pending_load)
+
+    def get_cached_form_names(self):
+        """Return names of all form currently in the cache"""
+        return self.form_cache.keys()
+
+    async def update_form_cache(self):
+        """Update local cache with forms from database
+
+        :raises FormManagerException: If the collection contains documents with identical form_names
+        """
+        forms_templates = {}
+        async for form_template in self._data_store.load_forms():
+            add_current_template(forms_templates, form_template)
+
+        forms = [await self._parse(form_template) for form_template in forms_templates.values()]
+
+        self.form_cache.clear()
+        for form_name, form in forms:
+            self.form_cache[form_name] = form
+
+    async def insert_form(self, form_template):
+        """Add form to data store
+
+        Before the form template is inserted into the data store, it is parsed into the form format. This ensures that
+        only valid form templates are added to the data store. The parsed form is added to the cache.
+
+        :param form_template:
+        :raise FormParserException: If the form_template is not parsable
+        :return: unique identifier of inserted form
+        """
+        try:
+            form_name, form = await self._parse(form_template)
+        except Exception as e:
+            raise FormParserException("Fail to parse from template to form.") from e
+
+        self.form_cache[form_name] = form
+        return await self._data_store.insert_form(form_template)
+
+    def _finish_load(self, form_name, pending_load):
+        """Remove the finished load. Its exception is marked as retrieved in case all callers were cancelled."""
+        self._pending_loads.pop(form_name, None)
+        if not pending_load.cancelled():
+            pending_load.exception()
+
+    async def _load_form(self, form_name):
+        """Load form from data store, parse it and add it to the cache"""
+        form_template = await self._data_store.load_form_by_name(form_name)
+
+        if not form_template:
+            error_msg = f"Fail to load form. No form found with this name (name:{form_name})"
+            raise FormManagerException(error_msg)
+
+        form_name, form = await self._parse(form_template)
+        self.form_cache[form_name] = form
+        return form
+
+    async def _parse(self, form_template):
+        """Parse form template in the executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._parser.to_form, form_template)
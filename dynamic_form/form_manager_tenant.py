@@ -0,0 +1,249 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from .interfaces import IDataStore, IFormParser
+from .parser_json import JsonFlaskParser as JsonFormParser
+from .errors import FormManagerException, FormParserException
+
+
+class TenantCache:
+    """A bounded, expiring cache of forms keyed by (tenant, form name) which is shared by all tenants
+
+    Each tenant has a soft quota. A tenant may exceed its quota as long as the cache has room. When the cache is full,
+    the least recently used form of the tenant which exceeds its quota the most (relative to the quota) is evicted.
+    Without an explicit quota, a tenant's quota is its fair share of the cache among the tenants with cached forms, so
+    the cache adapts to the active tenants and idle tenants do not hold any memory.
+    """
+
+    def __init__(self, max_len=1000, max_age_seconds=60):
+        """
+        :param max_len: Maximal number of cached forms of all tenants
+        :param max_age_seconds: Expiration time of cached forms
+        """
+        self.max_len = max_len
+        self.max_age_seconds = max_age_seconds
+        self.quotas = {}
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._len = 0
+
+    def __repr__(self):
+        return f"TenantCache(forms: {self._len}, tenants: {len(self._entries)})"
+
+    def __len__(self):
+        return self._len
+
+    def get(self, tenant, form_name):
+        """Return the cached form or None if the form is not cached or expired"""
+        with self._lock:
+            entries = self._entries.get(tenant)
+            entry = entries.get(form_name) if entries else None
+            if entry is None:
+                return None
+            form, expires = entry
+            if expires < time.monotonic():
+                self._remove(tenant, form_name)
+                return None
+            entries.move_to_end(form_name)
+            return form
+
+    def set(self, tenant, form_name, form):
+        """Add the form, evicting the forms of tenants over their quota if the cache is full"""
+        with self._lock:
+            entries = self._entries.get(tenant)
+            if entries is not None and form_name in entries:
+                entries.move_to_end(form_name)
+            else:
+                while self._len >= self.max_len and self._evict(tenant):
+                    pass
+                entries = self._entries.setdefault(tenant, OrderedDict())
+                self._len += 1
+            entries[form_name] = (form, time.monotonic() + self.max_age_seconds)
+
+    def pop(self, tenant, form_name):
+        with self._lock:
+            entries = self._entries.get(tenant)
+            if entries and form_name in entries:
+                self._remove(tenant, form_name)
+
+    def clear(self, tenant=None):
+        """Remove all forms or all forms of a tenant"""
+        with self._lock:
+            if tenant is None:
+                self._entries.clear()
+                self._len = 0
+            else:
+                self._len -= len(self._entries.pop(tenant, ()))
+
+    def keys(self, tenant):
+        with self._lock:
+            return list(self._entries.get(tenant, ()))
+
+    def quota(self, tenant):
+        """Return the soft quota of the tenant: the explicit quota or its fair share of the cache"""
+        quota = self.quotas.get(tenant)
+        if quota is not None:
+            return quota
+        return max(self.max_len // max(len(self._entries), 1), 1)
+
+    def usage(self):
+        """Return the number of cached forms and the quota per tenant with cached forms"""
+        with self._lock:
+            return {tenant: {"forms": len(entries), "quota": self.quota(tenant)}
+                    for tenant, entries in self._entries.items()}
+
+    def _evict(self, inserting_tenant):
+        """Evict the least recently used form of the tenant with the highest usage relative to its quota
+
+        On a tie, the inserting tenant evicts its own form.
+        """
+        if not self._entries:
+            return False
+        now = time.monotonic()
+        tenant = max(self._entries, key=lambda tenant: (len(self._entries[tenant]) / self.quota(tenant),
+                                                        tenant == inserting_tenant))
+        entries = self._entries[tenant]
+        form_name, (_, expires) = next(iter(entries.items()))
+        self._remove(tenant, form_name)
+        if expires >= now:
+            self.evictions += 1
+        return True
+
+    def _remove(self, tenant, form_name):
+        entries = self._entries[tenant]
+        del entries[form_name]
+        self._len -= 1
+        if not entries:
+            del self._entries[tenant]
+
+
+class MultiTenantFormManager:
+    """A controller which serves the forms of many tenants, each with its own data store, from one shared cache
+
+    Instead of one :class:`FormManager` with its own cache per tenant, all tenants share a :class:`TenantCache`. The
+    memory is therefore bounded by the cache size and used by the active tenants, no matter how many tenants are
+    registered.
+
+    >>> form_manager = MultiTenantFormManager({"customer_a": data_store_a}, max_len=1000, quotas={"customer_a": 200})
+    >>> form_manager.add_tenant("customer_b", data_store_b)
+    >>> LoginForm = form_manager.get_form_by_name("customer_b", "user_login")
+    """
+
+    def __init__(self, data_stores=None, format_parser=JsonFormParser(), max_len=1000, max_age_seconds=60,
+                 quotas=None):
+        """
+        :param data_stores: Dict of data stores by tenant
+        :param format_parser: A custom parsers to convert the database entry into a FlaskForm. Has to inherit from
+        IFormParser.
+        :param max_len: Maximal number of cached forms of all tenants
+        :param max_age_seconds: Expiration time of cached forms
+        :param quotas: Dict of soft quotas (number of forms) by tenant. Tenants without quota get a fair share.
+        """
+        if not isinstance(format_parser, IFormParser):
+            raise FormManagerException(f"{format_parser.__class__.__name__} has to be a subclass of "
+                                       f"{IFormParser.__name__}")
+
+        self._parser = format_parser
+        self._data_stores = {}
+        self.form_cache = TenantCache(max_len=max_len, max_age_seconds=max_age_seconds)
+
+        quotas = quotas or {}
+        for tenant, data_store in (data_stores or {}).items():
+            self.add_tenant(tenant, data_store, quotas.get(tenant))
+
+    def add_tenant(self, tenant, data_store, quota=None):
+        """Register the data store of a tenant
+
+        :param tenant: Hashable identifier of the tenant
+        :param data_store: A data store implementing IDataStore
+        :param quota: Soft quota of the tenant in number of cached forms. None means a fair share of the cache.
+        :raises FormManagerException: If the data store is not an IDataStore or the quota is less than 1
+        """
+        if not isinstance(data_store, IDataStore):
+            raise FormManagerException(f"{data_store.__class__.__name__} has to be a subclass of "
+                                       f"{IDataStore.__name__}")
+        if quota is not None and quota < 1:
+            raise FormManagerException(f"The quota of tenant {tenant} has to be at least 1, not {quota}")
+        self._data_stores[tenant] = data_store
+        if quota is None:
+            self.form_cache.quotas.pop(tenant, None)
+        else:
+            self.form_cache.quotas[tenant] = quota
+
+    def remove_tenant(self, tenant):
+        """Unregister the tenant and remove its forms from the cache"""
+        self._data_stores.pop(tenant, None)
+        self.form_cache.quotas.pop(tenant, None)
+        self.form_cache.clear(tenant)
+
+    def get_tenants(self):
+        return list(self._data_stores)
+
+    def get_form_by_name(self, tenant, form_name, use_cache=True):
+        """Return form of the tenant based on form_name
+
+        :param tenant: The tenant
+        :param str form_name: the name of the form
+        :param use_cache: If false, always load from data store
+        :raises: FormManagerException: If the tenant is unknown or neither cache nor database contains the form
+        :returns: A form class as defined in the :class:FormParser
+        """
+        if use_cache:
+            form = self.form_cache.get(tenant, form_name)
+            if form is not None:
+                return form
+
+        try:
+            form_template = self._data_store(tenant).load_form_by_name(form_name)
+        except FormManagerException:
+            raise
+        except Exception as e:
+            raise FormManagerException(f"Fail to load form. The data store is not available "
+                                       f"(tenant:{tenant}, name:{form_name})") from e
+
+        if not form_template:
+            raise FormManagerException(f"Fail to load form. No form found with this name "
+                                       f"(tenant:{tenant}, name:{form_name})")
+
+        form_name, form = self._parser.to_form(form_template)
+        self.form_cache.set(tenant, form_name, form)
+        return form
+
+    def insert_form(self, tenant, form_template):
+        """Add form to the data store of the tenant
+
+        The template is parsed before it is inserted to ensure that only valid form templates are added to the data
+        store. The parsed form is added to the cache.
+
+        :param tenant: The tenant
+        :param form_template:
+        :raise FormParserException: If the form_template is not parsable
+        :return: unique identifier of inserted form
+        """
+        data_store = self._data_store(tenant)
+        try:
+            form_name, form = self._parser.to_form(copy.deepcopy(form_template))
+        except Exception as e:
+            raise FormParserException("Fail to parse from template to form.") from e
+
+        identifier = data_store.insert_form(form_template)
+        self.form_cache.set(tenant, form_name, form)
+        return identifier
+
+    def get_cached_form_names(self, tenant):
+        """Return names of all forms of the tenant currently in the cache"""
+        return self.form_cache.keys(tenant)
+
+    def get_cache_usage(self):
+        """Return the number of cached forms and the soft quota by tenant with cached forms"""
+        return self.form_cache.usage()
+
+    def _data_store(self, tenant):
+        try:
+            return self._data_stores[tenant]
+        except KeyError:
+            raise FormManagerException(f"Unknown tenant: {tenant}") from None
@@ -1,4 +1,11 @@
 from abc import ABC, abstractmethod
+from collections import namedtuple
+
+# Keys of the lightweight form summaries returned by IDataStore.search_forms
+SUMMARY_KEYS = ("_id", "name", "label", "description", "revision")
+
+# A page of form summaries ordered by name and _id. Pass next_key as `after` to get the next page, None on the last page.
+FormPage = namedtuple("FormPage", ["summaries", "next_key"])
 
 
 class IFormParser(ABC):
@@ -28,9 +35,53 @@ class IDataStore(ABC):
         """Insert form into data store"""
         raise NotImplementedError
 
+    def insert_forms(self, form_templates):
+        """Insert multiple forms into data store
+
+        Returns a list with one entry per template, either the unique identifier of the inserted form or the
+        exception raised while inserting it. Data stores are encouraged to overwrite this method with a bulk write.
+        """
+        results = []
+        for form_template in form_templates:
+            try:
+                results.append(self.insert_form(form_template))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def upsert_form(self, form_template):
+        """Insert form or replace the form with the same name if its content hash differs
+
+        The template has to contain the key `content_hash`. Forms with revisions are immutable, upserting them raises a
+        DataStoreException.
+
+        :return: Tuple of the unique identifier of the stored form and a bool which is true if the data store was
+        modified
+        """
+        raise NotImplementedError
+
+    def load_form_hash(self, form_name):
+        """Load only the content hash of a form based on name. Returns None if no form (or hash) is found."""
+        raise NotImplementedError
+
+    def insert_revision(self, form_template):
+        """Insert form as a new immutable revision. The revision number is assigned by the data store.
+
+        :return: Tuple of the unique identifier and the revision number of the stored form
+        """
+        raise NotImplementedError
+
+    def load_current_revision(self, form_name):
+        """Load only the number of the most recent revision of a form. Returns None if the form has no revisions."""
+        raise NotImplementedError
+
+    def load_form_revision(self, form_name, revision):
+        """Load a specific revision of a form"""
+        raise NotImplementedError
+
     @abstractmethod
     def load_form_by_name(self, name):
-        """Load form from data store based on name"""
+        """Load form from data store based on name. If the form has revisions, the most recent one is returned."""
         raise NotImplementedError
 
     @abstractmethod
@@ -43,7 +94,55 @@ class IDataStore(ABC):
         """Find form in data store based on search query"""
         raise NotImplementedError
 
+    def search_forms(self, search_filter=None, page_size=50, after=None):
+        """Return one page of summaries of the forms matching the search query
+
+        The summaries contain only the SUMMARY_KEYS of the forms and are ordered by name and unique identifier. The
+        pagination is keyset based: a page starts after the (name, identifier) key of the last summary of the previous
+        page.
+
+        :param dict search_filter: Search query as accepted by find_form
+        :param int page_size: Maximal number of summaries on the page
+        :param tuple after: The next_key of the previous page
+        :return: FormPage
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def deprecate_form(self, identifier):
         """Deprecate form in data store"""
         raise NotImplementedError
+
+
+class IAsyncDataStore(ABC):
+    """interface to load form from data store without blocking the event loop."""
+
+    @abstractmethod
+    async def load_form(self, identifier):
+        """Load form from data store based on unique identifier"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def insert_form(self, form_template):
+        """Insert form into data store"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def load_form_by_name(self, name):
+        """Load form from data store based on name. If the form has revisions, the most recent one is returned."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_forms(self):
+        """Load all forms from data store. Returns an asynchronous iterator."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_form(self, *args, **kwargs):
+        """Find form in data store based on search query. Returns an asynchronous iterator."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def deprecate_form(self, identifier):
+        """Deprecate form in data store"""
+        raise NotImplementedError
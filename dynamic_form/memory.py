@@ -0,0 +1,81 @@
+"""Estimates of the memory used by form classes and form templates"""
+import sys
+import types
+
+from wtforms.fields.core import UnboundField
+
+# Objects which are shared by all forms and therefore not counted
+_SHARED_TYPES = (types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+                 types.CodeType, property, classmethod, staticmethod)
+
+
+def _has_fields(cls):
+    return any(isinstance(value, UnboundField) for value in vars(cls).values())
+
+
+def _is_form_class(obj):
+    """Return True if obj is a form class with fields, i.e. a dynamically created form
+
+    The fields may be inherited, as the picklable forms are subclasses of the parsed class (see :mod:`pickling`).
+    """
+    return isinstance(obj, type) and any(_has_fields(cls) for cls in obj.__mro__)
+
+
+def estimate_size(obj, seen=None):
+    """Estimate the bytes of obj and all objects referenced by it
+
+    Containers and the attributes of instances are followed. Classes, functions and modules are shared and not counted,
+    except form classes with fields (i.e. nested forms of a FormField) and their bases with fields. Objects are counted
+    once.
+
+    :param obj: The object to measure
+    :param seen: Set of ids of objects which are not counted (again). Updated with the counted objects.
+    :return: Estimated size in bytes
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    stack = [obj]
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or obj is None or isinstance(obj, (bool, _SHARED_TYPES)):
+            continue
+        seen.add(id(obj))
+
+        if isinstance(obj, type):
+            if not _is_form_class(obj):
+                continue
+            attributes = dict(vars(obj))
+            size += sys.getsizeof(obj) + sys.getsizeof(attributes)
+            stack.extend(attributes.values())
+            stack.extend(cls for cls in obj.__mro__[1:] if _has_fields(cls))
+            continue
+
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, (str, bytes, int, float)):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        else:
+            if hasattr(obj, "__dict__"):
+                size += sys.getsizeof(obj.__dict__)
+                seen.add(id(obj.__dict__))
+                stack.extend(obj.__dict__.values())
+            for slot in getattr(type(obj), "__slots__", ()):
+                stack.append(getattr(obj, slot, None))
+
+    return size
+
+
+def form_size(form, seen=None):
+    """Estimate the bytes of a form class including its fields, validators, choices and nested forms"""
+    return estimate_size(form, seen)
+
+
+def template_size(form_template, seen=None):
+    """Estimate the bytes of a form template"""
+    return estimate_size(form_template, seen)
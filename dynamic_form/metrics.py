@@ -0,0 +1,118 @@
+import bisect
+import threading
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+    """Latency histogram with fixed bucket boundaries in seconds, as used by Prometheus"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :param buckets: Sorted upper bounds of the buckets. A bucket for larger values is added.
+        """
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Return the upper bound of the bucket containing the q-quantile, or the maximum for the last bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return self.max
+
+    def to_dict(self):
+        """Return count, sum, maximum and the cumulative bucket counts keyed by their upper bound"""
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"count": self.count, "sum": self.sum, "max": self.max, "buckets": buckets}
+
+
+class FormMetrics:
+    """Counters and latency histograms of a FormManager
+
+    Pass an instance to the FormManager to enable the instrumentation. Without it, the FormManager does not measure
+    anything. Listeners are called with the metric name, the value (1 for counters, seconds for latencies) and the form
+    name for every event, e.g. to feed a Prometheus or StatsD exporter::
+
+        metrics = FormMetrics()
+        metrics.add_listener(lambda name, value, form_name: statsd.timing(name, value))
+        form_manager = FormManager(data_store, metrics=metrics)
+    """
+
+    HITS = "hits"
+    MISSES = "misses"
+    REFRESHES = "refreshes"
+    NEGATIVE_HITS = "negative_hits"
+    STALE_HITS = "stale_hits"
+    EVICTIONS = "evictions"
+    COUNTERS = (HITS, MISSES, REFRESHES, NEGATIVE_HITS, STALE_HITS, EVICTIONS)
+
+    LOAD = "load_seconds"
+    PARSE = "parse_seconds"
+    TOTAL = "total_seconds"
+    HISTOGRAMS = (LOAD, PARSE, TOTAL)
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :param buckets: Upper bounds of the histogram buckets in seconds
+        """
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._listeners = []
+        self.reset()
+
+    def reset(self):
+        """Set all counters and histograms to zero"""
+        with self._lock:
+            self.counters = dict.fromkeys(self.COUNTERS, 0)
+            self.histograms = {name: Histogram(self.buckets) for name in self.HISTOGRAMS}
+
+    def add_listener(self, listener):
+        """Register a callable listener(name, value, form_name) which is called for every event"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+
+    def increment(self, name, form_name=None):
+        with self._lock:
+            self.counters[name] += 1
+        for listener in self._listeners:
+            listener(name, 1, form_name)
+
+    def observe(self, name, seconds, form_name=None):
+        with self._lock:
+            self.histograms[name].observe(seconds)
+        for listener in self._listeners:
+            listener(name, seconds, form_name)
+
+    def hit_rate(self):
+        """Return the share of lookups served from the cache"""
+        with self._lock:
+            lookups = self.counters[self.HITS] + self.counters[self.MISSES]
+            return self.counters[self.HITS] / lookups if lookups else 0.0
+
+    def snapshot(self):
+        """Return a copy of the counters and the histograms"""
+        with self._lock:
+            result = dict(self.counters)
+            result.update({name: histogram.to_dict() for name, histogram in self.histograms.items()})
+            return result
@@ -1,10 +1,16 @@
+import copy
+
 from flask_wtf import FlaskForm
 
 from wtforms.fields import *
 from wtforms.validators import *
 from wtforms.widgets import *
 
+from .fast_binding import prepare_form_class
 from .interfaces import IFormParser
+from .pickling import get_registered_form, new_form_class, register_form
+from .tracing import start_span
+from .utils import template_hash
 
 
 class JsonFlaskParser(IFormParser):
@@ -15,21 +21,44 @@ class JsonFlaskParser(IFormParser):
     # ...JsonFlaskParser.to_form()
 
     """
-    def __init__(self, form_type=FlaskForm):
+    def __init__(self, form_type=FlaskForm, fast_binding=False, picklable=False):
+        """
+        :param form_type: Base class of the forms
+        :param fast_binding: If true, the forms are prepared for fast instantiation (see :mod:`fast_binding`)
+        :param picklable: If true, the forms keep a copy of their template and can be pickled (see :mod:`pickling`).
+        Parsing a template with the hash of a registered form returns a new subclass of the registered form.
+        """
         self.form_type = form_type
+        self.fast_binding = fast_binding
+        self.picklable = picklable
 
     def to_form(self, template_form):
 
         # Nested forms have their name stored in the property
         form_name = template_form.get("name") or template_form["property"]["name"]
 
-        # Define empty form class with the specified name
-        form_cls = type(form_name, (self.form_type,), {})
-
-        # Add fields to form
-        for field_template in template_form.get("fields"):
-            field_name, field = self._parse_field(field_template)
-            setattr(form_cls, field_name, field)
+        if self.picklable:
+            content_hash = template_hash(template_form)
+            form_cls = get_registered_form(content_hash, self.form_type, self.fast_binding)
+            if form_cls is None:
+                # Keep the template before the parser modifies it
+                pristine_template = copy.deepcopy(template_form)
+                form_name, form_cls = JsonFlaskParser(self.form_type, self.fast_binding).to_form(template_form)
+                register_form(form_cls, pristine_template, content_hash, self.form_type, self.fast_binding)
+            return form_name, new_form_class(form_cls)
+
+        field_templates = template_form.get("fields")
+        with start_span("parser.to_form", {"form.name": form_name, "form.field_count": len(field_templates)}):
+            # Define empty form class with the specified name
+            form_cls = type(form_name, (self.form_type,), {})
+
+            # Add fields to form
+            for field_template in field_templates:
+                field_name, field = self._parse_field(field_template)
+                setattr(form_cls, field_name, field)
+
+            if self.fast_binding:
+                prepare_form_class(form_cls)
 
         return form_name, form_cls
 
@@ -58,40 +87,49 @@ class JsonFlaskParser(IFormParser):
     #
     #     return field
 
+    # Classes which may be referenced by their class_name in templates
+    SUPPORTED_CLASSES = {
+        "StringField": StringField,
+        "PasswordField": PasswordField,
+        "BooleanField": BooleanField,
+        "TextAreaField": TextAreaField,
+        "SelectField": SelectField,
+        "SelectMultipleField": SelectMultipleField,
+        "IntegerField": IntegerField,
+        "DateField": DateField,
+        "DateTimeField": DateTimeField,
+        "FieldList": FieldList,
+        "EmailField": EmailField,
+
+        "FormField": FormField,
+
+        "InputRequired": InputRequired,
+        "DataRequired": DataRequired,
+        "Optional": Optional,
+        "Length": Length,
+        "NumberRange": NumberRange,
+
+        "HiddenInput": HiddenInput,
+        "PasswordInput": PasswordInput,
+        "Input": Input
+    }
+
     @staticmethod
     def _get_cls(cls_name):
-        switcher = {
-            "StringField": StringField,
-            "PasswordField": PasswordField,
-            "BooleanField": BooleanField,
-            "TextAreaField": TextAreaField,
-            "SelectField": SelectField,
-            "SelectMultipleField": SelectMultipleField,
-            "IntegerField": IntegerField,
-            "DateField": DateField,
-            "DateTimeField": DateTimeField,
-            "FieldList": FieldList,
-            "EmailField": EmailField,
-
-            "FormField": FormField,
-
-            "InputRequired": InputRequired,
-            "DataRequired": DataRequired,
-            "Optional": Optional,
-            "Length": Length,
-            "NumberRange": NumberRange,
-
-            "HiddenInput": HiddenInput,
-            "PasswordInput": PasswordInput,
-            "Input": Input
-        }
         try:
-            return switcher[cls_name]
+            return JsonFlaskParser.SUPPORTED_CLASSES[cls_name]
         except KeyError:
             raise Exception(f"{cls_name} is not a supported class name")
 
     @classmethod
     def _parse_field(cls, field_template):
+        with start_span("parser.field", {"field.class_name": field_template.get("class_name")}) as span:
+            field_name, field = cls._parse_field_template(field_template)
+            span.set_attribute("field.name", field_name)
+            return field_name, field
+
+    @classmethod
+    def _parse_field_template(cls, field_template):
 
         # Add field attributes from local and global attributes. Local attributes overwrite global attributes
         value = {}
@@ -250,6 +288,14 @@ class JsonFlaskParser(IFormParser):
 
     @classmethod
     def get_choice(cls, field_template, allow_synonyms):
+        with start_span("parser.choices") as span:
+            choices = cls._get_choice(field_template, allow_synonyms)
+            if isinstance(choices, dict):
+                span.set_attribute("choices.count", len(choices.get("args", {}).get("tuples", [])))
+            return choices
+
+    @classmethod
+    def _get_choice(cls, field_template, allow_synonyms):
         lbl = "choices"
 
         if lbl in field_template["kwargs"]:
@@ -0,0 +1,82 @@
+"""Pickle support for form classes created by the JsonFlaskParser
+
+Classes created at runtime cannot be pickled by reference. A parser with `picklable=True` keeps the template of each
+form class and registers the class by the hash of its template. Each parse returns a new subclass of the registered
+class, so that the attributes of a form (e.g. `form_revision`) are not shared by all forms with the same template, while
+the fields are parsed once. A pickled form class contains the template hash and the template. On unpickling, a new
+subclass of the registered class with this hash is returned, or the class is rebuilt from the template and registered.
+
+Only these subclasses get a dedicated metaclass with the pickle support. Form classes of other parsers, and classes
+derived from the returned forms, are pickled by reference as usual.
+"""
+import copyreg
+import weakref
+
+# Class attributes set by the FormManager, which are restored on unpickling
+_EXTRA_ATTRIBUTES = ("form_revision", "form_content_hash")
+
+_registry = weakref.WeakValueDictionary()
+
+# Metaclasses of the picklable form classes by the metaclass of the form type
+_metaclasses = {}
+
+
+def register_form(form_cls, form_template, content_hash, form_type, fast_binding=False):
+    """Register a parsed form class, whose subclasses from :func:`new_form_class` are picklable
+
+    :param form_cls: The parsed form class
+    :param form_template: An unmodified copy of the template the class was parsed from
+    :param content_hash: Template hash of the template
+    :param form_type: Base class passed to the parser
+    :param fast_binding: fast_binding flag of the parser
+    """
+    key = content_hash, form_type, fast_binding
+    form_cls._pickle_state = key + (form_template,)
+    _registry[key] = form_cls
+
+
+def get_registered_form(content_hash, form_type, fast_binding=False):
+    """Return the registered form class with the template hash or None"""
+    return _registry.get((content_hash, form_type, fast_binding))
+
+
+def new_form_class(registered_cls):
+    """Return a new picklable subclass of a registered form class, which shares its fields"""
+    metaclass = _picklable_metaclass(type(registered_cls))
+    form_cls = metaclass(registered_cls.__name__, (registered_cls,), {
+        "__module__": registered_cls.__module__, "_pickle_state": registered_cls._pickle_state})
+    # Keep the ordering of the fields and the meta class, which are precomputed with fast binding
+    for name in ("_unbound_fields", "_wtforms_meta"):
+        if getattr(registered_cls, name) is not None:
+            setattr(form_cls, name, getattr(registered_cls, name))
+    return form_cls
+
+
+def _picklable_metaclass(metaclass):
+    picklable_metaclass = _metaclasses.get(metaclass)
+    if picklable_metaclass is None:
+        picklable_metaclass = type(f"Picklable{metaclass.__name__}", (metaclass,), {"__module__": __name__})
+        copyreg.pickle(picklable_metaclass, _reduce_form_class)
+        picklable_metaclass = _metaclasses.setdefault(metaclass, picklable_metaclass)
+    return picklable_metaclass
+
+
+def _reduce_form_class(form_cls):
+    state = form_cls.__dict__.get("_pickle_state")
+    if state is None:
+        # A class derived from a picklable form, pickle by reference like any other class
+        return form_cls.__qualname__
+    extra_attributes = {name: form_cls.__dict__[name] for name in _EXTRA_ATTRIBUTES if name in form_cls.__dict__}
+    return _rebuild_form_class, state + (extra_attributes,)
+
+
+def _rebuild_form_class(content_hash, form_type, fast_binding, form_template, extra_attributes):
+    form_cls = get_registered_form(content_hash, form_type, fast_binding)
+    if form_cls is None:
+        from .parser_json import JsonFlaskParser
+        _, form_cls = JsonFlaskParser(form_type, fast_binding=fast_binding, picklable=True).to_form(form_template)
+    else:
+        form_cls = new_form_class(form_cls)
+    for name, value in extra_attributes.items():
+        setattr(form_cls, name, value)
+    return form_cls
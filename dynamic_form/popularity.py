@@ -0,0 +1,140 @@
+import heapq
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class PopularityTracker:
+    """Access frequency of forms as exponentially decayed counts
+
+    Every access adds 1 to the count of the form, which halves every `half_life_seconds`. The counts are kept with
+    forward decay: an access at time t adds 2 ** ((t - landmark) / half_life_seconds), so recording is O(1) and the
+    order of the forms does not change with time. The counts are rescaled before the weights overflow.
+
+    With a path, the counts are loaded from and saved to a small JSON file, at most every `save_interval` seconds when
+    forms are accessed and whenever :meth:`save` is called::
+
+        popularity = PopularityTracker(path="form_popularity.json")
+        form_manager = FormManager(data_store, popularity=popularity, prefetch_count=50)
+    """
+
+    # Rescale the weights before 2 ** exponent gets close to the float range
+    MAX_EXPONENT = 512
+
+    def __init__(self, half_life_seconds=3600, max_names=10000, path=None, save_interval=60):
+        """
+        :param half_life_seconds: Seconds after which an access counts half
+        :param max_names: Maximal number of tracked form names. The least popular names are dropped.
+        :param path: JSON file to persist the counts. None keeps them in memory only.
+        :param save_interval: Minimal seconds between two automatic saves
+        """
+        self.half_life_seconds = half_life_seconds
+        self.max_names = max_names
+        self.path = path
+        self.save_interval = save_interval
+
+        self._lock = threading.Lock()
+        self._weights = {}
+        self._landmark = time.time()
+        self._last_save = time.monotonic()
+
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __repr__(self):
+        return f"PopularityTracker(names: {len(self._weights)})"
+
+    def record(self, form_name, now=None):
+        """Count an access of the form
+
+        An automatic save which fails is logged and not raised, as the counts are only a hint for pre-warming the cache.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            exponent = (now - self._landmark) / self.half_life_seconds
+            if exponent > self.MAX_EXPONENT:
+                self._rescale(now)
+                exponent = 0.0
+            self._weights[form_name] = self._weights.get(form_name, 0.0) + 2.0 ** exponent
+            if len(self._weights) > 2 * self.max_names:
+                self._weights = dict(heapq.nlargest(self.max_names, self._weights.items(), key=lambda item: item[1]))
+
+            # Claim the save under the lock, so that only one of concurrent accesses saves
+            save = self.path is not None and time.monotonic() - self._last_save >= self.save_interval
+            if save:
+                self._last_save = time.monotonic()
+
+        if save:
+            try:
+                self.save()
+            except OSError:
+                logger.exception("Fail to save the form popularity to %s", self.path)
+
+    def scores(self, now=None):
+        """Return the decayed counts by form name"""
+        now = time.time() if now is None else now
+        with self._lock:
+            factor = 2.0 ** ((self._landmark - now) / self.half_life_seconds)
+            return {form_name: weight * factor for form_name, weight in self._weights.items()}
+
+    def top(self, n):
+        """Return the names of the n most popular forms, the most popular first"""
+        with self._lock:
+            return heapq.nlargest(n, self._weights, key=self._weights.__getitem__)
+
+    def clear(self):
+        with self._lock:
+            self._weights.clear()
+
+    def save(self, path=None):
+        """Write the counts to the JSON file. The file is replaced atomically.
+
+        :raises OSError: If the file cannot be written
+        """
+        path = path or self.path
+        with self._lock:
+            data = {"half_life_seconds": self.half_life_seconds, "landmark": self._landmark,
+                    "weights": dict(self._weights)}
+            self._last_save = time.monotonic()
+
+        # A unique temporary file per save, as concurrent saves must not write to the same file
+        with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(path) or ".", suffix=".tmp", delete=False) as file:
+            json.dump(data, file)
+        try:
+            os.replace(file.name, path)
+        except OSError:
+            os.remove(file.name)
+            raise
+
+    def load(self, path=None):
+        """Replace the counts by the counts in the JSON file
+
+        The counts are decayed with the half life they were saved with until now. Unreadable files are ignored, as the
+        counts are only a hint for pre-warming the cache.
+        """
+        try:
+            with open(path or self.path) as file:
+                data = json.load(file)
+            landmark = float(data["landmark"])
+            half_life_seconds = float(data["half_life_seconds"])
+            weights = {str(form_name): float(weight) for form_name, weight in data["weights"].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return
+
+        now = time.time()
+        factor = 2.0 ** (min(landmark - now, 0) / half_life_seconds) if half_life_seconds > 0 else 0.0
+        with self._lock:
+            self._weights = {form_name: weight * factor for form_name, weight in weights.items() if weight * factor > 0}
+            self._landmark = now
+
+    def _rescale(self, now):
+        """Move the landmark to now, keeping the decayed counts"""
+        factor = 2.0 ** ((self._landmark - now) / self.half_life_seconds)
+        self._weights = {form_name: weight * factor for form_name, weight in self._weights.items()
+                         if weight * factor > 0}
+        self._landmark = now
@@ -0,0 +1,144 @@
+"""A minimal subset of the Mongo query language for data stores which keep the forms in memory
+
+Supported are equality on (dotted) keys, the operators `$eq`, `$ne`, `$in`, `$nin` and `$exists` and the logical
+operators `$and`, `$or` and `$nor`.
+"""
+import copy
+
+from .errors import DataStoreException
+from .interfaces import FormPage, SUMMARY_KEYS
+
+MISSING = object()
+
+
+def query(documents, search_filter=None, projection=None, sort=None, limit=0):
+    """Filter, sort, limit and project documents
+
+    :param documents: An iterable of documents
+    :param dict search_filter: The query
+    :param dict projection: Keys to include (or to exclude if the values are false)
+    :param list sort: List of (key, direction) tuples. Direction is 1 (ascending) or -1 (descending).
+    :param int limit: Maximal number of documents, 0 means no limit
+    :return: A list with copies of the matching documents
+    :raises DataStoreException: If the query uses an unsupported operator
+    """
+    documents = [document for document in documents if matches(document, search_filter or {})]
+
+    for key, direction in reversed(sort or []):
+        documents.sort(key=lambda document: sort_key(get_path(document, key)), reverse=direction < 0)
+    if limit:
+        documents = documents[:limit]
+
+    return [project(document, projection) for document in documents]
+
+
+def search_page(documents, search_filter=None, page_size=50, after=None):
+    """Return a page of summaries of the matching documents, ordered by name and _id
+
+    :param documents: An iterable of documents
+    :param dict search_filter: The query
+    :param int page_size: Maximal number of summaries
+    :param tuple after: Only documents with a larger (name, _id) key are returned
+    :return: FormPage
+    """
+    documents = [document for document in documents if matches(document, search_filter or {})]
+    documents.sort(key=page_key)
+
+    if after is not None:
+        after = page_key({"name": after[0], "_id": after[1]})
+        documents = [document for document in documents if page_key(document) > after]
+
+    summaries = [{key: document.get(key) for key in SUMMARY_KEYS} for document in documents[:page_size]]
+    return FormPage(summaries, next_page_key(summaries, page_size))
+
+
+def page_key(document):
+    return sort_key(document.get("name")), sort_key(document.get("_id"))
+
+
+def next_page_key(summaries, page_size):
+    """Return the key of the last summary if the page is full, otherwise None"""
+    if summaries and len(summaries) == page_size:
+        return summaries[-1]["name"], summaries[-1]["_id"]
+    return None
+
+
+def get_path(document, path):
+    """Return the value of a dotted key or MISSING"""
+    value = document
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return MISSING
+        value = value[key]
+    return value
+
+
+def matches(document, search_filter):
+    """Return True if the document matches all conditions of the filter
+
+    :raises DataStoreException: If the filter uses an unsupported operator
+    """
+    for path, condition in search_filter.items():
+        if path.startswith("$"):
+            if not apply_logical_operator(document, path, condition):
+                return False
+            continue
+        value = get_path(document, path)
+        if isinstance(condition, dict) and any(key.startswith("$") for key in condition):
+            if not all(apply_operator(operator, value, argument) for operator, argument in condition.items()):
+                return False
+        elif value is MISSING or value != condition:
+            # As in Mongo, a query for None also matches a missing key
+            if not (condition is None and value is MISSING):
+                return False
+    return True
+
+
+def apply_logical_operator(document, operator, search_filters):
+    """Evaluate a top level operator, which combines filters, on the document"""
+    if operator not in ("$and", "$or", "$nor"):
+        raise DataStoreException(f"{operator} is not a supported query operator")
+    if not isinstance(search_filters, (list, tuple)) or not search_filters \
+            or not all(isinstance(search_filter, dict) for search_filter in search_filters):
+        raise DataStoreException(f"{operator} requires a non-empty array of filters")
+    if operator == "$and":
+        return all(matches(document, search_filter) for search_filter in search_filters)
+    if operator == "$or":
+        return any(matches(document, search_filter) for search_filter in search_filters)
+    return not any(matches(document, search_filter) for search_filter in search_filters)
+
+
+def apply_operator(operator, value, argument):
+    """Evaluate a single query operator on the value of a document"""
+    if operator == "$eq":
+        return value is not MISSING and value == argument
+    if operator == "$ne":
+        return value is MISSING or value != argument
+    if operator == "$in":
+        return value is not MISSING and value in argument
+    if operator == "$nin":
+        return value is MISSING or value not in argument
+    if operator == "$exists":
+        return (value is not MISSING) == bool(argument)
+    raise DataStoreException(f"{operator} is not a supported query operator")
+
+
+def sort_key(value):
+    """Sort missing values and None first, like Mongo does"""
+    if value is MISSING or value is None:
+        return 0, ""
+    return 1, value
+
+
+def project(document, projection):
+    """Return a copy of the document which contains only the keys selected by the projection"""
+    document = copy.deepcopy(document)
+    if not projection:
+        return document
+
+    include = {key for key, value in projection.items() if value}
+    if include:
+        include_id = projection.get("_id", True)
+        return {key: value for key, value in document.items()
+                if key in include or (key == "_id" and include_id)}
+    return {key: value for key, value in document.items() if key not in projection}
@@ -0,0 +1,85 @@
+import copy
+import json
+import threading
+
+from expiringdict import ExpiringDict
+
+from .memory import template_size
+
+
+class QueryCache:
+    """A cache for the results of find_form queries
+
+    The results are stored under a canonical key of the query, so that filters which differ only in the order of their
+    keys share an entry. Entries expire after `max_age` seconds and at most `max_len` results are kept.
+    """
+
+    def __init__(self, max_len=100, max_age_seconds=60):
+        self._results = ExpiringDict(max_len=max_len, max_age_seconds=max_age_seconds)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def max_len(self):
+        return self._results.max_len
+
+    @max_len.setter
+    def max_len(self, max_len):
+        self._results.max_len = max_len
+
+    @property
+    def max_age(self):
+        return self._results.max_age
+
+    @max_age.setter
+    def max_age(self, seconds):
+        self._results.max_age = seconds
+
+    @staticmethod
+    def key(search_filter, **kwargs):
+        """Return the canonical key of a query. Values which are not json serializable are represented by repr."""
+        return json.dumps([search_filter, kwargs], sort_keys=True, separators=(",", ":"), default=repr)
+
+    def get(self, key):
+        """Return a copy of the cached result or None"""
+        result = self._results.get(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return copy.deepcopy(result)
+
+    def set(self, key, result, generation=None):
+        """Cache a copy of the result
+
+        :param generation: The value of `invalidations` before the query was started. If the cache was invalidated in
+        the meantime, the result may be outdated and is not cached.
+        """
+        if generation is not None and generation != self.invalidations:
+            return
+        self._results[key] = copy.deepcopy(result)
+
+    def invalidate(self):
+        """Remove all cached results"""
+        self._results.clear()
+        with self._lock:
+            self.invalidations += 1
+
+    def memory_size(self):
+        """Return the estimated bytes of the cached results"""
+        return template_size(self._results.values())
+
+    def stats(self):
+        """Return hits, misses, hit rate, invalidations and the number of cached results"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "invalidations": self.invalidations,
+                "size": len(self._results),
+            }
@@ -0,0 +1,147 @@
+import threading
+
+from expiringdict import ExpiringDict
+from markupsafe import Markup, escape
+from wtforms.meta import DefaultMeta
+from wtforms.widgets import Select, html_params
+
+
+class RenderCache:
+    """Cache of the static HTML fragments of forms
+
+    Labels, descriptions and the options of select fields do not change between requests for a form with the same
+    content. The fragments are cached by the content hash of the form (`form_content_hash`, set by a FormManager with a
+    render cache), the field and the widget. Only the value dependent parts, i.e. which option is selected, are rendered
+    per request. Forms without content hash are rendered without cache.
+
+    In a template::
+
+        {{ render_cache.label(form, "species") }}
+        {{ render_cache.render_field(form, "species", class_="form-select") }}
+
+    """
+
+    def __init__(self, max_len=10000):
+        """
+        :param max_len: Maximal number of cached fragments
+        """
+        self._fragments = ExpiringDict(max_len=max_len, max_age_seconds=float("inf"))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def label(self, form, field_name, **kwargs):
+        """Return the rendered label of a field"""
+        field = form[field_name]
+        return self._get(form, field, ("label", field.label.text, _items(kwargs)), lambda: field.label(**kwargs))
+
+    def description(self, form, field_name):
+        """Return the escaped description of a field"""
+        field = form[field_name]
+        return self._get(form, field, ("description", field.description), lambda: Markup(escape(field.description)))
+
+    def render_field(self, form, field_name, **kwargs):
+        """Render a field. The options of select fields are cached, other fields are rendered by their widget."""
+        field = form[field_name]
+        content_hash = getattr(type(form), "form_content_hash", None)
+        if content_hash is None or type(field.widget) is not Select or field.has_groups() \
+                or type(field.meta).render_field is not DefaultMeta.render_field:
+            return field(**kwargs)
+
+        kwargs = _select_kwargs(field, _render_kw(field, kwargs))
+        key = ("select", _items(kwargs))
+        if key[1] is None:
+            return field(**kwargs)
+
+        options = self._get(form, field, key, lambda: _render_options(field))
+        html = [f"<select {html_params(name=field.name, **kwargs)}>"]
+        for index, (value, label, selected, *_) in enumerate(field.iter_choices()):
+            if index >= len(options) or options[index][0] != value:
+                # The choices of this form instance differ from the cached ones
+                return field.widget(field, **kwargs)
+            html.append(options[index][2 if selected else 1])
+        if len(html) != len(options) + 1:
+            return field.widget(field, **kwargs)
+        html.append("</select>")
+        return Markup("".join(html))
+
+    def _get(self, form, field, part, render):
+        content_hash = getattr(type(form), "form_content_hash", None)
+        if content_hash is None or None in part:
+            return render()
+
+        key = (content_hash, field.name, type(field.widget).__name__) + part
+        fragment = self._fragments.get(key)
+        with self._lock:
+            if fragment is not None:
+                self.hits += 1
+                return fragment
+            self.misses += 1
+        fragment = render()
+        self._fragments[key] = fragment
+        return fragment
+
+    def invalidate(self, content_hash=None):
+        """Remove the fragments of the forms with the content hash, or all fragments"""
+        if content_hash is None:
+            self._fragments.clear()
+            return
+        for key in list(self._fragments.keys()):
+            if key[0] == content_hash:
+                self._fragments.pop(key)
+
+    def stats(self):
+        """Return hits, misses and the number of cached fragments"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._fragments)}
+
+
+def _items(kwargs):
+    """Return the keyword arguments as hashable key, None if a value is not hashable"""
+    items = tuple(sorted(kwargs.items()))
+    try:
+        hash(items)
+    except TypeError:
+        return None
+    return items
+
+
+def _clean_key(key):
+    """Clean a keyword argument of a field, as wtforms.utils.clean_key"""
+    key = key.rstrip("_")
+    if key.startswith("data_") or key.startswith("aria_"):
+        key = key.replace("_", "-")
+    return key
+
+
+def _render_kw(field, kwargs):
+    """Merge the render_kw of the field into the keyword arguments, as DefaultMeta.render_field"""
+    kwargs = {_clean_key(key): value for key, value in kwargs.items()}
+    if getattr(field, "render_kw", None) is not None:
+        kwargs = dict({_clean_key(key): value for key, value in field.render_kw.items()}, **kwargs)
+    return kwargs
+
+
+def _select_kwargs(field, kwargs):
+    """Return the attributes of the select tag as set by the Select widget"""
+    kwargs = dict(kwargs)
+    kwargs.setdefault("id", field.id)
+    if field.widget.multiple:
+        kwargs["multiple"] = True
+    for key in field.widget.validation_attrs:
+        if key not in kwargs and key in vars(field.flags):
+            kwargs[key] = getattr(field.flags, key)
+    return kwargs
+
+
+def _render_options(field):
+    """Return (value, unselected option, selected option) per choice
+
+    The choices are 3-tuples before WTForms 3.1 and 4-tuples with the render_kw of the option since.
+    """
+    options = []
+    for value, label, _, *render_kw in field.iter_choices():
+        render_kw = render_kw[0] if render_kw else {}
+        options.append((value, Select.render_option(value, label, False, **render_kw),
+                        Select.render_option(value, label, True, **render_kw)))
+    return tuple(options)
@@ -0,0 +1,136 @@
+"""Field level differences of form templates and incremental rebuilds of forms
+
+A form built by :func:`rebuild_form` keeps a snapshot of its field templates as `form_field_templates`. When the
+template of the form changes, only the added and changed fields are parsed again. The unchanged fields reuse the
+UnboundFields of the previous form, including their choices and validators, so that the cost of a rebuild is a
+comparison of the templates plus the parsing of the changed fields::
+
+    form_name, form_cls, diff = rebuild_form(JsonFlaskParser(), new_template, previous_form_cls)
+    print(diff.added, diff.removed, diff.changed)
+
+The fields are compared with `==` rather than by a content hash (see :func:`template_hash`). Hashing serializes the
+templates, which costs about as much as parsing them, while comparing dicts runs in C and stops at the first
+difference. The snapshot shares the property of the field (i.e. the controlled vocabulary) with the parsed template,
+as the parser does not modify it, and copies the rest.
+"""
+import copy
+from collections import namedtuple
+
+from wtforms.fields.core import UnboundField
+
+from .fast_binding import prepare_form_class
+from .tracing import start_span
+
+TemplateDiff = namedtuple("TemplateDiff", ["added", "removed", "changed", "unchanged"])
+TemplateDiff.__doc__ = "Names of the added, removed, changed and unchanged fields of a form template"
+
+
+def field_templates(form_template):
+    """Return the field templates by field name, in the order of the fields
+
+    :return: Dict of field templates by field name or None if a field has no property name
+    """
+    fields = {}
+    for field_template in form_template.get("fields") or []:
+        field_property = field_template.get("property") if isinstance(field_template, dict) else None
+        field_name = field_property.get("name") if isinstance(field_property, dict) else None
+        if not field_name:
+            return None
+        fields[field_name] = field_template
+    return fields
+
+
+def diff_field_templates(previous_fields, fields):
+    """Return the TemplateDiff of two results of :func:`field_templates`"""
+    added, changed, unchanged = [], [], []
+    for field_name, field_template in fields.items():
+        previous_field = previous_fields.get(field_name)
+        if previous_field is None:
+            added.append(field_name)
+        elif previous_field != field_template:
+            changed.append(field_name)
+        else:
+            unchanged.append(field_name)
+    removed = [field_name for field_name in previous_fields if field_name not in fields]
+    return TemplateDiff(added, removed, changed, unchanged)
+
+
+def diff_templates(previous_template, form_template):
+    """Return the TemplateDiff of two versions of a form template
+
+    :raises ValueError: If a field of the templates has no property name
+    """
+    previous_fields, fields = field_templates(previous_template), field_templates(form_template)
+    if previous_fields is None or fields is None:
+        raise ValueError("Every field of the templates needs a property name")
+    return diff_field_templates(previous_fields, fields)
+
+
+def rebuild_form(parser, form_template, previous_form=None):
+    """Build the form of the template, reusing the unchanged fields of the previous form
+
+    The form gets a snapshot of the field templates as `form_field_templates` and the difference to the previous form as
+    `form_template_diff`. Without previous form (or if the previous form was not built by this function), the template
+    is parsed completely and the diff is None. Nested forms are reused or parsed as a whole. Picklable parsers always
+    parse completely, as their forms are shared through the registry of :mod:`pickling`.
+
+    :param parser: A JsonFlaskParser
+    :param dict form_template: The form template. It is modified as by JsonFlaskParser.to_form.
+    :param previous_form: The previous version of the form
+    :return: Tuple of the form name, the form class and the TemplateDiff
+    """
+    fields = field_templates(form_template)
+    previous_fields = getattr(previous_form, "form_field_templates", None)
+    # The parser modifies the template, take the snapshot before
+    snapshot = None if fields is None or parser.picklable else _snapshot(fields)
+
+    if snapshot is None or previous_fields is None:
+        form_name, form_cls = parser.to_form(form_template)
+        if snapshot is not None:
+            form_cls.form_field_templates = snapshot
+            form_cls.form_template_diff = None
+        return form_name, form_cls, None
+
+    diff = diff_field_templates(previous_fields, fields)
+    reusable = set(diff.unchanged)
+    form_name = form_template.get("name") or form_template["property"]["name"]
+
+    attributes = {"form.name": form_name, "form.field_count": len(fields), "form.reused_field_count": len(reusable)}
+    with start_span("parser.rebuild", attributes):
+        form_cls = type(form_name, (parser.form_type,), {})
+        for field_template in form_template["fields"]:
+            field_name = field_template["property"]["name"]
+            previous_field = getattr(previous_form, field_name, None) if field_name in reusable else None
+            if isinstance(previous_field, UnboundField):
+                field = _copy_unbound_field(previous_field)
+            else:
+                field_name, field = parser._parse_field(field_template)
+            setattr(form_cls, field_name, field)
+
+        if parser.fast_binding:
+            prepare_form_class(form_cls)
+
+    form_cls.form_field_templates = snapshot
+    form_cls.form_template_diff = diff
+    return form_name, form_cls, diff
+
+
+def _snapshot(fields):
+    """Copy the field templates, sharing their property which the parser does not modify"""
+    return {field_name: {key: value if key == "property" else copy.deepcopy(value)
+                         for key, value in field_template.items()}
+            for field_name, field_template in fields.items()}
+
+
+def _copy_unbound_field(unbound_field):
+    """Return a copy of the UnboundField, sharing its arguments, which is ordered after all existing fields
+
+    wtforms orders the fields of a form by the creation of their UnboundFields. A new creation counter keeps the reused
+    fields in the order of the template.
+    """
+    UnboundField.creation_counter += 1
+    copied = object.__new__(UnboundField)
+    copied.__dict__.update(unbound_field.__dict__)
+    copied.__dict__.pop("_prototypes", None)
+    copied.creation_counter = UnboundField.creation_counter
+    return copied
@@ -0,0 +1,285 @@
+"""Structural validation of form templates before they are parsed
+
+The :class:`TemplateValidator` checks the shape of a template as the :class:`JsonFlaskParser` reads it: the form name,
+the fields and their property, the args and kwargs, the class names and the controlled vocabularies. Unlike the parser,
+it does not stop at the first problem, but reports every error with the JSON path of the offending value::
+
+    validator = TemplateValidator()
+    for error in validator.errors(form_template):
+        print(error.path, error.message)  # e.g. $.fields[2].property.name is required
+
+The checks are compiled into nested functions once, when the validator is created, so that validating a template only
+walks the template. Validating is several times faster than parsing (see `benchmark/bench_validation.py`).
+"""
+from collections import namedtuple
+
+from wtforms import Field, SelectField
+
+from .errors import TemplateValidationException
+from .parser_json import JsonFlaskParser
+
+TemplateError = namedtuple("TemplateError", ["path", "message"])
+
+# Types of the kwargs values which are passed unchanged to the classes
+_SCALAR_TYPES = (str, int, float, bool)
+
+
+def _dict(required=None, optional=None):
+    """Compile a check of a dict with the required and the optional keys. Other keys are allowed."""
+    required = tuple((required or {}).items())
+    optional = tuple((optional or {}).items())
+
+    def check(value, path, errors):
+        if not isinstance(value, dict):
+            errors.append(TemplateError(path, "must be an object"))
+            return False
+        for key, check_value in required:
+            if key not in value or value[key] is None:
+                errors.append(TemplateError(f"{path}.{key}", "is required"))
+            elif check_value is not None:
+                check_value(value[key], f"{path}.{key}", errors)
+        for key, check_value in optional:
+            if value.get(key) is not None:
+                check_value(value[key], f"{path}.{key}", errors)
+        return True
+
+    def valid(value):
+        if not isinstance(value, dict):
+            return False
+        for key, check_value in required:
+            item = value.get(key)
+            if item is None or check_value is not None and not check_value.valid(item):
+                return False
+        for key, check_value in optional:
+            item = value.get(key)
+            if item is not None and not check_value.valid(item):
+                return False
+        return True
+
+    def valid_keys(value):
+        return isinstance(value, dict) and None not in map(value.get, required_keys)
+
+    required_keys = tuple(key for key, _ in required)
+    if optional or any(check_value is not None for _, check_value in required):
+        check.valid = valid
+    else:
+        # Only the presence of the keys is checked
+        check.valid = valid_keys
+    return check
+
+
+def _list(check_item):
+    """Compile a check of a list whose items are checked by check_item"""
+    valid_item = getattr(check_item, "valid", None)
+
+    def check(value, path, errors):
+        if not isinstance(value, (list, tuple)):
+            errors.append(TemplateError(path, "must be an array"))
+            return
+        if check_item is None:
+            return
+        # Build the paths of the items only if there is an invalid item
+        if valid_item is None or not all(map(valid_item, value)):
+            for index, item in enumerate(value):
+                check_item(item, f"{path}[{index}]", errors)
+
+    def valid(value):
+        return isinstance(value, (list, tuple)) and (check_item is None or all(map(valid_item, value)))
+
+    if check_item is None or valid_item is not None:
+        check.valid = valid
+    return check
+
+
+def _name(value, path, errors):
+    if not _valid_name(value):
+        errors.append(TemplateError(path, "must be a non-empty string"))
+
+
+def _valid_name(value):
+    return isinstance(value, str) and bool(value)
+
+
+_name.valid = _valid_name
+
+
+def _one_of(class_names, kind):
+    """Compile a check of a class name"""
+    class_names = frozenset(class_names)
+
+    def check(value, path, errors):
+        if value not in class_names:
+            errors.append(TemplateError(path, f"{value!r} is not a supported {kind}class name"))
+
+    check.valid = class_names.__contains__
+    return check
+
+
+class TemplateValidator:
+    """Compiled structural validator of the template format of :class:`JsonFlaskParser`
+
+    The generic checks (dicts, lists, names and class names) have a `valid` predicate as well, which does not build the
+    JSON paths. The paths of the items of a list are only built if one of the items is invalid.
+    """
+
+    def __init__(self, classes=None):
+        """
+        :param classes: Dict of the supported classes by class name. Defaults to JsonFlaskParser.SUPPORTED_CLASSES.
+        """
+        classes = JsonFlaskParser.SUPPORTED_CLASSES if classes is None else classes
+        field_class_names = [name for name, cls in classes.items() if isinstance(cls, type) and issubclass(cls, Field)]
+        select_class_names = frozenset(name for name in field_class_names if issubclass(classes[name], SelectField))
+
+        check_field_class = _one_of(field_class_names, "field ")
+        check_class = _one_of(classes, "")
+        check_property = _dict(required={"name": _name})
+        check_vocabulary = _dict(required={"items": _list(_dict(required={"name": None, "label": None}))})
+        check_synonyms = _list(_dict(required={"synonyms": _list(None)}))
+
+        def check_form(form_template, path, errors):
+            if not isinstance(form_template, dict):
+                errors.append(TemplateError(path, "must be an object"))
+                return
+            if not form_template.get("name"):
+                form_property = form_template.get("property")
+                if isinstance(form_property, dict):
+                    _name(form_property.get("name"), f"{path}.property.name", errors)
+                else:
+                    errors.append(TemplateError(f"{path}.name", "is required"))
+            elif not isinstance(form_template["name"], str):
+                errors.append(TemplateError(f"{path}.name", "must be a non-empty string"))
+
+            fields = form_template.get("fields")
+            if not isinstance(fields, (list, tuple)):
+                errors.append(TemplateError(f"{path}.fields", "is required" if fields is None else "must be an array"))
+                return
+            for index, field_template in enumerate(fields):
+                check_field(field_template, f"{path}.fields[{index}]", errors)
+
+        def check_field(field_template, path, errors):
+            if not check_object(field_template, path, errors, check_field_class, field=True):
+                return
+            form_property = field_template.get("property")
+            if form_property is None:
+                errors.append(TemplateError(f"{path}.property", "is required"))
+            form_property = form_property if isinstance(form_property, dict) else {}
+
+            kwargs = field_template.get("kwargs")
+            kwargs = kwargs if isinstance(kwargs, dict) else {}
+            for key in ("label", "description"):
+                if key not in kwargs and not field_template.get(key) and not form_property.get(key):
+                    errors.append(TemplateError(f"{path}.{key}", "is required in the field, its property or kwargs"))
+
+        def check_select(field_template, path, errors, field):
+            kwargs = field_template.get("kwargs")
+            if kwargs is None and not field:
+                # The parser reads the choices from the kwargs of fields only, nested objects do not need kwargs
+                return
+            if not isinstance(kwargs, dict):
+                errors.append(TemplateError(f"{path}.kwargs", "must be an object"))
+                return
+            if "choices" in kwargs:
+                return
+
+            form_property = field_template.get("property")
+            value_type = form_property.get("value_type") if isinstance(form_property, dict) else None
+            if value_type is None:
+                return
+            if not isinstance(value_type, dict):
+                errors.append(TemplateError(f"{path}.property.value_type", "must be an object"))
+            elif value_type.get("data_type") == "ctrl_voc":
+                vocabulary_path = f"{path}.property.value_type.controlled_vocabulary"
+                vocabulary = value_type.get("controlled_vocabulary")
+                if vocabulary is None:
+                    errors.append(TemplateError(vocabulary_path, "is required"))
+                    return
+                check_vocabulary(vocabulary, vocabulary_path, errors)
+                if kwargs.get("allow_synonyms") and isinstance(vocabulary, dict):
+                    check_synonyms(vocabulary.get("items"), f"{vocabulary_path}.items", errors)
+
+        def check_object(obj, path, errors, check_class_name=check_class, field=False):
+            """Check an object with class_name, args and kwargs. Return False if obj is not a dict.
+
+            :param field: True for the fields of a form, False for nested objects
+            """
+            if not isinstance(obj, dict):
+                errors.append(TemplateError(path, "must be an object"))
+                return False
+            class_name = obj.get("class_name")
+            if class_name is None:
+                errors.append(TemplateError(f"{path}.class_name", "is required"))
+            else:
+                check_class_name(class_name, f"{path}.class_name", errors)
+            if obj.get("property") is not None:
+                check_property(obj["property"], f"{path}.property", errors)
+
+            if class_name == "FormField":
+                check_form(obj, path, errors)
+                return True
+            if class_name in select_class_names:
+                check_select(obj, path, errors, field)
+            if obj.get("args"):
+                check_args(obj["args"], f"{path}.args", errors)
+            if obj.get("kwargs"):
+                check_kwargs(obj["kwargs"], f"{path}.kwargs", errors)
+            return True
+
+        check_tuples = _list(_list(None))
+        check_objects = _list(check_object)
+        args_keys = (("object", check_object), ("objects", check_objects), ("tuples", check_tuples))
+
+        def check_args(args, path, errors):
+            if not isinstance(args, dict):
+                errors.append(TemplateError(path, "must be an object"))
+                return
+            # As the parser, use the first of the keys
+            for key, check_value in args_keys:
+                if key in args:
+                    check_value(args[key], f"{path}.{key}", errors)
+                    return
+            errors.append(TemplateError(path, "must contain one of object, objects or tuples"))
+
+        def check_kwargs(kwargs, path, errors):
+            if not isinstance(kwargs, dict):
+                errors.append(TemplateError(path, "must be an object"))
+                return
+            for key, value in kwargs.items():
+                if isinstance(value, _SCALAR_TYPES) or key == "choices" and not isinstance(value, dict):
+                    continue
+                value_path = f"{path}.{key}"
+                if not isinstance(value, dict):
+                    errors.append(TemplateError(value_path, "must be a string, number, boolean or object"))
+                elif "args" in value:
+                    check_args(value["args"], f"{value_path}.args", errors)
+                elif "kwargs" in value:
+                    check_kwargs(value["kwargs"], f"{value_path}.kwargs", errors)
+                else:
+                    errors.append(TemplateError(value_path, "must contain args or kwargs"))
+
+        self._check_form = check_form
+
+    def errors(self, form_template):
+        """Return the list of TemplateErrors of the template, empty if the template is valid"""
+        errors = []
+        self._check_form(form_template, "$", errors)
+        return errors
+
+    def validate(self, form_template):
+        """Raise a TemplateValidationException with all errors if the template is not valid
+
+        :raises TemplateValidationException: If the template is not valid
+        """
+        errors = self.errors(form_template)
+        if errors:
+            details = "; ".join(f"{error.path}: {error.message}" for error in errors)
+            raise TemplateValidationException(f"Invalid form template ({details})", errors)
+
+    def validate_many(self, form_templates):
+        """Return a list with the list of TemplateErrors of each template"""
+        check_form = self._check_form
+        results = []
+        for form_template in form_templates:
+            errors = []
+            check_form(form_template, "$", errors)
+            results.append(errors)
+        return results
@@ -0,0 +1,147 @@
+import contextlib
+import contextvars
+import sys
+import time
+from collections import defaultdict, deque
+
+# Tracer activated by use_tracer. The parser emits its spans through the active tracer.
+_active_tracer = contextvars.ContextVar("dynamic_form_tracer", default=None)
+
+
+class _NoOpSpan:
+    """Span returned if tracing is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+
+NO_OP_SPAN = _NoOpSpan()
+
+
+def start_span(name, attributes=None):
+    """Start a span with the active tracer, a no-op span if no tracer is active
+
+    :param name: Name of the span
+    :param attributes: Dict of span attributes
+    :return: A context manager yielding the span
+    """
+    tracer = _active_tracer.get()
+    if tracer is None:
+        return NO_OP_SPAN
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+@contextlib.contextmanager
+def use_tracer(tracer):
+    """Activate the tracer in the current context"""
+    token = _active_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _active_tracer.reset(token)
+
+
+def trace(tracer, name, attributes=None):
+    """Activate the tracer and start a span, a no-op span if tracer is None"""
+    if tracer is None:
+        return NO_OP_SPAN
+    return _trace(tracer, name, attributes)
+
+
+@contextlib.contextmanager
+def _trace(tracer, name, attributes):
+    with use_tracer(tracer), tracer.start_as_current_span(name, attributes=attributes) as span:
+        yield span
+
+
+class Span:
+    """A finished or running span of the RecordingTracer"""
+
+    __slots__ = ("name", "attributes", "parent", "start_time", "end_time")
+
+    def __init__(self, name, attributes=None, parent=None):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+        self.start_time = time.perf_counter()
+        self.end_time = None
+
+    def __repr__(self):
+        return f"Span(name: {self.name}, attributes: {self.attributes}, duration: {self.duration})"
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    @property
+    def duration(self):
+        """Duration in seconds, None while the span is running"""
+        return None if self.end_time is None else self.end_time - self.start_time
+
+
+class RecordingTracer:
+    """Tracer which keeps the most recent finished spans in memory
+
+    Any tracer with the method `start_as_current_span(name, attributes=None)`, e.g. an OpenTelemetry tracer, can be
+    used instead.
+    """
+
+    def __init__(self, max_spans=10000):
+        """
+        :param max_spans: Number of finished spans which are kept
+        """
+        self.spans = deque(maxlen=max_spans)
+        self._current_span = contextvars.ContextVar(f"dynamic_form_span_{id(self)}", default=None)
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        span = Span(name, attributes, parent=self._current_span.get())
+        token = self._current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_attribute("exception.type", type(e).__name__)
+            raise
+        finally:
+            span.end_time = time.perf_counter()
+            self._current_span.reset(token)
+            self.spans.append(span)
+
+    def clear(self):
+        self.spans.clear()
+
+    def top_forms(self, n=10):
+        """Return the n forms with the highest total parse time as (form name, seconds, number of parses) tuples"""
+        return self._top(n, "parser.to_form", lambda span: span.attributes.get("form.name"))
+
+    def top_fields(self, n=10):
+        """Return the n fields with the highest total parse time as ((form name, field name), seconds, count) tuples"""
+        def key(span):
+            form_name = span.parent.attributes.get("form.name") if span.parent is not None else None
+            return form_name, span.attributes.get("field.name")
+        return self._top(n, "parser.field", key)
+
+    def _top(self, n, span_name, key):
+        durations = defaultdict(float)
+        counts = defaultdict(int)
+        for span in list(self.spans):
+            if span.name == span_name:
+                durations[key(span)] += span.duration
+                counts[key(span)] += 1
+        top = sorted(durations.items(), key=lambda item: item[1], reverse=True)[:n]
+        return [(name, duration, counts[name]) for name, duration in top]
+
+    def dump(self, n=10, file=None):
+        """Print the n most expensive forms and fields"""
+        file = file or sys.stdout
+        print(f"Top {n} forms by parse time", file=file)
+        for form_name, duration, count in self.top_forms(n):
+            print(f"  {form_name}: {duration * 1000:.3f} ms ({count} parses)", file=file)
+        print(f"Top {n} fields by parse time", file=file)
+        for (form_name, field_name), duration, count in self.top_fields(n):
+            print(f"  {form_name}.{field_name}: {duration * 1000:.3f} ms ({count} parses)", file=file)
@@ -0,0 +1,42 @@
+"""Helper functions shared by the form manager and the data stores"""
+import hashlib
+import json
+
+from .errors import FormManagerException
+
+# Keys which are added by the data store and are not part of the form definition
+_NON_CONTENT_KEYS = ("_id", "content_hash")
+
+
+def template_hash(form_template):
+    """Return a canonical hash of the content of a form template
+
+    The hash does not depend on the order of the keys and ignores the keys assigned by the data store (i.e. `_id`).
+    Two templates with identical content therefore always have the same hash.
+
+    :param dict form_template: The form template
+    :return: Hex digest of the sha256 hash
+    """
+    content = {key: value for key, value in form_template.items() if key not in _NON_CONTENT_KEYS}
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def add_current_template(form_templates, form_template):
+    """Add form template to a dict of templates by form name, keeping only the most recent revision of each form
+
+    :param dict form_templates: Form templates by form name
+    :param dict form_template: The form template to add
+    :raises FormManagerException: If the dict contains a form with the same name which is not an older revision
+    """
+    form_name = form_template.get("name") or form_template.get("property", {}).get("name")
+    revision = form_template.get("revision")
+
+    if form_name in form_templates:
+        previous_revision = form_templates[form_name].get("revision")
+        if revision is None or previous_revision is None or revision == previous_revision:
+            raise FormManagerException("Collection contains duplicates with name: {}".format(form_name))
+        if revision < previous_revision:
+            return
+
+    form_templates[form_name] = form_template
@@ -0,0 +1,76 @@
+import unittest
+
+from dynamic_form import JsonFlaskParser
+from dynamic_form.bulk_validation import BulkValidator
+from dynamic_form.errors import DynamicFormException
+from dynamic_form.template_builder import ControlledVocabularyTemplate, FieldTemplate, FormFieldTemplate, \
+    FormTemplate, ItemTemplate, PropertyTemplate, ValueTypeTemplate
+
+from test import test_utils
+
+
+def get_registration_form():
+    vocabulary = ControlledVocabularyTemplate("Species", "species", "Species", "test")
+    for name in ("human", "mouse", "rat"):
+        vocabulary.add_item(ItemTemplate(name.title(), name, f"The {name}"))
+    species = PropertyTemplate("Species", "species", "administrative", "The species",
+                               ValueTypeTemplate("ctrl_voc", vocabulary))
+    title = PropertyTemplate("Title", "title", "administrative", "The title")
+    contact = FormFieldTemplate(PropertyTemplate("Contact", "contact", "administrative", "The contact")) \
+        .add_field(FieldTemplate("StringField", PropertyTemplate("Name", "name", "administrative", "The name"),
+                                 validators={"args": {"objects": [{"class_name": "DataRequired"}]}}))
+
+    return FormTemplate("Registration", "registration", "Study registration") \
+        .add_field(FieldTemplate("StringField", title,
+                                 validators={"args": {"objects": [{"class_name": "DataRequired"}]}})) \
+        .add_field(FieldTemplate("SelectField", species)) \
+        .add_field(contact) \
+        .to_dict()
+
+
+VALID_ROW = {"title": "Study", "species": "mouse", "contact": {"name": "Jane"}}
+
+
+class TestBulkValidator(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.validator = BulkValidator.from_template(get_registration_form())
+
+    def test_valid_row(self):
+        self.assertEqual(self.validator.validate_row(VALID_ROW), {})
+
+    def test_invalid_rows(self):
+        rows = [VALID_ROW, dict(VALID_ROW, title=""), dict(VALID_ROW, species="dog"), dict(VALID_ROW, contact={})]
+        results = list(self.validator.validate(rows))
+
+        self.assertEqual([result.index for result in results], [0, 1, 2, 3])
+        self.assertEqual([result.valid for result in results], [True, False, False, False])
+        self.assertEqual(list(results[1].errors), ["title"])
+        self.assertEqual(results[2].errors, {"species": ["Not a valid choice."]})
+        self.assertEqual(list(results[3].errors["contact"]), ["name"])
+
+    def test_rows_are_independent(self):
+        self.validator.validate_row({})
+        self.assertEqual(self.validator.validate_row(VALID_ROW), {})
+
+    def test_form_class(self):
+        _, form_cls = JsonFlaskParser().to_form(test_utils.get_login_form().to_dict())
+        validator = BulkValidator(form_cls)
+
+        self.assertEqual(validator.validate_row({"email": "jane@example.org", "password": "secret123"}), {})
+        with self.assertRaises(DynamicFormException):
+            list(validator.validate([{}], processes=2))
+
+    def test_processes_with_picklable_form(self):
+        _, form_cls = JsonFlaskParser(picklable=True).to_form(get_registration_form())
+        validator = BulkValidator(form_cls)
+        results = list(validator.validate([VALID_ROW, {}], processes=1))
+
+        self.assertEqual([result.valid for result in results], [True, False])
+
+    def test_processes(self):
+        rows = [VALID_ROW if index % 3 else dict(VALID_ROW, species="dog") for index in range(50)]
+        results = list(self.validator.validate(rows, processes=2, chunk_size=7))
+
+        self.assertEqual([result.index for result in results], list(range(50)))
+        self.assertEqual([result.valid for result in results], [bool(index % 3) for index in range(50)])
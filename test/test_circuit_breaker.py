@@ -0,0 +1,98 @@
+import time
+import unittest
+
+from dynamic_form import FormManager
+from dynamic_form.circuit_breaker import CircuitBreaker
+from dynamic_form.datastore_memory import MemoryDataStore
+from dynamic_form.errors import FormManagerException
+
+from test import test_utils
+
+
+class UnreliableDataStore(MemoryDataStore):
+    """Memory data store which fails on demand and counts the loads by name"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failing = False
+        self.load_count = 0
+
+    def load_form_by_name(self, form_name):
+        self.load_count += 1
+        if self.failing:
+            raise ConnectionError("data store not reachable")
+        return super().load_form_by_name(form_name)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_after_threshold(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+        circuit_breaker.record_failure()
+        self.assertTrue(circuit_breaker.allow())
+
+        circuit_breaker.record_failure()
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(circuit_breaker.allow())
+
+    def test_success_resets_failures(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=2)
+        circuit_breaker.record_failure()
+        circuit_breaker.record_success()
+        circuit_breaker.record_failure()
+
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_allows_single_trial(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        circuit_breaker.record_failure()
+        time.sleep(0.02)
+
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(circuit_breaker.allow())
+        self.assertFalse(circuit_breaker.allow())
+
+        circuit_breaker.record_failure()
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.OPEN)
+
+
+class TestFormManagerLatencyBounds(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data_store = UnreliableDataStore([test_utils.get_login_form().to_dict()])
+        self.circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+        self.form_manager = FormManager(self.data_store, max_age_seconds=0.01, circuit_breaker=self.circuit_breaker)
+
+    def test_serve_stale_on_failure(self):
+        LoginForm = self.form_manager.get_form_by_name("user_login")
+        self.data_store.failing = True
+        time.sleep(0.02)
+
+        self.assertIs(self.form_manager.get_form_by_name("user_login"), LoginForm)
+
+    def test_fail_without_stale_form(self):
+        self.data_store.failing = True
+
+        with self.assertRaises(FormManagerException):
+            self.form_manager.get_form_by_name("nonexisting")
+
+    def test_open_circuit_skips_data_store(self):
+        LoginForm = self.form_manager.get_form_by_name("user_login")
+        self.data_store.failing = True
+        for _ in range(2):
+            self.form_manager.get_form_by_name("user_login", use_cache=False)
+        load_count = self.data_store.load_count
+
+        self.assertIs(self.form_manager.get_form_by_name("user_login", use_cache=False), LoginForm)
+        self.assertEqual(self.data_store.load_count, load_count)
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.OPEN)
+
+    def test_deadline(self):
+        LoginForm = self.form_manager.get_form_by_name("user_login")
+        self.data_store.latency = 0.5
+
+        start = time.perf_counter()
+        form = self.form_manager.get_form_by_name("user_login", use_cache=False, timeout=0.05)
+
+        self.assertLess(time.perf_counter() - start, 0.4)
+        self.assertIs(form, LoginForm)
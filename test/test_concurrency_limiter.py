@@ -0,0 +1,97 @@
+import threading
+import time
+import unittest
+
+from dynamic_form import FormManager
+from dynamic_form.circuit_breaker import CircuitBreaker
+from dynamic_form.concurrency_limiter import ConcurrencyLimiter
+from dynamic_form.datastore_memory import MemoryDataStore
+from dynamic_form.errors import FormManagerException
+
+from test import test_utils
+
+
+class TestConcurrencyLimiter(unittest.TestCase):
+
+    def test_fail_fast(self):
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue_time=0)
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire())
+
+        limiter.release()
+        self.assertTrue(limiter.acquire())
+
+        stats = limiter.stats()
+        self.assertEqual(stats["acquired"], 2)
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["active"], 1)
+
+    def test_wait_for_release(self):
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue_time=1)
+        limiter.acquire()
+        threading.Timer(0.05, limiter.release).start()
+
+        self.assertTrue(limiter.acquire())
+        stats = limiter.stats()
+        self.assertEqual(stats["max_queue_depth"], 1)
+        self.assertGreater(stats["max_wait_seconds"], 0.01)
+
+    def test_timeout_bounds_queue_time(self):
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue_time=10)
+        limiter.acquire()
+
+        start = time.perf_counter()
+        self.assertFalse(limiter.acquire(timeout=0.05))
+        self.assertLess(time.perf_counter() - start, 1)
+
+    def test_max_queue_depth(self):
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue_time=1, max_queue_depth=0)
+        limiter.acquire()
+
+        start = time.perf_counter()
+        self.assertFalse(limiter.acquire())
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+
+class TestFormManagerConcurrencyLimit(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data_store = MemoryDataStore([test_utils.get_login_form().to_dict()])
+        self.limiter = ConcurrencyLimiter(max_concurrency=1, max_queue_time=0)
+        self.form_manager = FormManager(self.data_store, concurrency_limiter=self.limiter)
+
+    def test_serve_stale_when_saturated(self):
+        LoginForm = self.form_manager.get_form_by_name("user_login")
+        self.limiter.acquire()
+
+        self.assertIs(self.form_manager.get_form_by_name("user_login", use_cache=False), LoginForm)
+        self.assertEqual(self.limiter.stats()["rejected"], 1)
+
+        with self.assertRaises(FormManagerException):
+            self.form_manager.get_form_by_name("nonexisting")
+
+    def test_slot_released_after_timeout(self):
+        self.form_manager.get_form_by_name("user_login")
+        self.data_store.latency = 0.1
+
+        self.form_manager.get_form_by_name("user_login", use_cache=False, timeout=0.01)
+        self.assertEqual(self.limiter.stats()["active"], 1)
+
+        time.sleep(0.2)
+        self.assertEqual(self.limiter.stats()["active"], 0)
+
+    def test_rejection_does_not_block_half_open_circuit_breaker(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        form_manager = FormManager(self.data_store, concurrency_limiter=self.limiter, circuit_breaker=circuit_breaker)
+        circuit_breaker.record_failure()
+        time.sleep(0.02)
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.HALF_OPEN)
+
+        self.limiter.acquire()
+        form_manager.get_form_by_name("user_login", use_cache=False)
+        self.assertEqual(self.limiter.stats()["rejected"], 1)
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.HALF_OPEN)
+
+        self.limiter.release()
+        form_manager.get_form_by_name("user_login", use_cache=False)
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.CLOSED)
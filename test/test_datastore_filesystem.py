@@ -0,0 +1,129 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from dynamic_form import FormManager
+from dynamic_form.errors import DataStoreException
+from dynamic_form.datastore_filesystem import FileSystemDataStore
+
+from test import test_utils
+
+
+class TestFileSystemDataStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_store = FileSystemDataStore(self.directory.name, poll_interval=0)
+        self.res = self.data_store.insert_form(test_utils.get_login_form().to_dict())
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write_file(self, file_name, content):
+        with open(os.path.join(self.directory.name, file_name), "w") as file:
+            file.write(content)
+
+    def test_not_a_directory(self):
+        with self.assertRaises(DataStoreException):
+            FileSystemDataStore(os.path.join(self.directory.name, "nonexisting"))
+
+    def test_load_forms(self):
+        self.assertEqual(self.res, "user_login.json")
+        self.assertEqual(len(list(self.data_store.load_forms())), 1)
+
+    def test_load_login_form_by_id(self):
+        form = self.data_store.load_form(self.res)
+        self.assertEqual(form["name"], "user_login")
+
+    def test_load_form_outside_directory(self):
+        self.assertIsNone(self.data_store.load_form("../user_login.json"))
+
+    def test_load_login_form_by_name(self):
+        form = self.data_store.load_form_by_name("user_login")
+        self.assertEqual(form["_id"], self.res)
+
+    def test_load_nonexisting_login_form_by_name(self):
+        self.assertIsNone(self.data_store.load_form_by_name("nonexisting"))
+
+    def test_insert_existing_form(self):
+        with self.assertRaises(DataStoreException):
+            self.data_store.insert_form(test_utils.get_login_form().to_dict())
+
+    def test_new_file_is_discovered(self):
+        form_template = test_utils.get_many_login_forms(num=1)[0].to_dict()
+        self.write_file("other.json", json.dumps(form_template))
+
+        self.assertEqual(self.data_store.load_form_by_name("user_login_0")["_id"], "other.json")
+
+    def test_invalid_file_is_skipped(self):
+        self.write_file("invalid.json", "{")
+        self.write_file("empty.json", "")
+
+        self.assertEqual(self.data_store.poll(), set())
+        self.assertEqual(set(self.data_store.errors), {"invalid.json", "empty.json"})
+        self.assertEqual(len(list(self.data_store.load_forms())), 1)
+
+    def test_changed_file_changes_revision(self):
+        revision = self.data_store.load_current_revision("user_login")
+
+        form_template = test_utils.get_login_form().to_dict()
+        form_template["label"] = "Changed"
+        self.write_file(self.res, json.dumps(form_template))
+        os.utime(os.path.join(self.directory.name, self.res), ns=(revision + 10 ** 9, revision + 10 ** 9))
+
+        self.assertEqual(self.data_store.poll(), {"user_login"})
+        self.assertEqual(self.data_store.load_current_revision("user_login"), revision + 10 ** 9)
+        self.assertEqual(self.data_store.load_form_by_name("user_login")["label"], "Changed")
+        self.assertIsNone(self.data_store.load_form_revision("user_login", revision))
+
+    def test_deleted_file(self):
+        os.remove(os.path.join(self.directory.name, self.res))
+        self.assertIsNone(self.data_store.load_form_by_name("user_login"))
+
+    def test_upsert_form(self):
+        form_template = dict(test_utils.get_login_form().to_dict(), content_hash="hash")
+
+        self.assertEqual(self.data_store.upsert_form(form_template), (self.res, True))
+        self.assertEqual(self.data_store.upsert_form(form_template), (self.res, False))
+        self.assertEqual(self.data_store.load_form_hash("user_login"), "hash")
+
+    def test_search_form(self):
+        res = self.data_store.find_form(search_filter={"name": "user_login"}, projection={"name": True})
+        self.assertEqual(list(res), [{"_id": self.res, "name": "user_login"}])
+
+    def test_search_forms(self):
+        page = self.data_store.search_forms({"name": "user_login"})
+        self.assertEqual(page.summaries[0]["_id"], self.res)
+        self.assertIsNotNone(page.summaries[0]["revision"])
+
+    def test_deprecate_form(self):
+        self.data_store.deprecate_form(self.res)
+        self.assertEqual(self.data_store.load_form(self.res)["deprecated"], True)
+
+
+class TestFormManagerWithFileSystemDataStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_store = FileSystemDataStore(self.directory.name)
+        self.data_store.insert_form(test_utils.get_login_form().to_dict())
+        self.form_manager = FormManager(self.data_store, max_age_seconds=0.01)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_unchanged_file_is_not_parsed_again(self):
+        LoginForm = self.form_manager.get_form_by_name("user_login")
+        time.sleep(0.02)
+        self.assertIs(self.form_manager.get_form_by_name("user_login"), LoginForm)
+
+    def test_changed_file_is_parsed_again(self):
+        LoginForm = self.form_manager.get_form_by_name("user_login")
+
+        form_template = dict(test_utils.get_login_form().to_dict(), content_hash="changed")
+        self.data_store.upsert_form(form_template)
+        time.sleep(0.02)
+
+        self.assertIsNot(self.form_manager.get_form_by_name("user_login"), LoginForm)
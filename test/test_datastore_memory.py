@@ -0,0 +1,137 @@
+import time
+import unittest
+
+from bson import ObjectId
+
+from dynamic_form.errors import DataStoreException
+from dynamic_form.datastore_memory import MemoryDataStore
+
+from test import test_utils
+
+
+class TestMemoryDataStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data_store = MemoryDataStore()
+        self.res = self.data_store.insert_form(test_utils.get_login_form().to_dict())
+
+    def test_load_forms(self):
+        self.assertEqual(len(list(self.data_store.load_forms())), 1)
+
+    def test_load_login_form_by_id(self):
+        self.assertIsInstance(self.res, ObjectId)
+        form = self.data_store.load_form(self.res)
+        self.assertEqual(len(form.keys()), 5)
+
+    def test_load_login_form_by_name(self):
+        form = self.data_store.load_form_by_name("user_login")
+        self.assertEqual(form["_id"], self.res)
+
+    def test_load_nonexisting_login_form_by_name(self):
+        self.assertIsNone(self.data_store.load_form_by_name("nonexisting"))
+
+    def test_loaded_form_is_a_copy(self):
+        self.data_store.load_form(self.res)["name"] = "changed"
+        self.assertEqual(self.data_store.load_form(self.res)["name"], "user_login")
+
+    def test_insert_duplicate_id(self):
+        with self.assertRaises(DataStoreException):
+            self.data_store.insert_form({"_id": self.res})
+
+    def test_insert_forms(self):
+        form_templates = [form.to_dict() for form in test_utils.get_many_login_forms(num=2)]
+        res = self.data_store.insert_forms(form_templates + [{"_id": self.res}])
+
+        self.assertIsInstance(res[0], ObjectId)
+        self.assertIsInstance(res[2], DataStoreException)
+        self.assertEqual(len(list(self.data_store.load_forms())), 3)
+
+    def test_upsert_form(self):
+        form_template = dict(test_utils.get_login_form().to_dict(), content_hash="hash")
+
+        self.assertEqual(self.data_store.upsert_form(form_template), (self.res, True))
+        self.assertEqual(self.data_store.upsert_form(form_template), (self.res, False))
+        self.assertEqual(self.data_store.load_form_hash("user_login"), "hash")
+        self.assertEqual(len(list(self.data_store.load_forms())), 1)
+
+    def test_upsert_does_not_replace_revisions(self):
+        form_template = test_utils.get_many_login_forms(num=1)[0].to_dict()
+        self.data_store.insert_revision(form_template)
+        self.data_store.insert_revision(dict(form_template, label="Changed"))
+
+        with self.assertRaises(DataStoreException):
+            self.data_store.upsert_form(dict(form_template, content_hash="hash"))
+        self.assertEqual(self.data_store.load_current_revision("user_login_0"), 2)
+        self.assertIsNotNone(self.data_store.load_form_revision("user_login_0", 2))
+
+    def test_revisions(self):
+        form_template = test_utils.get_login_form().to_dict()
+        self.data_store.insert_revision(form_template)
+        form_template["label"] = "Changed"
+        _, revision = self.data_store.insert_revision(form_template)
+
+        self.assertEqual(revision, 2)
+        self.assertEqual(self.data_store.load_current_revision("user_login"), 2)
+        self.assertEqual(self.data_store.load_form_by_name("user_login")["label"], "Changed")
+        self.assertEqual(self.data_store.load_form_revision("user_login", 1)["label"], "Login")
+
+    def test_search_form(self):
+        res = self.data_store.find_form(search_filter={"name": "user_login"})
+        self.assertEqual(len(list(res)), 1)
+
+    def test_search_form_with_operators(self):
+        self.data_store.insert_forms([form.to_dict() for form in test_utils.get_many_login_forms(num=3)])
+
+        res = self.data_store.find_form({"name": {"$in": ["user_login_0", "user_login_2"]},
+                                         "deprecated": {"$exists": False}},
+                                        projection={"name": True}, sort=[("name", -1)], limit=1)
+
+        self.assertEqual(list(res), [{"_id": self.data_store.load_form_by_name("user_login_2")["_id"],
+                                      "name": "user_login_2"}])
+
+    def test_search_form_unsupported_operator(self):
+        with self.assertRaises(DataStoreException):
+            list(self.data_store.find_form({"name": {"$regex": "user"}}))
+
+    def test_search_form_logical_operators(self):
+        self.assertEqual([form["name"] for form in self.data_store.find_form({"$or": [{"name": "user_login"}]})],
+                         ["user_login"])
+        self.assertEqual(list(self.data_store.find_form({"$nor": [{"name": "user_login"}]})), [])
+        self.assertEqual(len(list(self.data_store.find_form({"$and": [{"name": "user_login"}, {"label": "Login"}]}))),
+                         1)
+
+        with self.assertRaises(DataStoreException):
+            list(self.data_store.find_form({"$where": "this.name == 'user_login'"}))
+        with self.assertRaises(DataStoreException):
+            list(self.data_store.find_form({"$or": []}))
+
+    def test_search_forms_pages(self):
+        self.data_store.insert_forms([form.to_dict() for form in test_utils.get_many_login_forms(num=4)])
+
+        first_page = self.data_store.search_forms(page_size=3)
+        second_page = self.data_store.search_forms(page_size=3, after=first_page.next_key)
+
+        self.assertEqual([summary["name"] for summary in first_page.summaries],
+                         ["user_login", "user_login_0", "user_login_1"])
+        self.assertEqual([summary["name"] for summary in second_page.summaries], ["user_login_2", "user_login_3"])
+        self.assertIsNone(second_page.next_key)
+        self.assertEqual(set(first_page.summaries[0]), {"_id", "name", "label", "description", "revision"})
+
+    def test_search_forms_with_filter(self):
+        self.data_store.insert_forms([form.to_dict() for form in test_utils.get_many_login_forms(num=4)])
+
+        page = self.data_store.search_forms({"name": {"$in": ["user_login_1", "user_login_3"]}})
+
+        self.assertEqual([summary["name"] for summary in page.summaries], ["user_login_1", "user_login_3"])
+
+    def test_deprecate_form(self):
+        self.data_store.deprecate_form(self.res)
+
+        self.assertEqual(self.data_store.load_form(self.res)["deprecated"], True)
+        self.assertEqual(len(list(self.data_store.find_form({"deprecated": True}))), 1)
+
+    def test_latency(self):
+        data_store = MemoryDataStore(latency=0.01)
+        start = time.perf_counter()
+        data_store.load_form_by_name("user_login")
+        self.assertGreaterEqual(time.perf_counter() - start, 0.01)
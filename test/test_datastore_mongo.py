@@ -1,5 +1,8 @@
 import unittest
-from pymongo import MongoClient
+from unittest import mock
+
+from pymongo import MongoClient, ReadPreference
+from pymongo.errors import DuplicateKeyError
 
 from dynamic_form.errors import DataStoreException
 from dynamic_form.datastore_mongodb import MongoDataStore
@@ -36,6 +39,61 @@ class TestMongoDataStore(unittest.TestCase):
         form_list = list(form_template)
         self.assertEqual(len(form_list), 0)
 
+    def test_insert_forms_in_batches(self):
+        form_templates = [form.to_dict() for form in test_utils.get_many_login_forms(num=5)]
+        res = self.data_store.insert_forms(form_templates, batch_size=2)
+
+        self.assertEqual(len(res), 5)
+        self.assertEqual(len(list(self.data_store.load_forms())), 5)
+
+    def test_insert_forms_unordered_duplicate(self):
+        form_templates = [form.to_dict() for form in test_utils.get_many_login_forms(num=3)]
+        identifier = self.data_store.insert_form(form_templates[1])
+
+        res = self.data_store.insert_forms([form_templates[0], {"_id": identifier}, form_templates[2]])
+
+        self.assertIsInstance(res[1], DataStoreException)
+        self.assertEqual(len(list(self.data_store.load_forms())), 3)
+
+    def test_insert_forms_ordered_duplicate(self):
+        form_templates = [form.to_dict() for form in test_utils.get_many_login_forms(num=3)]
+        identifier = self.data_store.insert_form(form_templates[0])
+
+        res = self.data_store.insert_forms([{"_id": identifier}, form_templates[1], form_templates[2]],
+                                           ordered=True, batch_size=1)
+
+        self.assertTrue(all(isinstance(result, DataStoreException) for result in res))
+        self.assertEqual(len(list(self.data_store.load_forms())), 1)
+
+
+class TestMongoDataStoreOptions(unittest.TestCase):
+    """Options which do not require a running database"""
+
+    def setUp(self) -> None:
+        self.collection = MongoClient(host="127.0.0.1", connect=False)["test"]["test_form"]
+
+    def test_read_preference(self):
+        data_store = MongoDataStore(self.collection, read_preference=ReadPreference.SECONDARY_PREFERRED)
+
+        self.assertEqual(data_store.read_collection.read_preference, ReadPreference.SECONDARY_PREFERRED)
+        self.assertEqual(data_store.collection.read_preference, ReadPreference.PRIMARY)
+
+    def test_hedged_reads(self):
+        with self.assertWarns(DeprecationWarning) as context:
+            data_store = MongoDataStore(self.collection, hedged_reads=True)
+
+        self.assertEqual(context.filename, __file__)
+        self.assertEqual(data_store.read_collection.read_preference.document["hedge"], {"enabled": True})
+
+    def test_hedged_reads_unsupported(self):
+        with mock.patch("dynamic_form.datastore_mongodb.Nearest", side_effect=TypeError("unexpected keyword 'hedge'")):
+            with self.assertWarns(DeprecationWarning), self.assertRaises(DataStoreException):
+                MongoDataStore(self.collection, hedged_reads=True)
+
+    def test_max_time_ms(self):
+        data_store = MongoDataStore(self.collection, max_time_ms=100)
+        self.assertEqual(data_store._read_options(), {"max_time_ms": 100})
+
 
 class TestMongoDataStoreWithEntry(unittest.TestCase):
 
@@ -78,6 +136,80 @@ class TestMongoDataStoreWithEntry(unittest.TestCase):
 
         self.assertEqual(len(list(res)), 1)
 
+    def test_upsert_unchanged_form(self):
+        form_template = dict(test_utils.get_login_form().to_dict(), content_hash="hash")
+        self.collection.update_one({"_id": self.res}, {"$set": {"content_hash": "hash"}})
+
+        identifier, changed = self.data_store.upsert_form(form_template)
+
+        self.assertFalse(changed)
+        self.assertEqual(identifier, self.res)
+        self.assertEqual(self.data_store.load_form_hash("user_login"), "hash")
+
+    def test_upsert_changed_form(self):
+        form_template = dict(test_utils.get_login_form().to_dict(), content_hash="new_hash", label="Changed")
+
+        identifier, changed = self.data_store.upsert_form(form_template)
+
+        self.assertTrue(changed)
+        self.assertEqual(identifier, self.res)
+        self.assertEqual(self.collection.count_documents({"name": "user_login"}), 1)
+        self.assertEqual(self.data_store.load_form(self.res)["label"], "Changed")
+
+    def test_upsert_does_not_replace_revisions(self):
+        form_template = test_utils.get_many_login_forms(num=1)[0].to_dict()
+        self.data_store.insert_revision(form_template)
+        self.data_store.insert_revision(dict(form_template, label="Changed"))
+
+        with self.assertRaises(DataStoreException):
+            self.data_store.upsert_form(dict(form_template, content_hash="hash"))
+        self.assertEqual(self.data_store.load_current_revision("user_login_0"), 2)
+        self.assertIsNotNone(self.data_store.load_form_revision("user_login_0", 2))
+
+    def test_upsert_new_form(self):
+        form_template = dict(test_utils.get_many_login_forms(num=1)[0].to_dict(), content_hash="hash")
+
+        identifier, changed = self.data_store.upsert_form(form_template)
+
+        self.assertTrue(changed)
+        self.assertEqual(self.data_store.load_form(identifier)["name"], "user_login_0")
+
+    def test_upsert_unique_index(self):
+        self.data_store.create_indexes()
+        form_template = dict(test_utils.get_many_login_forms(num=1)[0].to_dict(), content_hash="hash")
+        identifier, _ = self.data_store.upsert_form(form_template)
+
+        with self.assertRaises(DuplicateKeyError):
+            self.collection.insert_one(dict(form_template, content_hash="other_hash"))
+        self.assertEqual(self.data_store.upsert_form(form_template), (identifier, False))
+        self.assertEqual(self.collection.count_documents({"name": "user_login_0"}), 1)
+
+    def test_insert_revisions(self):
+        self.data_store.create_indexes()
+        form_template = test_utils.get_login_form().to_dict()
+
+        _, first_revision = self.data_store.insert_revision(form_template)
+        form_template["label"] = "Changed"
+        _, second_revision = self.data_store.insert_revision(form_template)
+
+        self.assertEqual((first_revision, second_revision), (1, 2))
+        self.assertEqual(self.data_store.load_current_revision("user_login"), 2)
+        self.assertEqual(self.data_store.load_form_by_name("user_login")["label"], "Changed")
+        self.assertEqual(self.data_store.load_form_revision("user_login", 1)["label"], "Login")
+
+    def test_load_current_revision_without_revisions(self):
+        self.assertIsNone(self.data_store.load_current_revision("user_login"))
+
+    def test_search_forms_pages(self):
+        self.data_store.insert_forms([form.to_dict() for form in test_utils.get_many_login_forms(num=2)])
+
+        first_page = self.data_store.search_forms(page_size=2)
+        second_page = self.data_store.search_forms(page_size=2, after=first_page.next_key)
+
+        self.assertEqual([summary["name"] for summary in first_page.summaries], ["user_login", "user_login_0"])
+        self.assertEqual([summary["name"] for summary in second_page.summaries], ["user_login_1"])
+        self.assertNotIn("fields", first_page.summaries[0])
+
     def test_deprecate_form(self):
         identifier = self.res
         self.data_store.deprecate_form(identifier)
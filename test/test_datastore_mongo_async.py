@@ -0,0 +1,48 @@
+import unittest
+
+from pymongo import AsyncMongoClient
+
+from dynamic_form.errors import DataStoreException
+from dynamic_form.datastore_mongodb_async import AsyncMongoDataStore
+
+from test import test_utils
+
+
+class TestAsyncMongoDataStore(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        self.client = AsyncMongoClient(host="127.0.0.1")
+        self.collection = self.client["test"]["test_form_async"]
+        await self.collection.drop()
+        self.data_store = AsyncMongoDataStore(self.collection)
+        self.res = await self.data_store.insert_form(test_utils.get_login_form().to_dict())
+
+    async def asyncTearDown(self) -> None:
+        await self.collection.drop()
+        await self.client.close()
+
+    def test_wrong_collection_cls(self):
+
+        class NotMongoCollection:
+            pass
+
+        with self.assertRaises(DataStoreException):
+            AsyncMongoDataStore(db_collection=NotMongoCollection())
+
+    async def test_load_forms(self):
+        form_templates = [form_template async for form_template in self.data_store.load_forms()]
+        self.assertEqual(len(form_templates), 1)
+
+    async def test_load_login_form_by_name(self):
+        form = await self.data_store.load_form_by_name("user_login")
+        self.assertEqual(form["_id"], self.res)
+
+    async def test_search_form(self):
+        res = [form_template async for form_template in self.data_store.find_form({"name": "user_login"})]
+        self.assertEqual(len(res), 1)
+
+    async def test_deprecate_form(self):
+        await self.data_store.deprecate_form(self.res)
+
+        form = await self.data_store.load_form(self.res)
+        self.assertEqual(form["deprecated"], True)
@@ -0,0 +1,152 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from dynamic_form import FormManager
+from dynamic_form.errors import DataStoreException
+from dynamic_form.datastore_sqlite import SQLiteDataStore, _translate
+
+from test import test_utils
+
+
+class TestSQLiteDataStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_store = SQLiteDataStore(os.path.join(self.directory.name, "forms.db"))
+        self.res = self.data_store.insert_form(test_utils.get_login_form().to_dict())
+
+    def tearDown(self) -> None:
+        self.data_store.close()
+        self.directory.cleanup()
+
+    def test_wal_mode(self):
+        journal_mode = self.data_store._connection().execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(journal_mode, "wal")
+
+    def test_load_forms(self):
+        self.assertEqual(len(list(self.data_store.load_forms())), 1)
+
+    def test_load_login_form_by_id(self):
+        form = self.data_store.load_form(self.res)
+        self.assertEqual(len(form.keys()), 5)
+
+    def test_load_login_form_by_name(self):
+        form = self.data_store.load_form_by_name("user_login")
+        self.assertEqual(form["_id"], self.res)
+
+    def test_load_nonexisting_login_form_by_name(self):
+        self.assertIsNone(self.data_store.load_form_by_name("nonexisting"))
+
+    def test_insert_forms(self):
+        res = self.data_store.insert_forms([form.to_dict() for form in test_utils.get_many_login_forms(num=3)])
+        self.assertEqual(len(res), 3)
+        self.assertEqual(len(list(self.data_store.load_forms())), 4)
+
+    def test_upsert_form(self):
+        form_template = dict(test_utils.get_login_form().to_dict(), content_hash="hash")
+
+        self.assertEqual(self.data_store.upsert_form(form_template), (self.res, True))
+        self.assertEqual(self.data_store.upsert_form(form_template), (self.res, False))
+        self.assertEqual(self.data_store.load_form_hash("user_login"), "hash")
+        self.assertEqual(len(list(self.data_store.load_forms())), 1)
+
+    def test_upsert_does_not_replace_revisions(self):
+        form_template = test_utils.get_many_login_forms(num=1)[0].to_dict()
+        self.data_store.insert_revision(form_template)
+        self.data_store.insert_revision(dict(form_template, label="Changed"))
+
+        with self.assertRaises(DataStoreException):
+            self.data_store.upsert_form(dict(form_template, content_hash="hash"))
+        self.assertEqual(self.data_store.load_current_revision("user_login_0"), 2)
+        self.assertIsNotNone(self.data_store.load_form_revision("user_login_0", 2))
+
+    def test_revisions(self):
+        form_template = test_utils.get_login_form().to_dict()
+        self.data_store.insert_revision(form_template)
+        form_template["label"] = "Changed"
+        _, revision = self.data_store.insert_revision(form_template)
+
+        self.assertEqual(revision, 2)
+        self.assertEqual(self.data_store.load_current_revision("user_login"), 2)
+        self.assertEqual(self.data_store.load_form_by_name("user_login")["label"], "Changed")
+        self.assertEqual(self.data_store.load_form_revision("user_login", 1)["label"], "Login")
+
+    def test_concurrent_revisions(self):
+        form_template = test_utils.get_login_form().to_dict()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: self.data_store.insert_revision(dict(form_template)), range(8)))
+
+        self.assertEqual(sorted(revision for _, revision in results), list(range(1, 9)))
+
+    def test_search_form(self):
+        res = self.data_store.find_form(search_filter={"name": "user_login"})
+        self.assertEqual(len(list(res)), 1)
+
+    def test_search_form_with_operators(self):
+        self.data_store.insert_forms([form.to_dict() for form in test_utils.get_many_login_forms(num=3)])
+
+        res = self.data_store.find_form({"name": {"$in": ["user_login_0", "user_login_2"]},
+                                         "deprecated": {"$exists": False}, "label": "Login"},
+                                        projection={"name": True}, sort=[("name", -1)], limit=1)
+
+        self.assertEqual([form["name"] for form in res], ["user_login_2"])
+
+    def test_search_form_unsupported_operator(self):
+        with self.assertRaises(DataStoreException):
+            list(self.data_store.find_form({"label": {"$regex": "Log"}}))
+
+    def test_search_form_logical_operators(self):
+        self.assertEqual([form["name"] for form in self.data_store.find_form({"$or": [{"name": "user_login"}]})],
+                         ["user_login"])
+        self.assertEqual(list(self.data_store.find_form({"$nor": [{"name": "user_login"}]})), [])
+        self.assertEqual(len(list(self.data_store.find_form({"$and": [{"name": "user_login"}, {"label": "Login"}]}))),
+                         1)
+
+        with self.assertRaises(DataStoreException):
+            list(self.data_store.find_form({"$where": "this.name == 'user_login'"}))
+        with self.assertRaises(DataStoreException):
+            list(self.data_store.find_form({"$or": []}))
+
+    def test_search_forms_pages(self):
+        self.data_store.insert_forms([form.to_dict() for form in test_utils.get_many_login_forms(num=4)])
+
+        first_page = self.data_store.search_forms(page_size=3)
+        second_page = self.data_store.search_forms(page_size=3, after=first_page.next_key)
+
+        self.assertEqual([summary["name"] for summary in first_page.summaries],
+                         ["user_login", "user_login_0", "user_login_1"])
+        self.assertEqual([summary["name"] for summary in second_page.summaries], ["user_login_2", "user_login_3"])
+        self.assertEqual(first_page.summaries[0]["label"], "Login")
+        self.assertIsNone(second_page.next_key)
+
+    def test_search_forms_with_filter_on_template(self):
+        form_templates = [form.to_dict() for form in test_utils.get_many_login_forms(num=4)]
+        form_templates[2]["label"] = "Other"
+        self.data_store.insert_forms(form_templates)
+
+        page = self.data_store.search_forms({"label": "Login"}, page_size=2)
+        next_page = self.data_store.search_forms({"label": "Login"}, page_size=2, after=page.next_key)
+
+        self.assertEqual([summary["name"] for summary in page.summaries + next_page.summaries],
+                         ["user_login", "user_login_0", "user_login_1", "user_login_3"])
+
+    def test_translate(self):
+        clauses, params, remaining_filter = _translate({"name": "user_login", "deprecated": {"$ne": True},
+                                                        "label": "Login", "revision": {"$in": [1, None]}})
+
+        self.assertEqual(clauses, ["name = ?", "(deprecated IS NULL OR deprecated != ?)"])
+        self.assertEqual(params, ["user_login", 1])
+        self.assertEqual(remaining_filter, {"label": "Login", "revision": {"$in": [1, None]}})
+
+    def test_deprecate_form(self):
+        self.data_store.deprecate_form(self.res)
+
+        self.assertEqual(self.data_store.load_form(self.res)["deprecated"], True)
+        self.assertEqual(len(list(self.data_store.find_form({"deprecated": True}))), 1)
+
+    def test_form_manager(self):
+        form_manager = FormManager(self.data_store)
+        self.assertEqual(list(form_manager.get_cached_form_names()), ["user_login"])
@@ -0,0 +1,71 @@
+import unittest
+
+from flask import Flask
+from werkzeug.datastructures import MultiDict
+
+from dynamic_form import JsonFlaskParser
+from dynamic_form.fast_binding import PrototypeBindingMeta
+from dynamic_form.template_builder import FieldTemplate, FormFieldTemplate, FormTemplate, PropertyTemplate
+
+from test import test_utils
+
+
+def get_nested_form():
+    address = FormFieldTemplate(PropertyTemplate("Address", "address", "administrative", "The address")) \
+        .add_field(FieldTemplate("StringField", PropertyTemplate("City", "city", "administrative", "The city"),
+                                 validators={"args": {"objects": [{"class_name": "DataRequired"}]}}))
+    return FormTemplate("Person", "person", "A person") \
+        .add_field(FieldTemplate("StringField", PropertyTemplate("Name", "name", "administrative", "The name"))) \
+        .add_field(address) \
+        .to_dict()
+
+
+class TestFastBinding(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = Flask(__name__)
+        cls.app.secret_key = "not secret"
+        cls.app.config["WTF_CSRF_ENABLED"] = False
+
+    def parse(self, form_template, fast_binding):
+        return JsonFlaskParser(fast_binding=fast_binding).to_form(form_template)[1]
+
+    def test_same_fields_and_rendering(self):
+        for get_template in (lambda: test_utils.get_login_form().to_dict(), get_nested_form):
+            FastForm = self.parse(get_template(), True)
+            Form = self.parse(get_template(), False)
+            self.assertIsNotNone(FastForm._unbound_fields)
+
+            with self.app.test_request_context():
+                for _ in range(2):
+                    fast_form, form = FastForm(), Form()
+                    self.assertEqual([field.name for field in fast_form], [field.name for field in form])
+                    self.assertEqual([str(field) for field in fast_form],
+                                     [str(field) for field in form])
+
+    def test_instances_are_independent(self):
+        FastForm = self.parse(get_nested_form(), True)
+
+        with self.app.test_request_context():
+            FastForm()
+            first, second = FastForm(), FastForm()
+            first.name.label.text = "Changed"
+            first.name.data = "Jane"
+
+            self.assertEqual(second.name.label.text, "Name")
+            self.assertIsNone(second.name.data)
+            self.assertIsNot(first.address.form, second.address.form)
+
+    def test_validation(self):
+        FastForm = self.parse(get_nested_form(), True)
+        self.assertTrue(issubclass(FastForm.address.kwargs["form_class"].Meta, PrototypeBindingMeta))
+
+        with self.app.test_request_context():
+            FastForm(meta={"csrf": False})
+            form = FastForm(MultiDict({"name": "Jane"}))
+            self.assertFalse(form.validate())
+            self.assertIn("city", form.errors["address"])
+
+            form = FastForm(MultiDict({"name": "Jane", "address-city": "Basel"}))
+            self.assertTrue(form.validate())
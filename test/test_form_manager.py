@@ -1,12 +1,13 @@
+import copy
 import unittest
 import time
 
 from bson import ObjectId
-from pymongo import MongoClient
 import wtforms
 
-from dynamic_form import FormManager, MongoDataStore
-from dynamic_form.errors import FormManagerException
+from dynamic_form import FormManager
+from dynamic_form.datastore_memory import MemoryDataStore
+from dynamic_form.errors import FormManagerException, FormParserException
 from test import test_utils
 
 
@@ -25,28 +26,17 @@ class TestFormManagerInit(unittest.TestCase):
             pass
 
         with self.assertRaises(FormManagerException):
-            client = MongoClient()
-            FormManager(data_store=MongoDataStore(client["test_db"]["test_collection"]), format_parser=UselessParser())
+            FormManager(data_store=MemoryDataStore(), format_parser=UselessParser())
 
 
 class TestFormManagerInsert(unittest.TestCase):
 
-    @classmethod
-    def setUpClass(cls) -> None:
-        client = MongoClient()
-
-        cls.collection = client["test"]["form_test"]
-
-        cls.data_store = MongoDataStore(cls.collection)
-        cls.form_manager = FormManager(data_store=cls.data_store)
-
-    @classmethod
-    def tearDownClass(cls) -> None:
-        cls.collection.drop()
+    def setUp(self) -> None:
+        self.data_store = MemoryDataStore()
+        self.form_manager = FormManager(data_store=self.data_store)
 
-    @classmethod
-    def setUp(cls) -> None:
-        cls.collection.drop()
+    def count_forms(self, search_filter=None):
+        return len(list(self.data_store.find_form(search_filter)))
 
     def test_init_without_initial_load(self):
         form_manager = FormManager(self.data_store, initial_load=False)
@@ -57,6 +47,123 @@ class TestFormManagerInsert(unittest.TestCase):
         res = self.form_manager.insert_form(from_template.to_dict())
         self.assertIsInstance(res, ObjectId)
 
+    def test_insert_forms(self):
+        form_templates = [form.to_dict() for form in test_utils.get_many_login_forms(num=3)]
+        form_templates.insert(1, {"name": "broken_form"})
+
+        res = self.form_manager.insert_forms(form_templates)
+
+        self.assertEqual(len(res), 4)
+        self.assertIsInstance(res[0], ObjectId)
+        self.assertIsInstance(res[1], FormParserException)
+        self.assertIsInstance(res[2], ObjectId)
+        self.assertIsInstance(res[3], ObjectId)
+        self.assertEqual(self.count_forms(), 3)
+        self.assertIn("user_login_2", self.form_manager.get_cached_form_names())
+
+    def test_insert_forms_stores_unchanged_templates(self):
+        form_templates = [form.to_dict() for form in test_utils.get_many_login_forms(num=2)]
+        expected = copy.deepcopy(form_templates)
+
+        res = self.form_manager.insert_forms(form_templates)
+
+        stored = [self.data_store.load_form(identifier) for identifier in res]
+        self.assertEqual([{key: value for key, value in form_template.items() if key != "_id"}
+                          for form_template in stored], expected)
+
+    def test_insert_forms_passes_options_to_data_store(self):
+        calls = []
+
+        class BatchDataStore(MemoryDataStore):
+            def insert_forms(self, form_templates, ordered=False, batch_size=1000):
+                calls.append((len(form_templates), ordered, batch_size))
+                return super().insert_forms(form_templates)
+
+        form_manager = FormManager(data_store=BatchDataStore())
+        form_templates = [form.to_dict() for form in test_utils.get_many_login_forms(num=3)]
+
+        res = form_manager.insert_forms(form_templates, ordered=True, batch_size=2)
+
+        self.assertEqual(calls, [(3, True, 2)])
+        self.assertTrue(all(isinstance(identifier, ObjectId) for identifier in res))
+
+    def test_upsert_form(self):
+        self.assertTrue(self.form_manager.upsert_form(test_utils.get_login_form().to_dict()))
+        self.assertFalse(self.form_manager.upsert_form(test_utils.get_login_form().to_dict()))
+
+        changed_template = test_utils.get_login_form().to_dict()
+        changed_template["label"] = "Changed"
+        self.assertTrue(self.form_manager.upsert_form(changed_template))
+
+        self.assertEqual(self.count_forms({"name": "user_login"}), 1)
+
+    def test_insert_revision(self):
+        form_template = test_utils.get_login_form().to_dict()
+        self.assertEqual(self.form_manager.insert_revision(form_template), 1)
+        self.assertEqual(self.form_manager.insert_revision(test_utils.get_login_form().to_dict()), 1)
+
+        changed_template = test_utils.get_login_form().to_dict()
+        changed_template["label"] = "Changed"
+        self.assertEqual(self.form_manager.insert_revision(changed_template), 2)
+
+        self.assertEqual(self.form_manager.get_form_by_name("user_login").form_revision, 2)
+        self.assertEqual(self.form_manager.get_form_by_revision("user_login", 1).form_revision, 1)
+
+    def test_expired_revision_is_not_parsed_again(self):
+        form_manager = FormManager(self.data_store, max_age_seconds=0.01)
+        form_manager.insert_revision(test_utils.get_login_form().to_dict())
+        LoginForm = form_manager.get_form_by_name("user_login")
+
+        time.sleep(0.02)
+        self.assertIs(form_manager.get_form_by_name("user_login"), LoginForm)
+
+    def test_fetch_forms_with_revisions(self):
+        self.form_manager.insert_revision(test_utils.get_login_form().to_dict())
+        changed_template = test_utils.get_login_form().to_dict()
+        changed_template["label"] = "Changed"
+        self.form_manager.insert_revision(changed_template)
+
+        form_manager = FormManager(self.data_store)
+        self.assertEqual(form_manager.get_form_by_name("user_login").form_revision, 2)
+
+    def test_search_forms(self):
+        self.form_manager.insert_forms([form.to_dict() for form in test_utils.get_many_login_forms(num=3)])
+
+        page = self.form_manager.search_forms({"name": {"$ne": "user_login_1"}})
+
+        self.assertEqual([summary["name"] for summary in page.summaries], ["user_login_0", "user_login_2"])
+
+    def test_iter_forms_parses_lazily(self):
+        self.data_store.insert_forms([form.to_dict() for form in test_utils.get_many_login_forms(num=5)])
+        self.data_store.insert_revision(test_utils.get_login_form().to_dict())
+        self.form_manager.form_cache.clear()
+
+        forms = self.form_manager.iter_forms(page_size=2)
+        summary, form = next(forms)
+
+        self.assertEqual(summary["name"], "user_login")
+        self.assertEqual(form.form_revision, 1)
+        self.assertEqual(len(self.form_manager.revision_cache), 1)
+        self.assertEqual(len(self.form_manager.get_cached_form_names()), 0)
+        self.assertEqual(len([form for _, form in forms]), 5)
+
+    def test_iter_forms_yields_the_summarized_form(self):
+        self.data_store.insert_form(test_utils.get_login_form().to_dict())
+        form_template = test_utils.get_login_form().to_dict()
+        form_template["fields"][0]["property"]["name"] = "username"
+        identifier = self.data_store.insert_form(form_template)
+        self.data_store.deprecate_form(identifier)
+
+        (summary, form), = self.form_manager.iter_forms({"deprecated": True})
+
+        self.assertEqual(summary["_id"], identifier)
+        self.assertTrue(hasattr(form, "username"))
+
+    def test_upsert_unparsable_form(self):
+        with self.assertRaises(FormParserException):
+            self.form_manager.upsert_form({"name": "broken_form"})
+        self.assertEqual(self.count_forms(), 0)
+
 
 class TestFromFormManagerFetch(unittest.TestCase):
 
@@ -64,11 +171,7 @@ class TestFromFormManagerFetch(unittest.TestCase):
     def setUpClass(cls) -> None:
         form_template = test_utils.get_login_form()
 
-        client = MongoClient()
-        cls.collection = client["test"]["form_test"]
-        cls.collection.drop()
-
-        cls.data_store = MongoDataStore(cls.collection)
+        cls.data_store = MemoryDataStore()
         cls.data_store.insert_form(form_template=form_template.to_dict())
 
     def setUp(self) -> None:
@@ -101,15 +204,8 @@ class TestFromFormManagerFetch(unittest.TestCase):
 
 class TestFormManagerManyForms(unittest.TestCase):
 
-    @classmethod
-    def setUpClass(cls) -> None:
-        client = MongoClient()
-        cls.collection = client["test"]["form_test"]
-        cls.collection.drop()
-
-        cls.data_store = MongoDataStore(cls.collection)
-
     def setUp(self) -> None:
+        self.data_store = MemoryDataStore()
         from_templates = test_utils.get_many_login_forms(num=5)
 
         self.form_manager = FormManager(data_store=self.data_store)
@@ -127,3 +223,67 @@ class TestFormManagerManyForms(unittest.TestCase):
 
 
 
+
+
+class TestFormManagerById(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data_store = MemoryDataStore()
+        self.form_manager = FormManager(data_store=self.data_store)
+        self.identifier = self.form_manager.insert_form(test_utils.get_login_form().to_dict())
+
+    def test_get_form_by_id_shares_cache_with_name(self):
+        LoginForm = self.form_manager.get_form_by_id(self.identifier)
+        self.assertIs(LoginForm, self.form_manager.get_form_by_name("user_login"))
+
+        form_manager = FormManager(self.data_store)
+        self.assertIs(form_manager.get_form_by_id(self.identifier), form_manager.get_form_by_name("user_login"))
+
+    def test_get_form_by_nonexisting_id(self):
+        with self.assertRaises(FormManagerException):
+            self.form_manager.get_form_by_id(ObjectId())
+
+    def test_upsert_and_revision_update_index(self):
+        LoginForm = self.form_manager.get_form_by_id(self.identifier)
+        changed_template = test_utils.get_login_form().to_dict()
+        changed_template["label"] = "Changed"
+        self.form_manager.upsert_form(changed_template)
+        ChangedForm = self.form_manager.get_form_by_id(self.identifier)
+        self.assertIsNot(ChangedForm, LoginForm)
+        self.assertIs(ChangedForm, self.form_manager.get_form_by_name("user_login"))
+
+        form_template = test_utils.get_login_form().to_dict()
+        form_template["name"] = "user_revision"
+        self.form_manager.insert_revision(form_template)
+        self.form_manager.insert_revision(dict(form_template, label="Changed"))
+
+        first, second = [form_template["_id"] for form_template in self.data_store.find_form({"name": "user_revision"})]
+        self.assertEqual(self.form_manager.get_form_by_id(first).form_revision, 1)
+        self.assertEqual(self.form_manager.get_form_by_id(second).form_revision, 2)
+        self.assertEqual(self.form_manager.get_form_by_name("user_revision").form_revision, 2)
+
+    def test_duplicate_name_does_not_replace_cached_form(self):
+        duplicate = self.data_store.insert_form(test_utils.get_login_form().to_dict())
+        LoginForm = self.form_manager.get_form_by_name("user_login")
+
+        self.assertIsNot(self.form_manager.get_form_by_id(duplicate), LoginForm)
+        self.assertIs(self.form_manager.get_form_by_name("user_login"), LoginForm)
+        self.assertIs(self.form_manager.get_form_by_id(self.identifier), LoginForm)
+
+    def test_renamed_form(self):
+        self.form_manager.get_form_by_id(self.identifier)
+        self.data_store._forms[self.identifier]["name"] = "user_renamed"
+        self.data_store._name_index = {"user_renamed": [self.identifier]}
+
+        self.form_manager.get_form_by_id(self.identifier, use_cache=False)
+        self.assertNotIn("user_login", self.form_manager.get_cached_form_names())
+        self.assertIn("user_renamed", self.form_manager.get_cached_form_names())
+
+    def test_deprecate_and_evict(self):
+        LoginForm = self.form_manager.get_form_by_id(self.identifier)
+        self.form_manager.deprecate_form(self.identifier)
+        self.assertNotIn(self.identifier, self.form_manager._id_index)
+        self.assertIsNot(self.form_manager.get_form_by_id(self.identifier), LoginForm)
+
+        self.form_manager.form_cache.clear()
+        self.assertIsNot(self.form_manager.get_form_by_id(self.identifier), LoginForm)
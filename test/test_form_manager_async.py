@@ -0,0 +1,113 @@
+import asyncio
+import itertools
+import threading
+import unittest
+
+import wtforms
+
+from dynamic_form import AsyncFormManager, IAsyncDataStore, JsonFlaskParser
+from dynamic_form.errors import FormManagerException, FormParserException
+from test import test_utils
+
+
+class AsyncMemoryDataStore(IAsyncDataStore):
+    """A minimal in-memory stand-in which counts the loads by name"""
+
+    def __init__(self, delay=0.01):
+        self.forms = {}
+        self.delay = delay
+        self.load_count = 0
+        self._ids = itertools.count()
+
+    async def load_form(self, identifier):
+        return self.forms.get(identifier)
+
+    async def insert_form(self, form_template):
+        identifier = next(self._ids)
+        self.forms[identifier] = form_template
+        return identifier
+
+    async def load_form_by_name(self, name):
+        self.load_count += 1
+        await asyncio.sleep(self.delay)
+        return next((form for form in self.forms.values() if form["name"] == name), None)
+
+    async def load_forms(self):
+        for form in list(self.forms.values()):
+            yield form
+
+    async def find_form(self, *args, **kwargs):
+        for form in list(self.forms.values()):
+            yield form
+
+    async def deprecate_form(self, identifier):
+        self.forms[identifier]["deprecated"] = True
+
+
+class ThreadRecordingParser(JsonFlaskParser):
+
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def to_form(self, template_form):
+        self.threads.append(threading.get_ident())
+        return super().to_form(template_form)
+
+
+class TestAsyncFormManager(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        self.data_store = AsyncMemoryDataStore()
+        for form_template in test_utils.get_many_login_forms(num=3):
+            await self.data_store.insert_form(form_template.to_dict())
+        self.form_manager = AsyncFormManager(data_store=self.data_store)
+
+    def test_init_wrong_data_store(self):
+        class DataStore:
+            pass
+
+        with self.assertRaises(FormManagerException):
+            AsyncFormManager(data_store=DataStore())
+
+    async def test_get_form_by_name(self):
+        LoginForm = await self.form_manager.get_form_by_name("user_login_0")
+
+        self.assertTrue(issubclass(LoginForm, wtforms.Form))
+        self.assertIs(await self.form_manager.get_form_by_name("user_login_0"), LoginForm)
+        self.assertEqual(self.data_store.load_count, 1)
+
+    async def test_concurrent_misses_are_coalesced(self):
+        forms = await asyncio.gather(*[self.form_manager.get_form_by_name("user_login_1") for _ in range(10)])
+
+        self.assertEqual(self.data_store.load_count, 1)
+        self.assertTrue(all(form is forms[0] for form in forms))
+
+    async def test_nonexisting_form(self):
+        results = await asyncio.gather(self.form_manager.get_form_by_name("nonexisting"),
+                                       self.form_manager.get_form_by_name("nonexisting"), return_exceptions=True)
+
+        self.assertTrue(all(isinstance(result, FormManagerException) for result in results))
+        self.assertEqual(self.data_store.load_count, 1)
+
+    async def test_parse_in_executor(self):
+        parser = ThreadRecordingParser()
+        form_manager = AsyncFormManager(data_store=self.data_store, format_parser=parser)
+
+        await form_manager.get_form_by_name("user_login_2")
+
+        self.assertNotIn(threading.get_ident(), parser.threads)
+
+    async def test_update_form_cache(self):
+        await self.form_manager.update_form_cache()
+        self.assertEqual(len(self.form_manager.get_cached_form_names()), 3)
+
+        await self.form_manager.get_form_by_name("user_login_0")
+        self.assertEqual(self.data_store.load_count, 0)
+
+    async def test_insert_form(self):
+        await self.form_manager.insert_form(test_utils.get_login_form().to_dict())
+        self.assertIn("user_login", self.form_manager.get_cached_form_names())
+
+        with self.assertRaises(FormParserException):
+            await self.form_manager.insert_form({"name": "broken_form"})
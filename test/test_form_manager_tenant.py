@@ -0,0 +1,98 @@
+import time
+import unittest
+
+from dynamic_form import MultiTenantFormManager
+from dynamic_form.datastore_memory import MemoryDataStore
+from dynamic_form.errors import FormManagerException, FormParserException
+from dynamic_form.form_manager_tenant import TenantCache
+
+from test import test_utils
+
+
+class TestTenantCache(unittest.TestCase):
+
+    def test_fair_eviction(self):
+        cache = TenantCache(max_len=4)
+        for form_name in ["a", "b", "c"]:
+            cache.set("busy", form_name, form_name)
+        cache.set("idle", "a", "a")
+
+        cache.set("other", "a", "a")
+        self.assertEqual(cache.keys("busy"), ["b", "c"])
+        self.assertEqual(cache.keys("idle"), ["a"])
+        self.assertEqual(len(cache), 4)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_least_recently_used_form_is_evicted(self):
+        cache = TenantCache(max_len=2)
+        cache.set("tenant", "a", "a")
+        cache.set("tenant", "b", "b")
+        cache.get("tenant", "a")
+
+        cache.set("tenant", "c", "c")
+        self.assertEqual(cache.keys("tenant"), ["a", "c"])
+
+    def test_quota(self):
+        cache = TenantCache(max_len=4)
+        cache.quotas["small"] = 1
+        cache.set("small", "a", "a")
+        cache.set("small", "b", "b")
+        cache.set("large", "a", "a")
+        cache.set("large", "b", "b")
+
+        cache.set("large", "c", "c")
+        self.assertEqual(cache.keys("small"), ["b"])
+        self.assertEqual(cache.usage(), {"small": {"forms": 1, "quota": 1}, "large": {"forms": 3, "quota": 2}})
+
+    def test_expiration(self):
+        cache = TenantCache(max_len=2, max_age_seconds=0.01)
+        cache.set("tenant", "a", "a")
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get("tenant", "a"))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.usage(), {})
+
+
+class TestMultiTenantFormManager(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data_store_a = MemoryDataStore([test_utils.get_login_form().to_dict()])
+        self.data_store_b = MemoryDataStore([form.to_dict() for form in test_utils.get_many_login_forms(num=3)])
+        self.form_manager = MultiTenantFormManager({"a": self.data_store_a, "b": self.data_store_b}, max_len=2)
+
+    def test_get_form_by_name(self):
+        LoginForm = self.form_manager.get_form_by_name("a", "user_login")
+        self.assertIs(self.form_manager.get_form_by_name("a", "user_login"), LoginForm)
+
+        with self.assertRaises(FormManagerException):
+            self.form_manager.get_form_by_name("b", "user_login")
+        with self.assertRaises(FormManagerException):
+            self.form_manager.get_form_by_name("unknown", "user_login")
+
+    def test_shared_cache_is_bounded(self):
+        self.form_manager.get_form_by_name("a", "user_login")
+        for index in range(3):
+            self.form_manager.get_form_by_name("b", f"user_login_{index}")
+
+        self.assertEqual(self.form_manager.get_cached_form_names("a"), ["user_login"])
+        self.assertEqual(self.form_manager.get_cached_form_names("b"), ["user_login_2"])
+
+    def test_insert_form_and_remove_tenant(self):
+        self.form_manager.insert_form("a", test_utils.get_many_login_forms(num=1)[0].to_dict())
+        self.assertEqual(self.form_manager.get_cached_form_names("a"), ["user_login_0"])
+        self.assertIsNotNone(self.data_store_a.load_form_by_name("user_login_0"))
+
+        with self.assertRaises(FormParserException):
+            self.form_manager.insert_form("a", {"name": "broken_form"})
+
+        self.form_manager.remove_tenant("a")
+        self.assertEqual(self.form_manager.get_tenants(), ["b"])
+        self.assertEqual(self.form_manager.get_cache_usage(), {})
+
+    def test_quota_must_be_positive(self):
+        with self.assertRaises(FormManagerException):
+            self.form_manager.add_tenant("c", MemoryDataStore(), quota=0)
+        with self.assertRaises(FormManagerException):
+            MultiTenantFormManager({"c": MemoryDataStore()}, quotas={"c": 0})
+        self.assertEqual(self.form_manager.get_tenants(), ["a", "b"])
@@ -0,0 +1,111 @@
+import copy
+import gc
+import json
+import time
+import tracemalloc
+import unittest
+
+from dynamic_form import FormManager, JsonFlaskParser
+from dynamic_form.datastore_memory import MemoryDataStore
+from dynamic_form.memory import form_size, template_size
+from dynamic_form.template_builder import ControlledVocabularyTemplate, FieldTemplate, FormTemplate, ItemTemplate, \
+    PropertyTemplate, ValueTypeTemplate
+
+from test import test_utils
+
+
+def get_select_form(num_items=200):
+    vocabulary = ControlledVocabularyTemplate("Colors", "colors", "Some colors", "test")
+    for index in range(num_items):
+        vocabulary.add_item(ItemTemplate(f"Color {index}", f"color_{index}", "A color"))
+    color = PropertyTemplate("Color", "color", "administrative", "The color", ValueTypeTemplate("ctrl_voc", vocabulary))
+
+    return FormTemplate("Select", "select_form", "Form with a vocabulary") \
+        .add_field(FieldTemplate("SelectField", color)) \
+        .add_field(FieldTemplate("StringField", PropertyTemplate("Name", "name", "administrative", "The name"))) \
+        .to_dict()
+
+
+def measure(function):
+    """Return the result of function and the bytes it allocated which are still allocated afterwards"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = function()
+        gc.collect()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+class TestMemoryEstimate(unittest.TestCase):
+
+    def assertEstimate(self, estimate, measured):
+        self.assertGreater(estimate, measured * 0.75)
+        self.assertLess(estimate, measured * 1.25)
+
+    def test_form_size(self):
+        for form_template in (test_utils.get_login_form().to_dict(), get_select_form()):
+            serialized = json.dumps(form_template)
+            # The template is decoded within the measurement, like a template loaded from the data store
+            forms, measured = measure(lambda: [JsonFlaskParser().to_form(json.loads(serialized))[1]
+                                               for _ in range(5)])
+            self.assertEstimate(form_size(forms[0]), measured / 5)
+
+    def test_form_size_of_picklable_form(self):
+        form_template = test_utils.get_login_form().to_dict()
+        size = form_size(JsonFlaskParser().to_form(copy.deepcopy(form_template))[1])
+        picklable_size = form_size(JsonFlaskParser(picklable=True).to_form(form_template)[1])
+        # The fields are inherited from the registered class, which keeps the template as well
+        self.assertGreater(picklable_size, size)
+
+    def test_template_size(self):
+        serialized = json.dumps(get_select_form())
+        form_template, measured = measure(lambda: json.loads(serialized))
+        self.assertEstimate(template_size(form_template), measured)
+
+    def test_larger_vocabulary(self):
+        small = JsonFlaskParser().to_form(get_select_form(10))[1]
+        large = JsonFlaskParser().to_form(get_select_form(1000))[1]
+        self.assertGreater(form_size(large), form_size(small) * 10)
+
+
+class TestFormManagerMemory(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data_store = MemoryDataStore([test_utils.get_login_form().to_dict(), get_select_form(1000)])
+
+    def test_memory_usage(self):
+        form_manager = FormManager(self.data_store)
+        form_manager.find_forms({"name": "user_login"})
+        usage = form_manager.get_memory_usage()
+
+        self.assertEqual(set(usage["forms"]), {"user_login", "select_form"})
+        self.assertGreater(usage["forms"]["select_form"], usage["forms"]["user_login"])
+        self.assertEqual(usage["total"], sum(usage["forms"].values()))
+        self.assertGreater(usage["query_cache"], 0)
+
+    def test_byte_budget(self):
+        form_manager = FormManager(self.data_store, initial_load=False)
+        LoginForm = form_manager.get_form_by_name("user_login")
+        form_manager.max_cache_bytes = form_size(LoginForm) * 2
+
+        form_manager.get_form_by_name("select_form")
+        self.assertEqual(list(form_manager.get_cached_form_names()), ["select_form"])
+        self.assertNotIn("user_login", form_manager.stale_cache)
+
+        form_manager.get_form_by_name("user_login")
+        self.assertEqual(list(form_manager.get_cached_form_names()), ["user_login"])
+
+    def test_byte_budget_covers_expired_forms(self):
+        data_store = MemoryDataStore([form.to_dict() for form in test_utils.get_many_login_forms(num=3)])
+        form_manager = FormManager(data_store, initial_load=False, max_age_seconds=0.05)
+        form_manager.max_cache_bytes = int(form_size(form_manager.get_form_by_name("user_login_0")) * 2.5)
+
+        time.sleep(0.1)
+        form_manager.get_form_by_name("user_login_1")
+        form_manager.get_form_by_name("user_login_2")
+
+        self.assertNotIn("user_login_0", form_manager.stale_cache)
+        self.assertLessEqual(form_manager.get_memory_usage()["total"], form_manager.max_cache_bytes)
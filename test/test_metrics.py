@@ -0,0 +1,83 @@
+import time
+import unittest
+
+from dynamic_form import FormManager
+from dynamic_form.datastore_memory import MemoryDataStore
+from dynamic_form.errors import FormManagerException
+from dynamic_form.metrics import FormMetrics, Histogram
+
+from test import test_utils
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_observe(self):
+        histogram = Histogram(buckets=(0.1, 1))
+        for value in (0.05, 0.5, 0.5, 5):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 6.05)
+        self.assertEqual(histogram.to_dict()["buckets"], {0.1: 1, 1: 3, float("inf"): 4})
+        self.assertEqual(histogram.quantile(0.5), 1)
+        self.assertEqual(histogram.quantile(1), 5)
+
+
+class TestFormManagerMetrics(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data_store = MemoryDataStore([test_utils.get_login_form().to_dict()])
+        self.metrics = FormMetrics()
+        self.form_manager = FormManager(self.data_store, max_age_seconds=0.05, metrics=self.metrics,
+                                        negative_max_age_seconds=60)
+
+    def test_hits_and_misses(self):
+        self.form_manager.get_form_by_name("user_login")
+        self.form_manager.get_form_by_name("user_login", use_cache=False)
+
+        self.assertEqual(self.metrics.counters[FormMetrics.HITS], 1)
+        self.assertEqual(self.metrics.counters[FormMetrics.MISSES], 1)
+        self.assertEqual(self.metrics.counters[FormMetrics.REFRESHES], 1)
+        self.assertEqual(self.metrics.hit_rate(), 0.5)
+
+    def test_latencies(self):
+        self.form_manager.get_form_by_name("user_login", use_cache=False)
+        snapshot = self.metrics.snapshot()
+
+        self.assertEqual(snapshot[FormMetrics.LOAD]["count"], 1)
+        # initial load and the reload
+        self.assertEqual(snapshot[FormMetrics.PARSE]["count"], 2)
+        self.assertEqual(snapshot[FormMetrics.TOTAL]["count"], 1)
+
+    def test_negative_hits(self):
+        for _ in range(2):
+            with self.assertRaises(FormManagerException):
+                self.form_manager.get_form_by_name("nonexisting")
+        self.assertEqual(self.metrics.counters[FormMetrics.NEGATIVE_HITS], 1)
+
+        form_template = test_utils.get_login_form().to_dict()
+        form_template["name"] = "nonexisting"
+        self.form_manager.insert_form(form_template)
+        self.assertIsNotNone(self.form_manager.get_form_by_name("nonexisting"))
+
+    def test_evictions(self):
+        self.form_manager.form_cache.max_len = 1
+        for form_template in test_utils.get_many_login_forms(3):
+            self.form_manager.insert_form(form_template.to_dict())
+
+        self.assertEqual(self.metrics.counters[FormMetrics.EVICTIONS], 3)
+
+    def test_listener(self):
+        events = []
+        self.metrics.add_listener(lambda name, value, form_name: events.append((name, form_name)))
+        time.sleep(0.06)
+        self.form_manager.get_form_by_name("user_login")
+
+        self.assertIn((FormMetrics.MISSES, "user_login"), events)
+        self.assertIn((FormMetrics.LOAD, "user_login"), events)
+        self.assertIn((FormMetrics.TOTAL, "user_login"), events)
+
+    def test_disabled(self):
+        form_manager = FormManager(self.data_store)
+        form_manager.get_form_by_name("user_login")
+        self.assertIsNone(form_manager.metrics)
@@ -0,0 +1,87 @@
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import Flask
+from flask_wtf import FlaskForm
+from wtforms import Form, StringField
+from wtforms.form import FormMeta
+
+from dynamic_form import JsonFlaskParser
+from dynamic_form.pickling import get_registered_form
+from dynamic_form.utils import template_hash
+
+from test import test_utils
+
+
+class StaticForm(Form):
+    name = StringField("Name")
+
+
+def parse_form(form_template):
+    return JsonFlaskParser(picklable=True).to_form(form_template)[1]
+
+
+app = Flask(__name__)
+app.secret_key = "not secret"
+
+
+def field_names(form_cls):
+    with app.test_request_context():
+        return [field.name for field in form_cls(meta={"csrf": False})]
+
+
+class TestPickling(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.form_template = test_utils.get_login_form().to_dict()
+        _, self.LoginForm = JsonFlaskParser(picklable=True).to_form(self.form_template)
+
+    def test_round_trip_uses_registry(self):
+        registered_cls = get_registered_form(template_hash(self.form_template), FlaskForm)
+        self.assertIs(self.LoginForm.__base__, registered_cls)
+
+        LoadedForm = pickle.loads(pickle.dumps(self.LoginForm))
+        self.assertIsNot(LoadedForm, self.LoginForm)
+        self.assertIs(LoadedForm.__base__, registered_cls)
+        self.assertIs(LoadedForm.password, self.LoginForm.password)
+        self.assertEqual(field_names(LoadedForm), ["email", "password"])
+
+    def test_forms_of_equal_templates_do_not_share_attributes(self):
+        _, OtherForm = JsonFlaskParser(picklable=True).to_form(test_utils.get_login_form().to_dict())
+        self.LoginForm.form_revision = 1
+        OtherForm.form_revision = 2
+
+        self.assertIs(OtherForm.__base__, self.LoginForm.__base__)
+        self.assertEqual(self.LoginForm.form_revision, 1)
+        self.assertEqual(pickle.loads(pickle.dumps(self.LoginForm)).form_revision, 1)
+
+    def test_template_is_not_modified(self):
+        self.assertEqual(self.form_template, test_utils.get_login_form().to_dict())
+
+    def test_extra_attributes(self):
+        self.LoginForm.form_revision = 3
+        data = pickle.dumps(self.LoginForm)
+        self.LoginForm.form_revision = 4
+
+        self.assertEqual(pickle.loads(data).form_revision, 3)
+
+    def test_static_and_default_forms(self):
+        self.assertIs(type(StaticForm), FormMeta)
+        self.assertIs(pickle.loads(pickle.dumps(StaticForm)), StaticForm)
+
+        _, DefaultForm = JsonFlaskParser().to_form(test_utils.get_login_form().to_dict())
+        with self.assertRaises(pickle.PicklingError):
+            pickle.dumps(DefaultForm)
+        self.assertIs(type(DefaultForm), FormMeta)
+
+    def test_process_pool(self):
+        form_templates = [form.to_dict() for form in test_utils.get_many_login_forms(3)]
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            forms = list(executor.map(parse_form, form_templates))
+            self.assertEqual([form.__name__ for form in forms], ["user_login_0", "user_login_1", "user_login_2"])
+
+            names = list(executor.map(field_names, [self.LoginForm, forms[0]]))
+
+        self.assertEqual(names, [["email", "password"]] * 2)
+        self.assertEqual(field_names(forms[0]), ["email", "password"])
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from dynamic_form import FormManager
+from dynamic_form.datastore_memory import MemoryDataStore
+from dynamic_form.errors import FormManagerException
+from dynamic_form.popularity import PopularityTracker
+
+from test import test_utils
+
+
+class TestPopularityTracker(unittest.TestCase):
+
+    def test_decayed_counts(self):
+        tracker = PopularityTracker(half_life_seconds=10)
+        now = tracker._landmark
+        tracker.record("old", now)
+        tracker.record("old", now)
+        tracker.record("new", now + 15)
+
+        scores = tracker.scores(now + 20)
+        self.assertAlmostEqual(scores["old"], 0.5)
+        self.assertAlmostEqual(scores["new"], 2 ** -0.5)
+        self.assertEqual(tracker.top(1), ["new"])
+
+    def test_rescale(self):
+        tracker = PopularityTracker(half_life_seconds=1)
+        now = tracker._landmark
+        tracker.record("form", now)
+        tracker.record("form", now + 2 * PopularityTracker.MAX_EXPONENT)
+
+        self.assertAlmostEqual(tracker.scores(now + 2 * PopularityTracker.MAX_EXPONENT)["form"], 1)
+
+    def test_max_names(self):
+        tracker = PopularityTracker(max_names=2)
+        for count, form_name in enumerate(["a", "b", "c", "d", "e"]):
+            for _ in range(count + 1):
+                tracker.record(form_name)
+
+        self.assertLessEqual(len(tracker.scores()), 4)
+        self.assertEqual(tracker.top(2), ["e", "d"])
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "popularity.json")
+            tracker = PopularityTracker(path=path, save_interval=0)
+            tracker.record("a")
+            tracker.record("b")
+            tracker.record("b")
+
+            self.assertEqual(PopularityTracker(path=path).top(2), ["b", "a"])
+
+            with open(path, "w") as file:
+                file.write("{broken")
+            self.assertEqual(PopularityTracker(path=path).top(2), [])
+
+    def test_concurrent_saves(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "popularity.json")
+            tracker = PopularityTracker(path=path, save_interval=0)
+            tracker.record("a")
+
+            threads = [threading.Thread(target=lambda: [tracker.save() for _ in range(20)]) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(os.listdir(directory), ["popularity.json"])
+            self.assertEqual(PopularityTracker(path=path).top(1), ["a"])
+
+    def test_failing_save_is_logged(self):
+        with tempfile.TemporaryDirectory() as directory:
+            tracker = PopularityTracker(path=os.path.join(directory, "missing", "popularity.json"), save_interval=0)
+            with self.assertLogs("dynamic_form.popularity", level="ERROR"):
+                tracker.record("a")
+            self.assertEqual(tracker.top(1), ["a"])
+
+
+class TestFormManagerPrefetch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        form_templates = [form.to_dict() for form in test_utils.get_many_login_forms(num=5)]
+        self.data_store = MemoryDataStore(form_templates)
+        self.popularity = PopularityTracker()
+        for count, form_name in enumerate(["user_login_1", "user_login_3", "missing"]):
+            for _ in range(count + 1):
+                self.popularity.record(form_name)
+
+    def test_initial_load_prefetches_popular_forms(self):
+        form_manager = FormManager(self.data_store, popularity=self.popularity, prefetch_count=2)
+        self.assertEqual(sorted(form_manager.get_cached_form_names()), ["user_login_3"])
+
+        form_manager = FormManager(self.data_store, popularity=self.popularity, prefetch_count=3)
+        self.assertEqual(sorted(form_manager.get_cached_form_names()), ["user_login_1", "user_login_3"])
+
+    def test_initial_load_without_counts_loads_all_forms(self):
+        form_manager = FormManager(self.data_store, popularity=PopularityTracker(), prefetch_count=2)
+        self.assertEqual(len(form_manager.get_cached_form_names()), 5)
+
+    def test_lookups_are_counted(self):
+        form_manager = FormManager(self.data_store, initial_load=False, popularity=self.popularity)
+        for _ in range(5):
+            form_manager.get_form_by_name("user_login_0")
+
+        self.assertEqual(form_manager.prefetch_forms(1), ["user_login_0"])
+        self.assertEqual(list(form_manager.get_cached_form_names()), ["user_login_0"])
+
+    def test_prefetch_without_tracker(self):
+        form_manager = FormManager(self.data_store, initial_load=False)
+        with self.assertRaises(FormManagerException):
+            form_manager.prefetch_forms(2)
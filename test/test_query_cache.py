@@ -0,0 +1,79 @@
+import time
+import unittest
+
+from dynamic_form import FormManager
+from dynamic_form.datastore_memory import MemoryDataStore
+from dynamic_form.query_cache import QueryCache
+
+from test import test_utils
+
+
+class CountingDataStore(MemoryDataStore):
+
+    def __init__(self):
+        super().__init__()
+        self.find_count = 0
+
+    def find_form(self, *args, **kwargs):
+        self.find_count += 1
+        return super().find_form(*args, **kwargs)
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def test_key_is_normalized(self):
+        self.assertEqual(QueryCache.key({"name": "a", "deprecated": True}, limit=1, sort=[("name", 1)]),
+                         QueryCache.key({"deprecated": True, "name": "a"}, sort=[("name", 1)], limit=1))
+        self.assertNotEqual(QueryCache.key({"name": "a"}), QueryCache.key({"name": "a"}, limit=1))
+
+    def test_outdated_result_is_not_cached(self):
+        query_cache = QueryCache()
+        generation = query_cache.invalidations
+        query_cache.invalidate()
+        query_cache.set("key", [], generation)
+
+        self.assertIsNone(query_cache.get("key"))
+
+
+class TestFormManagerFindForms(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data_store = CountingDataStore()
+        self.data_store.insert_forms([form.to_dict() for form in test_utils.get_many_login_forms(num=3)])
+        self.form_manager = FormManager(self.data_store, initial_load=False)
+
+    def test_cached_result(self):
+        first = self.form_manager.find_forms({"name": "user_login_0"}, projection={"name": True})
+        second = self.form_manager.find_forms({"name": "user_login_0"}, projection={"name": True})
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.data_store.find_count, 1)
+        self.assertEqual(self.form_manager.query_cache.stats()["hits"], 1)
+        self.assertEqual(self.form_manager.query_cache.stats()["misses"], 1)
+
+    def test_result_is_a_copy(self):
+        self.form_manager.find_forms({"name": "user_login_0"})[0]["name"] = "changed"
+        self.assertEqual(self.form_manager.find_forms({"name": "user_login_0"})[0]["name"], "user_login_0")
+
+    def test_expired_result(self):
+        self.form_manager.query_cache.max_age = 0.01
+        self.form_manager.find_forms()
+        time.sleep(0.02)
+        self.form_manager.find_forms()
+
+        self.assertEqual(self.data_store.find_count, 2)
+
+    def test_invalidated_by_insert(self):
+        self.assertEqual(len(self.form_manager.find_forms()), 3)
+        self.form_manager.insert_form(test_utils.get_login_form().to_dict())
+
+        self.assertEqual(len(self.form_manager.find_forms()), 4)
+
+    def test_invalidated_by_deprecate(self):
+        identifier = self.form_manager.find_forms({"name": "user_login_1"})[0]["_id"]
+        self.assertEqual(len(self.form_manager.find_forms({"deprecated": True})), 0)
+
+        self.form_manager.deprecate_form(identifier)
+
+        self.assertEqual(len(self.form_manager.find_forms({"deprecated": True})), 1)
+        self.assertEqual(self.form_manager.query_cache.stats()["invalidations"], 1)
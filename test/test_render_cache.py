@@ -0,0 +1,105 @@
+import unittest
+
+from flask import Flask
+from werkzeug.datastructures import MultiDict
+
+from dynamic_form import FormManager
+from dynamic_form.datastore_memory import MemoryDataStore
+from dynamic_form.render_cache import RenderCache
+from dynamic_form.template_builder import ControlledVocabularyTemplate, FieldTemplate, FormTemplate, ItemTemplate, \
+    PropertyTemplate, ValueTypeTemplate
+
+
+def get_species_form(label="Species"):
+    vocabulary = ControlledVocabularyTemplate("Species", "species", "Species", "test")
+    for name in ("human", "mouse", "rat"):
+        vocabulary.add_item(ItemTemplate(name.title(), name, f"The {name}"))
+    species = PropertyTemplate(label, "species", "administrative", "The <species>",
+                               ValueTypeTemplate("ctrl_voc", vocabulary))
+    title = PropertyTemplate("Title", "title", "administrative", "The title")
+
+    return FormTemplate("Study", "study", "A study") \
+        .add_field(FieldTemplate("SelectField", species)) \
+        .add_field(FieldTemplate("StringField", title)) \
+        .to_dict()
+
+
+class TestRenderCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = Flask(__name__)
+        cls.app.secret_key = "not secret"
+        cls.app.config["WTF_CSRF_ENABLED"] = False
+
+    def setUp(self) -> None:
+        self.render_cache = RenderCache()
+        self.data_store = MemoryDataStore([get_species_form()])
+        self.form_manager = FormManager(self.data_store, render_cache=self.render_cache)
+
+    def get_form(self, **data):
+        return self.form_manager.get_form_by_name("study")(MultiDict(data))
+
+    def test_same_html_as_wtforms(self):
+        with self.app.test_request_context():
+            for data in ({}, {"species": "mouse"}, {"species": "rat"}, {"species": "mouse"}):
+                form = self.get_form(**data)
+                self.assertEqual(self.render_cache.render_field(form, "species", class_="select"),
+                                 form.species(class_="select"))
+                self.assertEqual(self.render_cache.render_field(form, "title"), form.title())
+                self.assertEqual(self.render_cache.label(form, "species"), form.species.label())
+                self.assertEqual(self.render_cache.description(form, "species"), "The &lt;species&gt;")
+
+        self.assertGreater(self.render_cache.stats()["hits"], 0)
+
+        form_template = get_species_form()
+        form_template["name"] = "fancy_study"
+        form_template["fields"][0]["kwargs"] = {"render_kw": {"kwargs": {"class": "fancy", "data_kind": "species"}}}
+        self.form_manager.insert_form(form_template)
+        with self.app.test_request_context():
+            for kwargs in ({}, {"class_": "select"}):
+                form = self.form_manager.get_form_by_name("fancy_study")(MultiDict({"species": "rat"}))
+                html = self.render_cache.render_field(form, "species", **kwargs)
+                self.assertEqual(html, form.species(**kwargs))
+                self.assertIn('data-kind="species"', html)
+
+    def test_choices_without_render_kw(self):
+        with self.app.test_request_context():
+            expected = self.render_cache.render_field(self.get_form(species="rat"), "species")
+            self.render_cache.invalidate()
+
+            form = self.get_form(species="rat")
+            choices = list(form.species.iter_choices())
+            # WTForms before 3.1 yields (value, label, selected)
+            form.species.iter_choices = lambda: (choice[:3] for choice in choices)
+            self.assertEqual(self.render_cache.render_field(form, "species"), expected)
+
+    def test_changed_choices(self):
+        with self.app.test_request_context():
+            self.render_cache.render_field(self.get_form(), "species")
+
+            form = self.get_form(species="dog")
+            form.species.choices = [("cat", "Cat"), ("dog", "Dog")]
+            self.assertEqual(self.render_cache.render_field(form, "species"), form.species())
+
+    def test_form_without_content_hash(self):
+        form_manager = FormManager(self.data_store)
+        with self.app.test_request_context():
+            form = form_manager.get_form_by_name("study")()
+            self.assertEqual(self.render_cache.render_field(form, "species"), form.species())
+        self.assertEqual(self.render_cache.stats()["size"], 0)
+
+    def test_invalidated_on_replace(self):
+        with self.app.test_request_context():
+            self.render_cache.label(self.get_form(), "species")
+            self.assertEqual(self.render_cache.stats()["size"], 1)
+
+            self.form_manager.upsert_form(get_species_form(label="Organism"))
+            self.assertEqual(self.render_cache.stats()["size"], 0)
+            self.assertIn("Organism", self.render_cache.label(self.get_form(), "species"))
+
+    def test_kept_on_refresh(self):
+        with self.app.test_request_context():
+            self.render_cache.label(self.get_form(), "species")
+            self.form_manager.get_form_by_name("study", use_cache=False)
+            self.assertEqual(self.render_cache.stats()["size"], 1)
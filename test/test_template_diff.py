@@ -0,0 +1,95 @@
+import copy
+import unittest
+
+from flask import Flask
+
+from dynamic_form import FormManager, IFormParser, JsonFlaskParser
+from dynamic_form.datastore_memory import MemoryDataStore
+from dynamic_form.errors import FormManagerException
+from dynamic_form.template_diff import diff_templates, rebuild_form
+from dynamic_form.tracing import RecordingTracer, use_tracer
+
+from test import test_utils
+
+app = Flask(__name__)
+app.secret_key = "not secret"
+
+
+def get_changed_login_form():
+    """Login form with the email field renamed to username and a changed password field"""
+    form_template = test_utils.get_login_form().to_dict()
+    form_template["fields"][1]["kwargs"]["validators"]["args"]["objects"][1]["kwargs"]["max"] = 128
+    form_template["fields"][0]["property"]["name"] = "username"
+    return form_template
+
+
+class TestTemplateDiff(unittest.TestCase):
+
+    def test_diff_templates(self):
+        diff = diff_templates(test_utils.get_login_form().to_dict(), get_changed_login_form())
+        self.assertEqual(diff.added, ["username"])
+        self.assertEqual(diff.removed, ["email"])
+        self.assertEqual(diff.changed, ["password"])
+        self.assertEqual(diff.unchanged, [])
+
+        form_template = test_utils.get_login_form().to_dict()
+        self.assertEqual(diff_templates(form_template, form_template).unchanged, ["email", "password"])
+
+    def test_rebuild_parses_only_changed_fields(self):
+        parser = JsonFlaskParser()
+        _, LoginForm, diff = rebuild_form(parser, test_utils.get_login_form().to_dict())
+        self.assertIsNone(diff)
+
+        form_template = test_utils.get_login_form().to_dict()
+        form_template["fields"].insert(0, copy.deepcopy(form_template["fields"][0]))
+        form_template["fields"][0]["property"]["name"] = "username"
+
+        tracer = RecordingTracer()
+        with use_tracer(tracer):
+            _, ChangedForm, diff = rebuild_form(parser, form_template, LoginForm)
+
+        self.assertEqual(diff.added, ["username"])
+        self.assertEqual(diff.unchanged, ["email", "password"])
+        self.assertEqual([span.attributes["field.name"] for span in tracer.spans if span.name == "parser.field"],
+                         ["username"])
+        self.assertIs(ChangedForm.password.kwargs["validators"], LoginForm.password.kwargs["validators"])
+        self.assertIs(ChangedForm.form_template_diff, diff)
+
+        with app.test_request_context():
+            self.assertEqual([field.name for field in ChangedForm(meta={"csrf": False})],
+                             ["username", "email", "password"])
+            self.assertEqual([field.name for field in LoginForm(meta={"csrf": False})], ["email", "password"])
+
+
+class TestFormManagerIncrementalRebuild(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data_store = MemoryDataStore()
+        self.form_manager = FormManager(self.data_store, incremental_rebuild=True)
+
+    def test_upsert_reports_diff(self):
+        self.form_manager.upsert_form(test_utils.get_login_form().to_dict())
+        LoginForm = self.form_manager.get_form_by_name("user_login")
+        self.assertIsNone(self.form_manager.get_form_diff("user_login"))
+
+        form_template = test_utils.get_login_form().to_dict()
+        form_template["fields"][1]["kwargs"]["validators"]["args"]["objects"][1]["kwargs"]["max"] = 128
+        self.form_manager.upsert_form(form_template)
+
+        diff = self.form_manager.get_form_diff("user_login")
+        self.assertEqual(diff.changed, ["password"])
+        self.assertEqual(diff.unchanged, ["email"])
+        ChangedForm = self.form_manager.get_form_by_name("user_login")
+        self.assertIs(ChangedForm.email.kwargs["validators"], LoginForm.email.kwargs["validators"])
+        self.assertEqual(ChangedForm.password.kwargs["validators"][1].max, 128)
+
+    def test_requires_json_parser(self):
+        class Parser(IFormParser):
+            def to_form(self, template_form):
+                pass
+
+            def to_template(self, form, **kwargs):
+                pass
+
+        with self.assertRaises(FormManagerException):
+            FormManager(self.data_store, format_parser=Parser(), incremental_rebuild=True)
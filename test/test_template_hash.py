@@ -0,0 +1,25 @@
+import unittest
+
+from dynamic_form.utils import template_hash
+
+from test import test_utils
+
+
+class TestTemplateHash(unittest.TestCase):
+
+    def test_identical_content(self):
+        self.assertEqual(template_hash(test_utils.get_login_form().to_dict()),
+                         template_hash(test_utils.get_login_form().to_dict()))
+
+    def test_key_order_and_store_keys_ignored(self):
+        form_template = test_utils.get_login_form().to_dict()
+        reordered = dict(reversed(list(form_template.items())), _id="some_id", content_hash="some_hash")
+
+        self.assertEqual(template_hash(form_template), template_hash(reordered))
+
+    def test_changed_content(self):
+        form_template = test_utils.get_login_form().to_dict()
+        changed = test_utils.get_login_form().to_dict()
+        changed["fields"][0]["kwargs"]["validators"]["args"]["objects"] = []
+
+        self.assertNotEqual(template_hash(form_template), template_hash(changed))
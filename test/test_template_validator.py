@@ -0,0 +1,105 @@
+import unittest
+
+from dynamic_form import FormManager
+from dynamic_form.datastore_memory import MemoryDataStore
+from dynamic_form.errors import FormParserException, TemplateValidationException
+from dynamic_form.template_validator import TemplateValidator
+
+from test import test_utils
+
+
+def get_select_form(items):
+    return {
+        "name": "select_form",
+        "fields": [{
+            "class_name": "SelectField",
+            "property": {"name": "color", "label": "Color", "description": "The color",
+                         "value_type": {"data_type": "ctrl_voc", "controlled_vocabulary": {"items": items}}},
+            "kwargs": {"allow_synonyms": True},
+        }]
+    }
+
+
+class TestTemplateValidator(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.validator = TemplateValidator()
+
+    def test_valid_templates(self):
+        self.assertEqual(self.validator.errors(test_utils.get_login_form().to_dict()), [])
+        items = [{"name": "red", "label": "Red", "synonyms": ["rouge"]}]
+        self.assertEqual(self.validator.errors(get_select_form(items)), [])
+
+    def test_errors_have_json_paths(self):
+        form_template = test_utils.get_login_form().to_dict()
+        form_template["fields"][0]["class_name"] = "DataRequired"
+        form_template["fields"][1]["property"] = {"name": ""}
+        form_template["fields"][1]["kwargs"]["validators"]["args"]["objects"][1]["kwargs"] = {"max": None}
+        form_template["fields"].append({"class_name": "StringField", "property": {"name": "x"}, "label": "X",
+                                        "description": "X", "args": {"objects": "no list"}})
+
+        self.assertEqual([tuple(error) for error in self.validator.errors(form_template)], [
+            ("$.fields[0].class_name", "'DataRequired' is not a supported field class name"),
+            ("$.fields[1].property.name", "must be a non-empty string"),
+            ("$.fields[1].kwargs.validators.args.objects[1].kwargs.max",
+             "must be a string, number, boolean or object"),
+            ("$.fields[1].label", "is required in the field, its property or kwargs"),
+            ("$.fields[1].description", "is required in the field, its property or kwargs"),
+            ("$.fields[2].args.objects", "must be an array"),
+        ])
+
+    def test_vocabulary(self):
+        errors = self.validator.errors(get_select_form([{"name": "red", "label": "Red"}, {"name": "blue"}]))
+        self.assertEqual([error.path for error in errors], [
+            "$.fields[0].property.value_type.controlled_vocabulary.items[1].label",
+            "$.fields[0].property.value_type.controlled_vocabulary.items[0].synonyms",
+            "$.fields[0].property.value_type.controlled_vocabulary.items[1].synonyms",
+        ])
+
+    def test_nested_form(self):
+        form_template = {"name": "nested", "fields": [
+            {"class_name": "FormField", "property": {"name": "sub", "label": "Sub", "description": "Sub"}}]}
+        self.assertEqual(self.validator.errors(form_template)[0].path, "$.fields[0].fields")
+
+    def test_select_kwargs(self):
+        form_template = {"name": "colors", "fields": [
+            {"class_name": "FieldList", "property": {"name": "colors", "label": "Colors", "description": "Colors"},
+             "args": {"object": {"class_name": "SelectField"}}},
+            {"class_name": "SelectField", "property": {"name": "color", "label": "Color", "description": "Color"}}]}
+        self.assertEqual([tuple(error) for error in self.validator.errors(form_template)],
+                         [("$.fields[1].kwargs", "must be an object")])
+
+    def test_validate_many(self):
+        results = self.validator.validate_many([test_utils.get_login_form().to_dict(), {"fields": []}, None])
+        self.assertEqual(results[0], [])
+        self.assertEqual(results[1][0].path, "$.name")
+        self.assertEqual(results[2][0].path, "$")
+
+    def test_validate(self):
+        with self.assertRaises(TemplateValidationException) as context:
+            self.validator.validate({"name": "broken_form"})
+        self.assertEqual(context.exception.errors[0].path, "$.fields")
+        self.assertIn("$.fields: is required", str(context.exception))
+
+
+class TestFormManagerValidation(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data_store = MemoryDataStore()
+        self.form_manager = FormManager(self.data_store, template_validator=TemplateValidator())
+
+    def test_invalid_templates_are_not_parsed(self):
+        with self.assertRaises(TemplateValidationException):
+            self.form_manager.insert_form({"name": "broken_form"})
+        with self.assertRaises(FormParserException):
+            self.form_manager.upsert_form({"name": "broken_form", "fields": [{}]})
+
+        results = self.form_manager.insert_forms([{"name": "broken_form"}, test_utils.get_login_form().to_dict()])
+        self.assertIsInstance(results[0], TemplateValidationException)
+        self.assertEqual(len(list(self.data_store.find_form())), 1)
+
+    def test_parser_exception_is_chained(self):
+        form_manager = FormManager(self.data_store)
+        with self.assertRaises(FormParserException) as context:
+            form_manager.insert_form({"name": "broken_form", "fields": [{}]})
+        self.assertIsInstance(context.exception.__cause__, AttributeError)
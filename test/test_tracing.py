@@ -0,0 +1,89 @@
+import io
+import unittest
+
+from dynamic_form import FormManager, JsonFlaskParser
+from dynamic_form.datastore_memory import MemoryDataStore
+from dynamic_form.tracing import RecordingTracer, use_tracer
+
+from test import test_utils
+
+
+def get_select_form():
+    return {
+        "name": "select_form",
+        "label": "Select",
+        "description": "Form with a controlled vocabulary",
+        "fields": [{
+            "class_name": "SelectField",
+            "property": {
+                "name": "color", "label": "Color", "description": "A color",
+                "value_type": {"data_type": "ctrl_voc", "controlled_vocabulary": {"items": [
+                    {"name": "red", "label": "Red", "synonyms": []},
+                    {"name": "blue", "label": "Blue", "synonyms": []},
+                ]}}
+            },
+            "kwargs": {}
+        }]
+    }
+
+
+class TestTracing(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tracer = RecordingTracer()
+        self.data_store = MemoryDataStore([test_utils.get_login_form().to_dict(), get_select_form()])
+        self.form_manager = FormManager(self.data_store, initial_load=False, tracer=self.tracer)
+
+    def spans(self, name):
+        return [span for span in self.tracer.spans if span.name == name]
+
+    def test_nested_spans(self):
+        self.form_manager.get_form_by_name("user_login")
+
+        root, = self.spans("form_manager.get_form")
+        load, = self.spans("datastore.load")
+        parse, = self.spans("parser.to_form")
+        fields = self.spans("parser.field")
+
+        self.assertIsNone(root.parent)
+        self.assertIs(load.parent, root)
+        self.assertIs(parse.parent, root)
+        self.assertEqual(load.attributes["datastore.call"], "load_form_by_name")
+        self.assertEqual(parse.attributes["form.field_count"], 2)
+        self.assertEqual({field.attributes["field.name"] for field in fields}, {"email", "password"})
+        self.assertTrue(all(field.parent is parse for field in fields))
+
+    def test_choices_span(self):
+        self.form_manager.get_form_by_name("select_form")
+
+        choices, = self.spans("parser.choices")
+        self.assertEqual(choices.attributes["choices.count"], 2)
+        self.assertEqual(choices.parent.name, "parser.field")
+
+    def test_parser_without_form_manager(self):
+        with use_tracer(self.tracer):
+            JsonFlaskParser().to_form(get_select_form())
+        JsonFlaskParser().to_form(get_select_form())
+
+        self.assertEqual(len(self.spans("parser.to_form")), 1)
+
+    def test_top_forms_and_fields(self):
+        self.form_manager.get_form_by_name("user_login")
+        self.form_manager.get_form_by_name("select_form")
+
+        top_forms = self.tracer.top_forms(n=1)
+        self.assertEqual(len(top_forms), 1)
+        self.assertIn(top_forms[0][0], ("user_login", "select_form"))
+
+        top_fields = [name for name, _, _ in self.tracer.top_fields()]
+        self.assertIn(("user_login", "email"), top_fields)
+        self.assertIn(("select_form", "color"), top_fields)
+
+        output = io.StringIO()
+        self.tracer.dump(n=3, file=output)
+        self.assertIn("select_form.color", output.getvalue())
+
+    def test_disabled(self):
+        form_manager = FormManager(self.data_store)
+        form_manager.get_form_by_name("user_login", use_cache=False)
+        self.assertEqual(len(self.tracer.spans), 0)